@@ -13,14 +13,17 @@
 # limitations under the License.
 
 from .base import Client, ClientPool, get_client_pool
-from .http import default_ark_client, load_request
-from .sse import AsyncSSEDecoder
+from .http import default_ark_client, default_sync_ark_client, load_request
+from .sse import AsyncSSEDecoder, ServerSentEvent, SSEParser
 
 __all__ = [
     "Client",
     "ClientPool",
     "AsyncSSEDecoder",
+    "ServerSentEvent",
+    "SSEParser",
     "default_ark_client",
+    "default_sync_ark_client",
     "load_request",
     "get_client_pool",
 ]
@@ -12,12 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import importlib.util
 import logging
+import os
+import threading
+import weakref
 from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
+import httpx
+from volcenginesdkarkruntime import Ark, AsyncArk
+from volcenginesdkarkruntime._constants import BASE_URL, DEFAULT_TIMEOUT
+
 from arkitect.telemetry.trace import task
 from arkitect.utils.common import Singleton
 
+# HTTP/2 needs the optional h2 package (httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+ArkClientKey = Tuple[str, Optional[str], Optional[str], Optional[str], str]
+
 
 class Client(Singleton):
     """
@@ -35,6 +49,26 @@ class ClientPool(Singleton):
     _registry: Dict[str, Type[Client]] = {}
     clients: Dict[str, Client] = {}
 
+    ark_limits: httpx.Limits = httpx.Limits(
+        max_connections=1000, max_keepalive_connections=200, keepalive_expiry=60.0
+    )
+    """connection limits shared by all the pooled Ark clients of a process"""
+    ark_timeout: httpx.Timeout = httpx.Timeout(connect=1.0, timeout=60.0)
+    sync_ark_timeout: httpx.Timeout = DEFAULT_TIMEOUT
+    """the SDK default, sync callers run long non-streamed completions"""
+    ark_http2: bool = _HTTP2_AVAILABLE
+
+    _sync_ark_clients: Dict[ArkClientKey, Ark] = {}
+    _sync_http_client: Optional[httpx.Client] = None
+    _sync_lock = threading.Lock()
+    # async connections belong to the event loop they were opened in
+    _async_ark_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ArkClientKey, AsyncArk]]" = (  # noqa: E501
+        weakref.WeakKeyDictionary()
+    )
+    _async_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (  # noqa: E501
+        weakref.WeakKeyDictionary()
+    )
+
     def __init__(
         self,
         clients: Dict[str, Tuple[Type[Client], Dict[str, Any]]],
@@ -90,6 +124,135 @@ class ClientPool(Singleton):
 
         return func
 
+    @staticmethod
+    def _ark_client_key(
+        base_url: Optional[str],
+        api_key: Optional[str],
+        ak: Optional[str],
+        sk: Optional[str],
+        region: str,
+    ) -> ArkClientKey:
+        # the credentials Ark and AsyncArk read from the environment by default
+        return (
+            str(base_url or BASE_URL).rstrip("/"),
+            api_key or os.environ.get("ARK_API_KEY"),
+            ak or os.environ.get("VOLC_ACCESSKEY"),
+            sk or os.environ.get("VOLC_SECRETKEY"),
+            region,
+        )
+
+    @classmethod
+    def get_ark_client(
+        cls,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        ak: Optional[str] = None,
+        sk: Optional[str] = None,
+        region: str = "cn-beijing",
+    ) -> AsyncArk:
+        """
+        Get the AsyncArk client of the running event loop for these credentials.
+
+        The clients of a loop share one HTTP connection pool, so requests reuse
+        the open connections instead of paying a TLS handshake each.
+        Outside of an event loop a new, unpooled client is returned.
+        """
+        key = cls._ark_client_key(base_url, api_key, ak, sk, region)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return cls._new_ark_client(AsyncArk, key, None, cls.ark_timeout)
+        clients = cls._async_ark_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            http_client = cls._async_http_clients.get(loop)
+            if http_client is None or http_client.is_closed:
+                http_client = httpx.AsyncClient(
+                    limits=cls.ark_limits,
+                    timeout=cls.ark_timeout,
+                    http2=cls.ark_http2,
+                    follow_redirects=True,
+                )
+                cls._async_http_clients[loop] = http_client
+            client = cls._new_ark_client(AsyncArk, key, http_client, cls.ark_timeout)
+            clients[key] = client
+        return client
+
+    @classmethod
+    def get_sync_ark_client(
+        cls,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        ak: Optional[str] = None,
+        sk: Optional[str] = None,
+        region: str = "cn-beijing",
+    ) -> Ark:
+        """
+        Get the Ark client for these credentials,
+        shared by all the threads of the process along with its connections.
+        Its timeout is sync_ark_timeout, a caller needing another one
+        uses client.with_options(timeout=...).
+        """
+        key = cls._ark_client_key(base_url, api_key, ak, sk, region)
+        client = cls._sync_ark_clients.get(key)
+        if client is not None:
+            return client
+        with cls._sync_lock:
+            client = cls._sync_ark_clients.get(key)
+            if client is None:
+                if cls._sync_http_client is None or cls._sync_http_client.is_closed:
+                    cls._sync_http_client = httpx.Client(
+                        limits=cls.ark_limits,
+                        timeout=cls.sync_ark_timeout,
+                        http2=cls.ark_http2,
+                        follow_redirects=True,
+                    )
+                client = cls._new_ark_client(
+                    Ark, key, cls._sync_http_client, cls.sync_ark_timeout
+                )
+                cls._sync_ark_clients[key] = client
+        return client
+
+    @classmethod
+    def _new_ark_client(
+        cls,
+        client_cls: Type,
+        key: ArkClientKey,
+        http_client: Any,
+        timeout: httpx.Timeout,
+    ) -> Any:
+        base_url, api_key, ak, sk, region = key
+        return client_cls(
+            base_url=base_url,
+            api_key=api_key,
+            ak=ak,
+            sk=sk,
+            region=region,
+            timeout=timeout,
+            http_client=http_client,
+        )
+
+    @classmethod
+    async def aclose_ark_clients(cls) -> None:
+        """
+        Shutdown hook: closes the pooled Ark clients of the running event loop
+        and the sync ones, with their connections.
+        """
+        loop = asyncio.get_running_loop()
+        cls._async_ark_clients.pop(loop, None)
+        http_client = cls._async_http_clients.pop(loop, None)
+        if http_client is not None:
+            await http_client.aclose()
+        cls.close_sync_ark_clients()
+
+    @classmethod
+    def close_sync_ark_clients(cls) -> None:
+        with cls._sync_lock:
+            cls._sync_ark_clients.clear()
+            if cls._sync_http_client is not None:
+                cls._sync_http_client.close()
+                cls._sync_http_client = None
+
     @classmethod
     async def async_get_client(cls, name: str, config: Dict[str, Any]) -> Client:
         """
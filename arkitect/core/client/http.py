@@ -12,26 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Type
+from typing import Optional, Type
 
 import fastapi
-from httpx import Timeout
 from pydantic import ValidationError
-from volcenginesdkarkruntime import AsyncArk
+from volcenginesdkarkruntime import Ark, AsyncArk
 
 from arkitect.core.errors import InvalidParameter, parse_pydantic_error
 from arkitect.core.runtime import RequestType
 
-from .base import get_client_pool
+from .base import ClientPool, get_client_pool
 
 
 def default_ark_client() -> AsyncArk:
     """
-    Retrieves or creates an instance of the AsyncArk client.
+    Retrieves the AsyncArk client.
 
-    This function attempts to fetch an existing client from the client pool.
-    If no client is found, it creates a new instance of the AsyncArk client
-    with a specified timeout configuration.
+    This function attempts to fetch the client registered as "ark" in the
+    client pool. If no client is registered, the pooled AsyncArk client of the
+    running event loop for the credentials of the environment is returned.
 
     Returns:
         AsyncArk: An instance of the AsyncArk client.
@@ -39,10 +38,26 @@ def default_ark_client() -> AsyncArk:
     client_pool = get_client_pool()
     client: AsyncArk = client_pool.get_client("ark")  # type: ignore
     if not client:
-        client = AsyncArk(timeout=Timeout(connect=1.0, timeout=60.0))
+        client = ClientPool.get_ark_client()
     return client
 
 
+def default_sync_ark_client(client: Optional[AsyncArk] = None) -> Ark:
+    """
+    Retrieves the pooled Ark client, for the credentials of client if given,
+    of the environment otherwise.
+    """
+    if not isinstance(client, AsyncArk):
+        return ClientPool.get_sync_ark_client()
+    return ClientPool.get_sync_ark_client(
+        base_url=str(client._base_url),
+        api_key=client.api_key,
+        ak=client.ak,
+        sk=client.sk,
+        region=client.region,
+    )
+
+
 async def load_request(
     http_request: fastapi.Request,
     req_cls: Type[RequestType],
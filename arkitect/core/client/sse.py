@@ -12,44 +12,214 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import AsyncIterator
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, List, Optional, Union
 
 from aiohttp import StreamReader
 
+_LF = 0x0A
+_CR = 0x0D
+_COLON = 0x3A
+_SPACE = 0x20
+
+
+@dataclass
+class ServerSentEvent:
+    data: bytes
+    event: str = "message"
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+
+class SSEParser(object):
+    """
+    Incremental parser of an SSE byte stream,
+    following https://html.spec.whatwg.org/multipage/server-sent-events.html.
+
+    Network chunks are appended to a single buffer and split in place,
+    event boundaries may fall anywhere in a chunk.
+    The data of a single line event is copied once out of the buffer.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        # bytes at the start of the buffer known to contain no line ending
+        self._scanned = 0
+        # a CR ended the previous feed, a LF starting the next one is part of it
+        self._skip_lf = False
+        self._data: List[bytes] = []
+        self._event = ""
+        self._retry: Optional[int] = None
+        self.last_event_id: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[ServerSentEvent]:
+        buffer = self._buffer
+        buffer += chunk
+        size = len(buffer)
+        events: List[ServerSentEvent] = []
+        pos = 0
+        if self._skip_lf and size:
+            self._skip_lf = False
+            if buffer[0] == _LF:
+                pos = 1
+
+        search_from = max(pos, self._scanned)
+        # next line ending positions, only searched again once passed,
+        # so the buffer is scanned once whatever the number of lines
+        next_lf = buffer.find(b"\n", search_from)
+        next_cr = buffer.find(b"\r", search_from)
+        # without CR (the usual LF streams) lines are split on LF only,
+        # a CR in last position may be the first half of a CRLF
+        lf_only = next_cr < 0 or next_cr == size - 1
+        data = self._data
+        with memoryview(buffer) as view:
+            while True:
+                if 0 <= next_lf < pos:
+                    next_lf = buffer.find(b"\n", pos)
+                if 0 <= next_cr < pos:
+                    next_cr = buffer.find(b"\r", pos)
+                if lf_only:
+                    if next_lf < 0:
+                        break
+                    next_pos = next_lf + 1
+                    end = (
+                        next_lf - 1
+                        if next_lf > pos and buffer[next_lf - 1] == _CR
+                        else next_lf
+                    )
+                elif next_lf < 0 and next_cr < 0:
+                    break
+                elif next_cr < 0 or 0 <= next_lf < next_cr:
+                    end, next_pos = next_lf, next_lf + 1
+                elif next_cr + 1 < size:
+                    end = next_cr
+                    next_pos = (
+                        next_cr + 2 if buffer[next_cr + 1] == _LF else next_cr + 1
+                    )
+                else:
+                    # CR as the last byte, the LF may come with the next chunk
+                    end, next_pos = next_cr, size
+                    self._skip_lf = True
+
+                # fast path for data and blank lines, the bulk of a stream
+                if end == pos:
+                    if data:
+                        events.append(self._dispatch())
+                        data = self._data
+                    else:
+                        self._event = ""
+                elif buffer.startswith(b"data:", pos, end):
+                    value_start = pos + 5
+                    if value_start < end and buffer[value_start] == _SPACE:
+                        value_start += 1
+                    data.append(bytes(view[value_start:end]))
+                else:
+                    self._process_line(buffer, view, pos, end)
+                pos = next_pos
+
+        if pos:
+            del buffer[:pos]
+        # a trailing CR is scanned again with the next chunk
+        self._scanned = len(buffer) - (1 if buffer and buffer[-1] == _CR else 0)
+        return events
+
+    def flush(self) -> Optional[ServerSentEvent]:
+        """
+        Ends the stream, a trailing event without the final blank line is
+        still dispatched.
+        """
+        buffer = self._buffer
+        # a last line ended by a lone CR is still in the buffer
+        end = len(buffer) - 1 if buffer and buffer[-1] == _CR else len(buffer)
+        if end:
+            with memoryview(buffer) as view:
+                self._process_line(buffer, view, 0, end)
+        buffer.clear()
+        self._scanned = 0
+        self._skip_lf = False
+        if not self._data:
+            return None
+        return self._dispatch()
+
+    def _dispatch(self) -> ServerSentEvent:
+        data = self._data[0] if len(self._data) == 1 else b"\n".join(self._data)
+        event = ServerSentEvent(
+            data=data,
+            event=self._event or "message",
+            id=self.last_event_id,
+            retry=self._retry,
+        )
+        self._data = []
+        self._event = ""
+        return event
+
+    def _process_line(
+        self, buffer: bytearray, view: memoryview, start: int, end: int
+    ) -> None:
+        if start == end or buffer[start] == _COLON:
+            # blank line at the end of the stream, or comment
+            return
+
+        colon = buffer.find(b":", start, end)
+        if colon < 0:
+            field_end = value_start = end
+        else:
+            field_end = colon
+            value_start = colon + 1
+            if value_start < end and buffer[value_start] == _SPACE:
+                value_start += 1
+
+        field = view[start:field_end]
+        if field == b"data":
+            self._data.append(bytes(view[value_start:end]))
+        elif field == b"event":
+            self._event = str(view[value_start:end], "utf-8", "replace")
+        elif field == b"id":
+            value = bytes(view[value_start:end])
+            if b"\0" not in value:
+                self.last_event_id = value.decode("utf-8", "replace")
+        elif field == b"retry":
+            value = bytes(view[value_start:end])
+            if value.isdigit():
+                self._retry = int(value)
+
 
 class AsyncSSEDecoder(object):
     """
-    A class for decoding SSE response from a StreamReader.
+    A class for decoding SSE response from a StreamReader
+    or any async iterable of bytes chunks.
     """
 
-    def __init__(self, source: StreamReader) -> None:
+    def __init__(self, source: Union[StreamReader, AsyncIterable[bytes]]) -> None:
         self.source = source
 
-    async def _read(self) -> AsyncIterator[bytes]:
-        data = b""
-        async for chunk in self.source:
-            for line in chunk.splitlines(True):
-                data += line
-                if data.endswith((b"\r\r", b"\n\n", b"\r\n\r\n")):
-                    yield data
-                    data = b""
-        if data:
-            yield data
+    def _chunks(self) -> AsyncIterable[bytes]:
+        if isinstance(self.source, StreamReader):
+            # whatever is available, no line splitting by the reader
+            return self.source.iter_any()
+        return self.source
 
-    async def next(self) -> AsyncIterator[bytes]:
+    async def events(self) -> AsyncIterator[ServerSentEvent]:
         """
-        Decodes the next event from the SSE stream.
+        Decodes the events from the SSE stream.
         """
-        async for chunk in self._read():
-            for line in chunk.splitlines():
-                # skip comment
-                if line.startswith(b":"):
-                    continue
-
-                if b":" in line:
-                    field, value = line.split(b":", 1)
-                else:
-                    field, value = line, b""
+        parser = SSEParser()
+        async for chunk in self._chunks():
+            for event in parser.feed(chunk):
+                yield event
+        last = parser.flush()
+        if last is not None:
+            yield last
 
-                if field == b"data" and len(value) > 0:
-                    yield value
+    async def next(self) -> AsyncIterator[bytes]:
+        """
+        Decodes the data of the next event from the SSE stream.
+        """
+        parser = SSEParser()
+        async for chunk in self._chunks():
+            for event in parser.feed(chunk):
+                if event.data:
+                    yield event.data
+        last = parser.flush()
+        if last is not None and last.data:
+            yield last.data
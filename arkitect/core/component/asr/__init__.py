@@ -12,7 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from arkitect.core.component.asr.asr_client import AsyncASRClient, BaseAsyncASRClient
-from arkitect.core.component.asr.model import ASRFullServerResponse
+from arkitect.core.component.asr.asr_client import (
+    ASRUplinkStats,
+    AsyncASRClient,
+    BaseAsyncASRClient,
+)
+from arkitect.core.component.asr.model import ASRCompression, ASRFullServerResponse
+from arkitect.core.component.asr.session import ASRSessionManager
 
-__all__ = ["BaseAsyncASRClient", "AsyncASRClient", "ASRFullServerResponse"]
+__all__ = [
+    "BaseAsyncASRClient",
+    "AsyncASRClient",
+    "ASRCompression",
+    "ASRFullServerResponse",
+    "ASRUplinkStats",
+    "ASRSessionManager",
+]
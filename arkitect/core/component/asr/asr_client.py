@@ -14,10 +14,12 @@
 
 import asyncio
 import gzip
-import struct
+import time
 import uuid
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterable, Optional
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Optional, Tuple
 
 import websockets
 
@@ -26,6 +28,7 @@ from arkitect.core.component.asr.model import (
     ASRAudio,
     ASRAudioInfoRsp,
     ASRAudioOnlyRequest,
+    ASRCompression,
     ASRFullClientRequest,
     ASRFullServerResponse,
     ASRRequest,
@@ -36,14 +39,49 @@ from arkitect.telemetry.logger import INFO
 from arkitect.telemetry.trace import task
 from arkitect.utils.binary_protocol import (  # type: ignore
     AUDIO_ONLY_REQUEST,
+    GZIP,
+    NEG_SEQUENCE,
+    NO_COMPRESSION,
     NO_SEQUENCE,
     POS_SEQUENCE,
-    generate_before_payload,
-    generate_header,
+    FrameEncoder,
+    decode_frame,
     parse_response,
 )
 
-__all__ = ["BaseAsyncASRClient", "AsyncASRClient"]
+__all__ = ["BaseAsyncASRClient", "AsyncASRClient", "ASRUplinkStats"]
+
+
+@dataclass
+class ASRUplinkStats:
+    """
+    Audio sent by a client: packets, bytes before and after compression
+    and the CPU time spent compressing.
+    """
+
+    packets: int = 0
+    compressed_packets: int = 0
+    audio_bytes: int = 0
+    sent_bytes: int = 0
+    compress_seconds: float = 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        """Audio bytes per byte sent, 1 when nothing was compressed."""
+        return self.audio_bytes / self.sent_bytes if self.sent_bytes else 1.0
+
+    @property
+    def compress_seconds_per_packet(self) -> float:
+        if not self.compressed_packets:
+            return 0.0
+        return self.compress_seconds / self.compressed_packets
+
+
+def _gzip(data: bytes, level: int) -> Tuple[bytes, float]:
+    # CPU time of the calling thread, the event loop's or an executor's
+    start = time.thread_time()
+    compressed = gzip.compress(data, compresslevel=level)
+    return compressed, time.thread_time() - start
 
 
 class BaseAsyncASRClient(ABC):
@@ -78,7 +116,23 @@ class AsyncASRClient(BaseAsyncASRClient, ABC):
         audio_format: ASRAudio = DEFAULT_ASR_AUDIO,
         user: Optional[ASRUser] = None,
         model_name: str = "bigmodel",
+        compression: ASRCompression = ASRCompression.AUTO,
+        compression_level: int = 1,
+        min_compression_ratio: float = 1.2,
+        probe_packets: int = 8,
+        offload_bytes: int = 64 * 1024,
+        compression_executor: Optional[Executor] = None,
     ):
+        """
+        :param compression: which frames are gzipped, see ASRCompression.
+            PCM and Opus audio barely compress, AUTO stops compressing it
+            when the first probe_packets packets do not reach
+            min_compression_ratio.
+        :param compression_level: gzip level, 1 is the fastest.
+        :param offload_bytes: packets of at least this size are compressed
+            on compression_executor, the default executor of the loop if None,
+            instead of the event loop thread.
+        """
         self.api_resource_id = api_resource_id
         self.access_key = access_key
         self.app_key = app_key
@@ -93,6 +147,18 @@ class AsyncASRClient(BaseAsyncASRClient, ABC):
         self.conn: Optional[websockets.WebSocketClientProtocol] = None
         self.session_id: Optional[str] = None
         self.inited = False
+        self._ready = asyncio.Event()
+        # frames are sent one at a time, the buffer is reused between them
+        self._encoder = FrameEncoder()
+
+        self.compression = compression
+        self.compression_level = compression_level
+        self.min_compression_ratio = min_compression_ratio
+        self.probe_packets = probe_packets
+        self.offload_bytes = offload_bytes
+        self.compression_executor = compression_executor
+        self.uplink_stats = ASRUplinkStats()
+        self._compress_audio = compression in (ASRCompression.GZIP, ASRCompression.AUTO)
 
     async def init(self) -> None:
         if self.inited:
@@ -119,11 +185,19 @@ class AsyncASRClient(BaseAsyncASRClient, ABC):
 
         INFO(f"Inited asr client: {init_response}")
         self.inited = True
+        self._ready.set()
+
+    async def wait_ready(self) -> None:
+        """
+        Wait until the connection is established and the session is started.
+        """
+        await self._ready.wait()
 
     async def reset_conn(self) -> None:
         if self.conn:
             await self.conn.close()
             self.inited = False
+            self._ready.clear()
         await self.init()
         INFO("Reset ASR Connection")
 
@@ -153,8 +227,8 @@ class AsyncASRClient(BaseAsyncASRClient, ABC):
         async def receive_response_task() -> AsyncIterable[ASRFullServerResponse]:
             while True:
                 if not self.inited:
-                    INFO("ASR client is disconnected, skip the audio input.")
-                    await asyncio.sleep(1)
+                    INFO("ASR client is disconnected, wait for reconnection.")
+                    await self._ready.wait()
                     continue
                 response = await self._receive_response()
                 INFO(f"Received asr server response: {response}")
@@ -172,6 +246,7 @@ class AsyncASRClient(BaseAsyncASRClient, ABC):
             await self.conn.close()
             self.conn = None
         self.inited = False
+        self._ready.clear()
 
     @task()
     async def _send_full_client_request(
@@ -180,16 +255,15 @@ class AsyncASRClient(BaseAsyncASRClient, ABC):
         payload_bytes = str.encode(
             full_client_request.model_dump_json(exclude_none=True, exclude_unset=True)
         )
-        payload_bytes = gzip.compress(payload_bytes)
-        full_client_bytes = bytearray(
-            generate_header(message_type_specific_flags=POS_SEQUENCE)
+        compress = self.compression != ASRCompression.NONE
+        if compress:
+            payload_bytes = gzip.compress(payload_bytes, self.compression_level)
+        full_client_bytes = self._encoder.encode(
+            payload_bytes,
+            message_type_specific_flags=POS_SEQUENCE,
+            compression_type=GZIP if compress else NO_COMPRESSION,
+            sequence=1,
         )
-        full_client_bytes.extend(generate_before_payload(sequence=1))
-        full_client_bytes.extend(
-            (len(payload_bytes)).to_bytes(4, "big")
-        )  # payload size(4 bytes)
-        full_client_bytes.extend(payload_bytes)
-        # payload
 
         await self.conn.send(full_client_bytes)  # type: ignore
         res = await self.conn.recv()  # type: ignore
@@ -201,29 +275,57 @@ class AsyncASRClient(BaseAsyncASRClient, ABC):
             # connection is closed.
             INFO("ASR Conn is closed, will ignore the audio.")
             return
-        payload_bytes = gzip.compress(audio_only_request.audio)
-        audio_only_bytes = bytearray(
-            generate_header(
-                message_type=AUDIO_ONLY_REQUEST, message_type_specific_flags=NO_SEQUENCE
-            )
+        compress = self._compress_audio
+        payload_bytes = audio_only_request.audio
+        if compress:
+            payload_bytes = await self._compress(payload_bytes)
+        stats = self.uplink_stats
+        stats.packets += 1
+        stats.audio_bytes += len(audio_only_request.audio)
+        stats.sent_bytes += len(payload_bytes)
+        audio_only_bytes = self._encoder.encode(
+            payload_bytes,
+            message_type=AUDIO_ONLY_REQUEST,
+            message_type_specific_flags=(
+                NEG_SEQUENCE if audio_only_request.last_package else NO_SEQUENCE
+            ),
+            compression_type=GZIP if compress else NO_COMPRESSION,
         )
-        audio_only_bytes.extend(struct.pack(">I", len(payload_bytes)))
-        audio_only_bytes.extend(payload_bytes)  # payload
         await self.conn.send(audio_only_bytes)
         INFO(f"Sent Data INFO ASR SEVER data len={len(payload_bytes)}")
 
+    async def _compress(self, audio: bytes) -> bytes:
+        if len(audio) >= self.offload_bytes:
+            # zlib releases the GIL, the loop keeps serving other calls
+            compressed, seconds = await asyncio.get_running_loop().run_in_executor(
+                self.compression_executor, _gzip, audio, self.compression_level
+            )
+        else:
+            compressed, seconds = _gzip(audio, self.compression_level)
+        stats = self.uplink_stats
+        stats.compressed_packets += 1
+        stats.compress_seconds += seconds
+        if (
+            self.compression == ASRCompression.AUTO
+            and stats.compressed_packets >= self.probe_packets
+        ):
+            self._compress_audio = stats.compression_ratio >= self.min_compression_ratio
+            if not self._compress_audio:
+                INFO(
+                    "ASR audio compression disabled, "
+                    f"ratio={stats.compression_ratio:.2f}"
+                )
+        return compressed
+
     async def _receive_response(self) -> Optional[ASRFullServerResponse]:
         if not self.conn:
             # connection is closed.
             return None
-        res = await self.conn.recv()
-        parsed_res = parse_response(res)
-        # print(parsed_res)
+        frame = decode_frame(await self.conn.recv())
+        payload_msg = frame.message() or {}
         return ASRFullServerResponse(
-            sequence=parsed_res.get("payload_sequence"),
-            last_package=parsed_res.get("is_last_package", False),
-            result=ASRResult(**parsed_res.get("payload_msg", {}).get("result", {})),
-            audio=ASRAudioInfoRsp(
-                **parsed_res.get("payload_msg", {}).get("audio_info", {})
-            ),
+            sequence=frame.payload_sequence,
+            last_package=frame.is_last_package,
+            result=ASRResult(**payload_msg.get("result", {})),
+            audio=ASRAudioInfoRsp(**payload_msg.get("audio_info", {})),
         )
@@ -12,11 +12,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from enum import Enum
 from typing import List, Optional
 
 from pydantic import BaseModel
 
 
+class ASRCompression(str, Enum):
+    """
+    Compression of the frames sent to the ASR server.
+    """
+
+    NONE = "none"
+    """Nothing is compressed."""
+    CONTROL = "control"
+    """Only the JSON control frames are gzipped, audio is sent as is."""
+    GZIP = "gzip"
+    """Control frames and audio are gzipped."""
+    AUTO = "auto"
+    """
+    Audio is gzipped for the first packets of the session, and kept gzipped
+    only if it compresses by at least the minimum ratio of the client.
+    """
+
+
 class ASRClientConnectRequest(BaseModel):
     pass
 
@@ -0,0 +1,234 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from collections import deque
+from typing import AsyncIterable, Callable, Deque, Optional
+
+import websockets
+
+from arkitect.core.component.asr.asr_client import AsyncASRClient
+from arkitect.core.component.asr.model import (
+    ASRAudioOnlyRequest,
+    ASRFullServerResponse,
+)
+from arkitect.telemetry.logger import INFO, WARN
+
+__all__ = ["ASRSessionManager"]
+
+
+class ASRSessionManager:
+    """
+    Runs ASR streams over pre-warmed AsyncASRClient sessions.
+
+    While one utterance is streaming, the session for the next one is
+    connected in the background, so a new stream starts without a handshake.
+    If the transport drops mid-stream, the session is re-established with
+    bounded retries, the audio already sent is replayed to the new session,
+    then the remaining audio is streamed to it. The caller keeps consuming
+    the same response iterator, whose results cover the whole stream.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], AsyncASRClient],
+        prewarm: bool = True,
+        max_retries: int = 3,
+        retry_backoff: float = 0.2,
+        max_replay_bytes: int = 1024 * 1024,
+    ) -> None:
+        """
+        :param client_factory: creates a new, uninitialized AsyncASRClient.
+        :param prewarm: keep the session for the next stream connected ahead.
+        :param max_retries: reconnection attempts after a transport drop.
+        :param retry_backoff: initial backoff in seconds, doubled per attempt.
+        :param max_replay_bytes: audio of the stream kept to be replayed after
+            a drop, the oldest audio is dropped beyond it, about 30s of
+            16kHz 16-bit audio by default.
+        """
+        self.client_factory = client_factory
+        self.prewarm = prewarm
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_replay_bytes = max_replay_bytes
+
+        self._spare: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self) -> None:
+        """
+        Start connecting the first session ahead of the first stream.
+        """
+        if self.prewarm and self._spare is None:
+            self._spare = asyncio.create_task(self._connect())
+
+    async def close(self) -> None:
+        self._closed = True
+        spare, self._spare = self._spare, None
+        if spare is None:
+            return
+        if not spare.done():
+            spare.cancel()
+        try:
+            client = await spare
+        except BaseException:
+            return
+        await client.close()
+
+    async def _connect(self) -> AsyncASRClient:
+        delay = self.retry_backoff
+        for attempt in range(self.max_retries + 1):
+            client = self.client_factory()
+            try:
+                await client.init()
+                return client
+            except (OSError, websockets.WebSocketException) as e:
+                await client.close()
+                if attempt == self.max_retries:
+                    raise
+                WARN(f"ASR connect failed, attempt {attempt + 1}: {e}")
+                await asyncio.sleep(delay)
+                delay *= 2
+        raise AssertionError("unreachable")
+
+    async def acquire(self) -> AsyncASRClient:
+        """
+        Take the pre-warmed session, or connect one if none is ready.
+        """
+        if self._closed:
+            raise RuntimeError("ASR session manager is closed")
+        spare, self._spare = self._spare, None
+        client: Optional[AsyncASRClient] = None
+        if spare is not None:
+            try:
+                client = await spare
+            except Exception as e:
+                WARN(f"Pre-warmed ASR session failed: {e}")
+        if client is None or client.conn is None or not client.conn.open:
+            client = await self._connect()
+        if self.prewarm:
+            self._spare = asyncio.create_task(self._connect())
+        return client
+
+    async def stream_asr(
+        self, stream_audio: AsyncIterable[bytes]
+    ) -> AsyncIterable[ASRFullServerResponse]:
+        """
+        Streams audio over a pre-warmed session and yields responses until the
+        server answers the last package.
+        """
+        session = _ReconnectingSession(self, await self.acquire())
+        sender = asyncio.create_task(session.send_all(stream_audio))
+        try:
+            async for response in session.receive_all():
+                yield response
+            await sender
+        finally:
+            if not sender.done():
+                sender.cancel()
+            await session.client.close()
+
+
+class _ReconnectingSession:
+    def __init__(self, manager: ASRSessionManager, client: AsyncASRClient) -> None:
+        self.manager = manager
+        self.client = client
+        self.generation = 0
+        self._lock = asyncio.Lock()
+        self._ready = asyncio.Event()
+        self._ready.set()
+        self._failed: Optional[BaseException] = None
+        # audio sent in this stream, replayed to a new session after a drop
+        self._sent: Deque[bytes] = deque()
+        self._sent_bytes = 0
+
+    async def wait_ready(self) -> int:
+        await self._ready.wait()
+        if self._failed is not None:
+            raise self._failed
+        return self.generation
+
+    async def reconnect(self, generation: int) -> None:
+        """
+        Replace the dropped session, the sender and the receiver may both
+        observe the drop, only the first one reconnects.
+        """
+        async with self._lock:
+            if self._failed is not None:
+                raise self._failed
+            if generation != self.generation:
+                return
+            INFO("ASR transport dropped, reconnecting")
+            self._ready.clear()
+            await self.client.close()
+            try:
+                self.client = await self.manager._connect()
+                await self._replay()
+                self.generation += 1
+            except BaseException as e:
+                self._failed = e
+                raise
+            finally:
+                self._ready.set()
+
+    async def _replay(self) -> None:
+        if not self._sent:
+            return
+        INFO(f"replaying {self._sent_bytes} bytes of audio to the new ASR session")
+        for data in self._sent:
+            await self.client._send_audio(
+                audio_only_request=ASRAudioOnlyRequest(
+                    last_package=False, seq=0, audio=data
+                )
+            )
+
+    async def send_all(self, stream_audio: AsyncIterable[bytes]) -> None:
+        async for data in stream_audio:
+            await self._send(ASRAudioOnlyRequest(last_package=False, seq=0, audio=data))
+        await self._send(ASRAudioOnlyRequest(last_package=True, seq=0, audio=b""))
+
+    async def _send(self, request: ASRAudioOnlyRequest) -> None:
+        while True:
+            generation = await self.wait_ready()
+            try:
+                await self.client._send_audio(audio_only_request=request)
+                break
+            except websockets.ConnectionClosed:
+                await self.reconnect(generation)
+        if request.audio:
+            self._keep_sent(request.audio)
+
+    def _keep_sent(self, data: bytes) -> None:
+        self._sent.append(data)
+        self._sent_bytes += len(data)
+        max_bytes = self.manager.max_replay_bytes
+        if self._sent_bytes > max_bytes:
+            WARN("ASR replay buffer is full, the oldest audio is not replayed")
+            while self._sent and self._sent_bytes > max_bytes:
+                self._sent_bytes -= len(self._sent.popleft())
+
+    async def receive_all(self) -> AsyncIterable[ASRFullServerResponse]:
+        while True:
+            generation = await self.wait_ready()
+            try:
+                response = await self.client._receive_response()
+            except websockets.ConnectionClosed:
+                await self.reconnect(generation)
+                continue
+            if response is None:
+                # the session was closed underneath us
+                return
+            yield response
+            if response.last_package:
+                return
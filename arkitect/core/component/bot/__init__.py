@@ -13,5 +13,6 @@
 # limitations under the License.
 
 from arkitect.core.component.bot.server import BotServer
+from arkitect.core.component.bot.workers import WorkerManager
 
-__all__ = ["BotServer"]
+__all__ = ["BotServer", "WorkerManager"]
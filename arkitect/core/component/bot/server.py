@@ -14,7 +14,17 @@
 
 import asyncio
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Dict, Generic, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generic,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 
 import fastapi
 import uvicorn
@@ -24,7 +34,7 @@ from pydantic import BaseModel, Field
 from starlette.responses import StreamingResponse
 from volcenginesdkarkruntime._exceptions import ArkAPIError
 
-from arkitect.core.client import Client, get_client_pool, load_request
+from arkitect.core.client import Client, ClientPool, get_client_pool, load_request
 from arkitect.core.component.llm import ArkChatRequest
 from arkitect.core.errors import APIException, ArkError, InternalServiceError
 from arkitect.core.runtime import AsyncRunner, RequestType, ResponseType
@@ -33,6 +43,7 @@ from .middleware import (
     ListenDisconnectionMiddleware,
     LogIdMiddleware,
 )
+from .workers import WorkerManager
 
 
 def _get_lock() -> asyncio.Lock:
@@ -81,6 +92,8 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
         @asynccontextmanager
         async def lifespan(app: FastAPI) -> AsyncIterator[Dict[str, Any]]:
             yield {"client_pool": get_client_pool(clients)}
+            # the connections of the pooled Ark clients
+            await ClientPool.aclose_ark_clients()
 
         super().__init__(
             runner=runner,
@@ -101,7 +114,7 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
             )
 
             if request.stream:
-                generator = self.runner.astream(request)
+                generator = self.runner.astream_bytes(request)
                 return StreamingResponse(generator, media_type="text/event-stream")
             else:
                 return await self.runner.arun(request)
@@ -168,3 +181,36 @@ class BotServer(BaseModel, Generic[RequestType, ResponseType]):
         **kwargs: Any,
     ) -> None:
         uvicorn.run(app, host=host, port=port, workers=workers_num, **kwargs)
+
+    @staticmethod
+    def serve(
+        app_factory: Callable[[], FastAPI],
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        workers_num: int = 1,
+        graceful_timeout: float = 30.0,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Production serving, the app is built by app_factory in every worker,
+        workers_num processes accept on the same listening socket.
+        In-flight requests get graceful_timeout seconds to finish on shutdown.
+        """
+        if workers_num <= 1:
+            uvicorn.run(
+                app_factory,
+                factory=True,
+                host=host,
+                port=port,
+                timeout_graceful_shutdown=int(graceful_timeout),
+                **kwargs,
+            )
+            return
+        WorkerManager(
+            app_factory,
+            host=host,
+            port=port,
+            workers_num=workers_num,
+            graceful_timeout=graceful_timeout,
+            **kwargs,
+        ).run()
@@ -0,0 +1,124 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import multiprocessing
+import signal
+import socket
+import threading
+from multiprocessing.context import BaseContext
+from types import FrameType
+from typing import Any, Callable, List, Optional
+
+import uvicorn
+from fastapi import FastAPI
+
+AppFactory = Callable[[], FastAPI]
+
+
+def _run_worker(config: uvicorn.Config, sock: socket.socket) -> None:
+    # the app factory is called here, once per worker process
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class WorkerManager:
+    """
+    Pre-fork serving: binds the listening socket once,
+    then runs workers_num uvicorn workers accepting on the shared socket.
+
+    Each worker builds its own app with app_factory, so clients, event loops
+    and the app lifespan (which initializes the ClientPool)
+    are created in the worker and never shared across processes.
+    Dead workers are restarted. On SIGINT/SIGTERM, workers are asked
+    to stop accepting and get graceful_timeout seconds
+    to drain in-flight requests and streams before being killed.
+
+    :param start_method: multiprocessing start method, "fork" where available.
+        With "spawn", app_factory must be picklable (e.g. a module level function).
+    """
+
+    def __init__(
+        self,
+        app_factory: AppFactory,
+        host: str = "0.0.0.0",
+        port: int = 8080,
+        workers_num: int = 2,
+        graceful_timeout: float = 30.0,
+        start_method: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.config = uvicorn.Config(
+            app_factory,
+            factory=True,
+            host=host,
+            port=port,
+            timeout_graceful_shutdown=int(graceful_timeout),
+            **kwargs,
+        )
+        self.workers_num = workers_num
+        self.graceful_timeout = graceful_timeout
+        if start_method is None:
+            start_method = (
+                "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+            )
+        self.context: BaseContext = multiprocessing.get_context(start_method)
+        self.processes: List[multiprocessing.process.BaseProcess] = []
+        self.should_exit = threading.Event()
+
+    def _start_worker(self, sock: socket.socket) -> multiprocessing.process.BaseProcess:
+        process = self.context.Process(  # type: ignore[attr-defined]
+            target=_run_worker, args=(self.config, sock), daemon=False
+        )
+        process.start()
+        logging.info(f"started worker process [{process.pid}]")
+        return process
+
+    def handle_exit(self, sig: int, frame: Optional[FrameType]) -> None:
+        self.should_exit.set()
+
+    def run(self) -> None:
+        sock = self.config.bind_socket()
+        # bind_socket leaves proto at 0, asyncio only sets TCP_NODELAY on the
+        # accepted sockets of an IPPROTO_TCP socket: small responses would wait
+        # for the delayed ACK of the client, ~40ms per keep-alive request
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock = socket.socket(fileno=sock.detach())
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self.handle_exit)
+        try:
+            self.processes = [self._start_worker(sock) for _ in range(self.workers_num)]
+            while not self.should_exit.wait(0.5):
+                for i, process in enumerate(self.processes):
+                    if not process.is_alive():
+                        logging.warning(
+                            f"worker process [{process.pid}] exited "
+                            f"with code {process.exitcode}, restarting"
+                        )
+                        self.processes[i] = self._start_worker(sock)
+        finally:
+            self.shutdown()
+            sock.close()
+
+    def shutdown(self) -> None:
+        # uvicorn workers stop accepting on SIGTERM and drain open connections
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            process.join(self.graceful_timeout + 5)
+            if process.is_alive():
+                logging.warning(f"worker process [{process.pid}] killed")
+                process.kill()
+                process.join()
+        self.processes = []
@@ -12,7 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, AsyncIterable, Dict, List, Literal, Mapping, Optional, Union
+from typing import (
+    Any,
+    AsyncIterable,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from volcenginesdkarkruntime import AsyncArk
 from volcenginesdkarkruntime.resources.chat import AsyncChat
@@ -26,13 +36,42 @@ from volcenginesdkarkruntime.types.chat.chat_completion_message import (
     ChatCompletionMessage,
 )
 
+from arkitect.core.component.llm.model import ArkChatCompletionAccumulator
+
 from .hooks import ChatHook, default_chat_hook
 from .model import State, ToolType
 
 
+class _ToolSchemas:
+    """
+    The tool schemas sent to the model, built again only when the tools change.
+    """
+
+    def __init__(self) -> None:
+        self._tools: List[Tuple[str, ToolType]] = []
+        self._schemas: List[Dict[str, Any]] = []
+
+    def get(self, tools: Mapping[str, ToolType]) -> List[Dict[str, Any]]:
+        items = list(tools.items())
+        if len(items) != len(self._tools) or any(
+            name != cached_name or tool is not cached_tool
+            for (name, tool), (cached_name, cached_tool) in zip(items, self._tools)
+        ):
+            self._schemas = [tool.tool_schema().model_dump() for _, tool in items]
+            self._tools = items
+        return self._schemas
+
+
 class _AsyncCompletions(AsyncCompletions):
-    def __init__(self, client: AsyncArk, state: State, hooks: List[ChatHook]):
+    def __init__(
+        self,
+        client: AsyncArk,
+        state: State,
+        hooks: List[ChatHook],
+        tool_schemas: Optional[_ToolSchemas] = None,
+    ):
         self._state = state
+        self._tool_schemas = tool_schemas or _ToolSchemas()
         if len(hooks) > 0:
             self.hooks = hooks
         else:
@@ -47,14 +86,12 @@ class _AsyncCompletions(AsyncCompletions):
         **kwargs: Dict[str, Any],
     ) -> Union[ChatCompletion, AsyncIterable[ChatCompletionChunk]]:
         parameters = (
-            self._state.parameters.__dict__
+            dict(self._state.parameters.__dict__)
             if self._state.parameters is not None
             else {}
         )
         if tools is not None:
-            parameters["tools"] = [
-                tool.tool_schema().model_dump() for tool in tools.values() or []
-            ]
+            parameters["tools"] = self._tool_schemas.get(tools)
         for hook in self.hooks:
             messages = await hook(self._state, messages)
         resp = await super().create(
@@ -71,30 +108,17 @@ class _AsyncCompletions(AsyncCompletions):
         else:
 
             async def iterator() -> AsyncIterable[ChatCompletionChunk]:
-                final_tool_calls = {}
+                accumulator = ArkChatCompletionAccumulator()
+                async for chunk in resp:
+                    accumulator.add(chunk)
+                    yield chunk
                 chat_completion_messages = ChatCompletionMessage(
                     role="assistant",
-                    content="",
+                    content=accumulator.content() or "",
                     tool_calls=[],
                 )
-                async for chunk in resp:
-                    if len(chunk.choices) > 0:
-                        if chunk.choices[0].delta.content:
-                            chat_completion_messages.content += chunk.choices[
-                                0
-                            ].delta.content
-                        if chunk.choices[0].delta.tool_calls:
-                            for tool_call in chunk.choices[0].delta.tool_calls:
-                                index = tool_call.index
-                                if index not in final_tool_calls:
-                                    final_tool_calls[index] = tool_call
-                                else:
-                                    final_tool_calls[
-                                        index
-                                    ].function.arguments += tool_call.function.arguments
-                    yield chunk
                 chat_completion_messages.tool_calls = [
-                    v.model_dump() for v in final_tool_calls.values()
+                    v.model_dump() for v in accumulator.tool_calls()
                 ]
                 self._state.messages.append(chat_completion_messages.__dict__)
 
@@ -105,8 +129,12 @@ class _AsyncChat(AsyncChat):
     def __init__(self, client: AsyncArk, state: State, hooks: List[ChatHook] = []):
         self._state = state
         self.hooks = hooks
+        # shared by the completions of the chat, i.e. computed once per Context
+        self._tool_schemas = _ToolSchemas()
         super().__init__(client)
 
     @property
     def completions(self) -> _AsyncCompletions:
-        return _AsyncCompletions(self._client, self._state, self.hooks)
+        return _AsyncCompletions(
+            self._client, self._state, self.hooks, self._tool_schemas
+        )
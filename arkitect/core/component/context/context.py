@@ -12,7 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any, AsyncIterable, Dict, List, Literal, Optional, Union
+import asyncio
+from typing import Any, AsyncIterable, Dict, List, Literal, Optional, Tuple, Union
 
 from volcenginesdkarkruntime.types.chat import (
     ChatCompletion,
@@ -27,9 +28,11 @@ from arkitect.core.component.llm.model import (
     ArkContextParameters,
 )
 from arkitect.core.component.tool.pool import ToolManifest
+from arkitect.utils import gather
 
 from .chat_completion import _AsyncChat
 from .context_completion import _AsyncContext
+from .hooks import ChatHook
 from .model import State
 from .tool import _AsyncTool
 
@@ -42,11 +45,26 @@ class _AsyncCompletions:
         last_message = self._ctx.get_latest_message()
         if last_message is None or not last_message.get("tool_calls"):
             return True
+        calls: List[Tuple[_AsyncTool, Any]] = []
         for tool_call in last_message.get("tool_calls"):
             tool = self._ctx.tools.get(tool_call.get("function", {}).get("name"))
-            if tool is None:
-                continue
+            if tool is not None:
+                calls.append((tool, tool_call))
+        if len(calls) == 1:
+            tool, tool_call = calls[0]
             await tool.execute(parameter=tool_call)
+            return False
+
+        # independent calls run concurrently, the results keep the call order
+        semaphore = asyncio.Semaphore(self._ctx.tool_concurrency)
+
+        async def run(tool: _AsyncTool, tool_call: Any) -> ChatCompletionMessageParam:
+            async with semaphore:
+                return await tool.run(parameter=tool_call)
+
+        # gather cancels the remaining calls if one of them fails
+        messages = await gather(*[run(tool, tool_call) for tool, tool_call in calls])
+        self._ctx.state.messages.extend(messages)
         return False
 
     async def create(
@@ -113,7 +131,20 @@ class Context:
         tools: Dict[str, ToolManifest] = {},
         parameters: Optional[ArkChatParameters] = None,
         context_parameters: Optional[ArkContextParameters] = None,
+        history_policy: Optional[ChatHook] = None,
+        tool_concurrency: int = 8,
+        tool_timeout: Optional[float] = None,
     ):
+        """
+        :param history_policy: chat hook selecting the messages sent to the model,
+            e.g. SlidingWindowPolicy or SummarizingPolicy to keep the prompt
+            under a token budget. All the messages are sent by default.
+        :param tool_concurrency: maximum number of the tool calls of a model turn
+            executed at the same time.
+        :param tool_timeout: seconds each tool call may take, no limit by default.
+            Can be set per tool on ctx.tools[name].timeout.
+        """
+        self.tool_concurrency = max(1, tool_concurrency)
         self.client = default_ark_client()
         self.state = State(
             model=model,
@@ -122,13 +153,18 @@ class Context:
             parameters=parameters,
             context_parameters=context_parameters,
         )
-        self.chat = _AsyncChat(client=self.client, state=self.state)
+        self.chat = _AsyncChat(
+            client=self.client,
+            state=self.state,
+            hooks=[history_policy] if history_policy is not None else [],
+        )
         if context_parameters is not None:
             self.context = _AsyncContext(client=self.client, state=self.state)
         self.tools = {
             tool_name: _AsyncTool(
                 state=self.state,
                 tool=tool,
+                timeout=tool_timeout,
             )
             for tool_name, tool in tools.items()
         }
@@ -0,0 +1,258 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+from typing import Any, Awaitable, Callable, List, Mapping, Optional
+
+from volcenginesdkarkruntime.types.chat import ChatCompletionMessageParam
+
+from arkitect.telemetry.logger import INFO, WARN
+
+from .model import State
+
+TokenEstimator = Callable[[ChatCompletionMessageParam], int]
+Summarizer = Callable[[Optional[str], List[ChatCompletionMessageParam]], Awaitable[str]]
+
+# CJK punctuation, kana, ideographs, hangul and full width forms
+_CJK = re.compile(
+    "[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff"
+    "\uac00-\ud7af\uff00-\uffef]"
+)
+_MESSAGE_OVERHEAD_TOKENS = 4
+_IMAGE_TOKENS = 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Offline approximation of a tokenizer:
+    a token per CJK character, a token per 4 characters otherwise.
+    """
+    if not text:
+        return 0
+    others = len(_CJK.sub("", text))
+    return len(text) - others + (others + 3) // 4
+
+
+def estimate_message_tokens(message: ChatCompletionMessageParam) -> int:
+    message = _as_mapping(message)
+    tokens = _MESSAGE_OVERHEAD_TOKENS
+    content = message.get("content")
+    if isinstance(content, str):
+        tokens += estimate_tokens(content)
+    elif isinstance(content, list):
+        for part in content:
+            part = _as_mapping(part)
+            if part.get("type") == "text":
+                tokens += estimate_tokens(part.get("text") or "")
+            else:
+                tokens += _IMAGE_TOKENS
+    for tool_call in message.get("tool_calls") or []:
+        function = _as_mapping(_as_mapping(tool_call).get("function") or {})
+        tokens += estimate_tokens(function.get("name") or "")
+        tokens += estimate_tokens(function.get("arguments") or "")
+    return tokens
+
+
+def _as_mapping(obj: Any) -> Mapping[str, Any]:
+    return obj if isinstance(obj, Mapping) else obj.__dict__
+
+
+class _Group:
+    # messages sent or dropped together:
+    # an assistant message with tool calls and its tool results
+    __slots__ = ("start", "end", "tokens", "pinned", "has_tool_calls")
+
+    def __init__(self, start: int, has_tool_calls: bool) -> None:
+        self.start = start
+        self.end = start
+        self.tokens = 0
+        self.pinned = False
+        self.has_tool_calls = has_tool_calls
+
+
+class SlidingWindowPolicy:
+    """
+    Chat hook sending the most recent messages that fit in max_tokens.
+
+    System messages (and tool call results with pin_tool_results) are pinned,
+    they are always sent. An assistant message with tool calls and its tool
+    results are kept or dropped together. Only the messages added since the
+    previous turn are estimated, dropped messages never come back,
+    so a turn costs O(new messages) whatever the length of the session.
+
+    One policy instance serves one Context.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        estimator: TokenEstimator = estimate_message_tokens,
+        pin_tool_results: bool = False,
+    ) -> None:
+        self.max_tokens = max_tokens
+        self.estimator = estimator
+        self.pin_tool_results = pin_tool_results
+        self._reset(None)
+
+    async def __call__(
+        self, state: State, messages: List[ChatCompletionMessageParam]
+    ) -> List[ChatCompletionMessageParam]:
+        if state is not self._state or len(state.messages) < self._counted:
+            self._reset(state)
+        state.messages.extend(messages)
+        self._count_new_messages(state.messages)
+        evicted = self._evict()
+        return await self._build(state, evicted)
+
+    def _reset(self, state: Optional[State]) -> None:
+        self._state = state
+        self._groups: List[_Group] = []
+        self._counted = 0
+        # first group in the window, the older pinned messages are in _pinned
+        self._window_start = 0
+        self._window_tokens = 0
+        self._pinned: List[ChatCompletionMessageParam] = []
+        self._pinned_tokens = 0
+
+    def _is_pinned(self, message: Mapping[str, Any]) -> bool:
+        role = message.get("role")
+        return role == "system" or (self.pin_tool_results and role == "tool")
+
+    def _count_new_messages(self, messages: List[ChatCompletionMessageParam]) -> None:
+        for i in range(self._counted, len(messages)):
+            message = _as_mapping(messages[i])
+            last = self._groups[-1] if self._groups else None
+            if not (
+                last is not None
+                and last.has_tool_calls
+                and message.get("role") == "tool"
+                and last.end == i
+            ):
+                last = _Group(i, bool(message.get("tool_calls")))
+                self._groups.append(last)
+            tokens = self.estimator(messages[i])
+            last.end = i + 1
+            last.tokens += tokens
+            last.pinned = last.pinned or self._is_pinned(message)
+            self._window_tokens += tokens
+        self._counted = len(messages)
+
+    def _budget(self) -> int:
+        return self.max_tokens
+
+    def _evict(self) -> List[ChatCompletionMessageParam]:
+        assert self._state is not None
+        messages = self._state.messages
+        evicted: List[ChatCompletionMessageParam] = []
+        # the latest group is always sent
+        while (
+            self._pinned_tokens + self._window_tokens > self._budget()
+            and self._window_start < len(self._groups) - 1
+        ):
+            group = self._groups[self._window_start]
+            self._window_start += 1
+            self._window_tokens -= group.tokens
+            if group.pinned:
+                self._pinned.extend(messages[group.start : group.end])
+                self._pinned_tokens += group.tokens
+            else:
+                evicted.extend(messages[group.start : group.end])
+        return evicted
+
+    async def _build(
+        self, state: State, evicted: List[ChatCompletionMessageParam]
+    ) -> List[ChatCompletionMessageParam]:
+        if not self._groups:
+            return []
+        start = self._groups[self._window_start].start
+        return self._pinned + state.messages[start:]
+
+
+class SummarizingPolicy(SlidingWindowPolicy):
+    """
+    Sliding window where the dropped messages are folded into a running summary,
+    sent as a system message between the pinned messages and the window.
+
+    summarizer(previous_summary, dropped_messages) returns the new summary,
+    it is only given the messages dropped since the previous summary.
+    A longer summary is cut to summary_max_tokens. If the summarizer fails,
+    the previous summary is kept and the dropped messages are given again
+    on the next turn.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        summarizer: Summarizer,
+        estimator: TokenEstimator = estimate_message_tokens,
+        pin_tool_results: bool = False,
+        summary_max_tokens: Optional[int] = None,
+    ) -> None:
+        super().__init__(max_tokens, estimator, pin_tool_results)
+        self.summarizer = summarizer
+        self.summary_max_tokens = summary_max_tokens or max_tokens // 4
+
+    def _reset(self, state: Optional[State]) -> None:
+        super()._reset(state)
+        self.summary: Optional[str] = None
+        # dropped messages not in the summary yet, the summarizer failed
+        self._unsummarized: List[ChatCompletionMessageParam] = []
+
+    def _budget(self) -> int:
+        # room is kept for the summary
+        return self.max_tokens - self.summary_max_tokens
+
+    async def _build(
+        self, state: State, evicted: List[ChatCompletionMessageParam]
+    ) -> List[ChatCompletionMessageParam]:
+        window = await super()._build(state, evicted)
+        evicted = self._unsummarized + evicted
+        if evicted:
+            try:
+                summary = await self.summarizer(self.summary, evicted)
+            except Exception as e:
+                WARN(f"summarizer failed, {len(evicted)} messages are retried: {e}")
+                self._unsummarized = evicted
+            else:
+                self._unsummarized = []
+                self.summary = self._cut_summary(summary)
+        if not self.summary:
+            return window
+        pinned = len(self._pinned)
+        return window[:pinned] + [self._summary_message(self.summary)] + window[pinned:]
+
+    @staticmethod
+    def _summary_message(summary: str) -> ChatCompletionMessageParam:
+        return {
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{summary}",
+        }
+
+    def _summary_fits(self, summary: str) -> bool:
+        tokens = self.estimator(self._summary_message(summary))
+        return tokens <= self.summary_max_tokens
+
+    def _cut_summary(self, summary: str) -> str:
+        if self._summary_fits(summary):
+            return summary
+        # longest prefix that fits, found with O(log(len)) estimations
+        low, high = 0, len(summary)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._summary_fits(summary[:middle]):
+                low = middle
+            else:
+                high = middle - 1
+        INFO(f"summary of {len(summary)} characters is cut to {low}")
+        return summary[:low]
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import json
-from typing import Any, List
+from typing import Any, List, Optional
 
 from pydantic import BaseModel, Field
 from volcenginesdkarkruntime.types.chat import (
@@ -24,32 +24,49 @@ from volcenginesdkarkruntime.types.chat import (
 from arkitect.core.component.context.hooks import ToolHook
 from arkitect.core.component.context.model import State
 from arkitect.core.component.llm.model import ChatCompletionTool, FunctionDefinition
-from arkitect.core.component.tool import ArkToolResponse, ToolManifest
+from arkitect.core.component.tool import ArkToolResponse, ToolManifest, execute_tool
 
 
 class _AsyncTool(BaseModel):
     state: State
     hooks: List[ToolHook] = Field(default_factory=list)
     tool: ToolManifest
+    timeout: Optional[float] = None
+    """Seconds a call may take, a timed out call answers with status_code 504."""
 
     async def execute(
         self, parameter: ChatCompletionAssistantMessageParam, **kwargs: Any
     ) -> ChatCompletionMessageParam:
+        message = await self.run(parameter, **kwargs)
+        self.state.messages.append(message)
+        return message
+
+    async def run(
+        self, parameter: ChatCompletionAssistantMessageParam, **kwargs: Any
+    ) -> ChatCompletionMessageParam:
+        """
+        Executes the tool call and returns the tool message,
+        without adding it to the state.
+        """
         for hook in self.hooks:
             parameter = await hook(self.state, parameter)
         arguments = parameter.get("function", {}).get("arguments", "{}")
-        resp = await self.tool.executor(json.loads(arguments), **kwargs)
-        if isinstance(resp, ChatCompletionMessageParam):
-            self.state.messages.append(resp)
-        elif isinstance(resp, ArkToolResponse):
-            self.state.messages.append(
-                {
-                    "role": "tool",
-                    "tool_call_id": parameter.get("id", ""),
-                    "content": resp.model_dump_json(),
-                }
-            )
-        return self.state.messages[-1]
+        resp = await execute_tool(
+            self.tool,
+            json.loads(arguments),
+            self.timeout,
+            name=parameter.get("function", {}).get("name"),
+            **kwargs,
+        )
+        # ChatCompletionMessageParam is a union of TypedDicts,
+        # it does not support isinstance
+        if isinstance(resp, ArkToolResponse):
+            return {
+                "role": "tool",
+                "tool_call_id": parameter.get("id", ""),
+                "content": resp.model_dump_json(),
+            }
+        return resp
 
     def tool_schema(self) -> ChatCompletionTool:
         """
@@ -13,11 +13,17 @@
 # limitations under the License.
 
 from .llm import BaseChatLanguageModel
-from .model import ArkChatCompletionChunk, ArkChatRequest, ArkChatResponse
+from .model import (
+    ArkChatCompletionAccumulator,
+    ArkChatCompletionChunk,
+    ArkChatRequest,
+    ArkChatResponse,
+)
 
 __all__ = [
     "BaseChatLanguageModel",
     "ArkChatRequest",
     "ArkChatResponse",
     "ArkChatCompletionChunk",
+    "ArkChatCompletionAccumulator",
 ]
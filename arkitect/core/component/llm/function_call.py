@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import copy
 import json
 import logging
@@ -22,9 +23,9 @@ from volcenginesdkarkruntime.types.chat import (
     ChatCompletionChunk,
 )
 
-from arkitect.core.component.tool import ArkToolResponse, ToolManifest
+from arkitect.core.component.tool import ArkToolResponse, ToolManifest, execute_tool
 from arkitect.telemetry.trace import task
-from arkitect.utils import dump_json_str
+from arkitect.utils import dump_json_str, gather
 
 from .model import (
     ArkChatCompletionChunk,
@@ -36,6 +37,36 @@ from .model import (
 from .utils import convert_response_message, transform_response
 
 
+async def _call_tool(
+    tool_call: Any,
+    functions: Dict[str, ToolManifest],
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> ArkMessage:
+    tool_name = tool_call.function.name
+
+    tool = functions.get(tool_name)
+    tool_response: ArkToolResponse = ArkToolResponse()
+    if tool:
+        parameters = json.loads(tool_call.function.arguments)
+        tool_response = await execute_tool(
+            tool, parameters, timeout, name=tool_name, **kwargs
+        )
+        logging.info(
+            f"Function {tool_name} called with parameters:"
+            + dump_json_str(parameters)
+            + f" and response: {dump_json_str(tool_response)}"
+        )
+    else:
+        logging.error(f"Function {tool_name} not found")
+
+    return ArkMessage(
+        role="tool",
+        content=transform_response(tool_response.data),
+        tool_call_id=tool_call.id,
+    )
+
+
 @task()
 async def handle_function_call(
     request: ArkChatRequest,
@@ -44,6 +75,8 @@ async def handle_function_call(
     ],
     functions: Optional[Dict[str, ToolManifest]] = None,
     function_call_mode: Optional[FunctionCallMode] = FunctionCallMode.SEQUENTIAL,
+    max_concurrency: Optional[int] = None,
+    tool_timeout: Optional[float] = None,
     **kwargs: Any,
 ) -> bool:
     """
@@ -57,6 +90,12 @@ async def handle_function_call(
         response : The chat response to process.
         functions : A dictionary of available functions.
         function_call_mode : The mode for handling function calls.
+            In PARALLEL mode all tool calls of the response run concurrently,
+            tool messages are still appended in the order of the tool calls.
+        max_concurrency : Upper bound of concurrently running tool calls in
+            PARALLEL mode, unbounded if None.
+        tool_timeout : Seconds a single tool call may take, a timed out call
+            is cancelled and reported to the model as a tool message.
     """
     if response.choices[0].finish_reason != "tool_calls":
         return False
@@ -72,34 +111,31 @@ async def handle_function_call(
     if not tool_calls or not functions:
         return False
 
-    if function_call_mode and function_call_mode != FunctionCallMode.SEQUENTIAL:
-        raise NotImplementedError("Only sequential function call mode is supported")
+    if function_call_mode and function_call_mode not in (
+        FunctionCallMode.SEQUENTIAL,
+        FunctionCallMode.PARALLEL,
+    ):
+        raise NotImplementedError(
+            "Only sequential and parallel function call modes are supported"
+        )
 
     request.messages.append(convert_response_message(response_message))
 
     function_calls = copy.deepcopy(tool_calls)
-    for tool_call in function_calls:
-        tool_name = tool_call.function.name
-
-        tool = functions.get(tool_name)
-        tool_response: ArkToolResponse = ArkToolResponse()
-        if tool:
-            parameters = json.loads(tool_call.function.arguments)
-            tool_response = await tool.executor(parameters=parameters, **kwargs)
-
-            logging.info(
-                f"Function {tool_name} called with parameters:"
-                + dump_json_str(parameters)
-                + f" and response: {dump_json_str(tool_response)}"
+    if function_call_mode == FunctionCallMode.PARALLEL and len(function_calls) > 1:
+        semaphore = asyncio.Semaphore(max_concurrency or len(function_calls))
+
+        async def bounded_call(tool_call: Any) -> ArkMessage:
+            async with semaphore:
+                return await _call_tool(tool_call, functions, tool_timeout, **kwargs)
+
+        # gather keeps the order of the tool calls and cancels the
+        # remaining calls if one of them fails
+        tool_messages = await gather(*[bounded_call(tc) for tc in function_calls])
+        request.messages.extend(tool_messages)
+    else:
+        for tool_call in function_calls:
+            request.messages.append(
+                await _call_tool(tool_call, functions, tool_timeout, **kwargs)
             )
-        else:
-            logging.error(f"Function {tool_name} not found")
-
-        request.messages.append(
-            ArkMessage(
-                role="tool",
-                content=transform_response(tool_response.data),
-                tool_call_id=tool_call.id,
-            )
-        )
     return True
@@ -16,13 +16,14 @@ from typing import Any, Dict, List, Optional, Union
 
 from langchain.prompts.chat import BaseChatPromptTemplate
 from langchain.schema.output_parser import BaseTransformOutputParser
-from volcenginesdkarkruntime import Ark, AsyncArk
+from volcenginesdkarkruntime import AsyncArk
 from volcenginesdkarkruntime._streaming import AsyncStream
 from volcenginesdkarkruntime.types.chat import (
     ChatCompletion,
     ChatCompletionChunk,
 )
 
+from arkitect.core.client import default_sync_ark_client
 from arkitect.core.component.tool import ToolManifest
 from arkitect.telemetry.trace import task
 from arkitect.utils.context import get_extra_headers
@@ -30,6 +31,7 @@ from arkitect.utils.context import get_extra_headers
 from .base import BaseLanguageModel
 from .function_call import handle_function_call
 from .model import (
+    ArkChatCompletionAccumulator,
     ArkChatCompletionChunk,
     ArkChatParameters,
     ArkChatRequest,
@@ -117,7 +119,7 @@ class BaseChatLanguageModel(BaseLanguageModel):
         extra_query: Optional[Dict[str, Any]] = None,
         extra_body: Optional[Dict[str, Any]] = None,
     ) -> Union[ChatCompletion, AsyncStream[ChatCompletionChunk]]:
-        sync_client = Ark()
+        sync_client = default_sync_ark_client(self.client)
 
         extra_headers = get_extra_headers(extra_headers)
 
@@ -186,6 +188,8 @@ class BaseChatLanguageModel(BaseLanguageModel):
         *,
         functions: Optional[Dict[str, ToolManifest]] = None,
         function_call_mode: Optional[FunctionCallMode] = FunctionCallMode.SEQUENTIAL,
+        function_call_concurrency: Optional[int] = None,
+        function_call_timeout: Optional[float] = None,
         additional_system_prompts: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> ArkChatResponse:
@@ -222,7 +226,12 @@ class BaseChatLanguageModel(BaseLanguageModel):
 
             if completion.choices and completion.choices[0].finish_reason:
                 if not await handle_function_call(
-                    request, completion, functions, function_call_mode
+                    request,
+                    completion,
+                    functions,
+                    function_call_mode,
+                    max_concurrency=function_call_concurrency,
+                    tool_timeout=function_call_timeout,
                 ):
                     break
 
@@ -236,6 +245,8 @@ class BaseChatLanguageModel(BaseLanguageModel):
         *,
         functions: Optional[Dict[str, ToolManifest]] = None,
         function_call_mode: Optional[FunctionCallMode] = FunctionCallMode.SEQUENTIAL,
+        function_call_concurrency: Optional[int] = None,
+        function_call_timeout: Optional[float] = None,
         additional_system_prompts: Optional[List[str]] = None,
         **kwargs: Any,
     ) -> AsyncStream[ArkChatCompletionChunk]:
@@ -272,37 +283,35 @@ class BaseChatLanguageModel(BaseLanguageModel):
             )
             # default: one iter
             is_more_request = False
-            final_tool_calls = {}
-            cumulated = []
-            async for resp in completion:  # type: ChatCompletionChunk
-                if resp.usage:
-                    usage_chunks.append(resp)
-                    continue
-                if not resp.choices:
-                    continue
-                # cumulated chunks is used for caculator/fc inner cot output
-                cumulated.append(resp)
-                if resp.choices[0].delta.tool_calls:
-                    for tool_call in resp.choices[0].delta.tool_calls:
-                        index = tool_call.index
-                        if index not in final_tool_calls:
-                            final_tool_calls[index] = tool_call
-                        else:
-                            final_tool_calls[
-                                index
-                            ].function.arguments += tool_call.function.arguments
-                else:
+            # cumulated chunks is used for caculator/fc inner cot output
+            cumulated = ArkChatCompletionAccumulator()
+            try:
+                async for resp in completion:  # type: ChatCompletionChunk
+                    if resp.usage:
+                        usage_chunks.append(resp)
+                        continue
+                    if not resp.choices:
+                        continue
+                    cumulated.add(resp)
                     # hide tool_calls info from response
-                    if resp.choices[0].finish_reason != "tool_calls":
+                    if (
+                        not resp.choices[0].delta.tool_calls
+                        and resp.choices[0].finish_reason != "tool_calls"
+                    ):
                         yield ArkChatCompletionChunk(**resp.__dict__)
-                if resp.choices[0].finish_reason == "tool_calls":
-                    ark_resp = ArkChatCompletionChunk.merge(cumulated)
-                    ark_resp.choices[0].delta.tool_calls = list(  # type: ignore
-                        final_tool_calls.values()
-                    )
-                    is_more_request = await handle_function_call(
-                        request, ark_resp, functions, function_call_mode
-                    )
+                    if resp.choices[0].finish_reason == "tool_calls":
+                        ark_resp = cumulated.merged_chunk()
+                        is_more_request = await handle_function_call(
+                            request,
+                            ark_resp,
+                            functions,
+                            function_call_mode,
+                            max_concurrency=function_call_concurrency,
+                            tool_timeout=function_call_timeout,
+                        )
+            finally:
+                # frees the connection of a stream left early, e.g. on cancellation
+                await completion.close()
 
             if not is_more_request:
                 break
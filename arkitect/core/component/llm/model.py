@@ -541,23 +541,16 @@ class ArkChatResponse(Response):
         handle the responses in reversed order
         """
         merged = ArkChatResponse(**responses[-1].__dict__)
-        for resp in reversed(responses[:-1]):
-            for i, j in zip(merged.choices, resp.choices):
-                if isinstance(i.message.content, str) and isinstance(
-                    j.message.content, str
-                ):
-                    i.message.content = j.message.content + i.message.content
-                elif isinstance(i.message.content, list) and isinstance(
-                    j.message.content, list
-                ):
-                    i.message.content = j.message.content + i.message.content
-                else:
-                    raise TypeError("no supported merge type")
-
-            if merged.usage and resp.usage:
-                merged.usage.prompt_tokens += resp.usage.prompt_tokens
-                merged.usage.completion_tokens += resp.usage.completion_tokens
-                merged.usage.total_tokens += resp.usage.total_tokens
+        for position, choice in enumerate(merged.choices):
+            parts = [
+                resp.choices[position].message.content
+                for resp in responses
+                if len(resp.choices) > position
+            ]
+            choice.message.content = _join_content_parts(parts)
+
+        if merged.usage:
+            merged.usage = _sum_usages([resp.usage for resp in responses if resp.usage])
 
         return merged
 
@@ -635,26 +628,10 @@ class ArkChatCompletionChunk(Response):
         to ensure the `merged` have attributes `usage`
         handle the responses in reversed order
         """
-        merged = ArkChatCompletionChunk(**responses[-1].__dict__)
-        for resp in reversed(responses[:-1]):
-            for i, j in zip(merged.choices, resp.choices):
-                if isinstance(i.delta.content, str) and isinstance(
-                    j.delta.content, str
-                ):
-                    i.delta.content = j.delta.content + i.delta.content
-                elif isinstance(i.delta.content, list) and isinstance(
-                    j.delta.content, list
-                ):
-                    i.delta.content = j.delta.content + i.delta.content
-                else:
-                    raise TypeError("no supported merge type")
-
-            if merged.usage and resp.usage:
-                merged.usage.prompt_tokens += resp.usage.prompt_tokens
-                merged.usage.completion_tokens += resp.usage.completion_tokens
-                merged.usage.total_tokens += resp.usage.total_tokens
-
-        return merged
+        accumulator = ArkChatCompletionAccumulator()
+        for resp in responses:
+            accumulator.add(resp)
+        return accumulator.merged_chunk()
 
     def merge_usages(
         self, others: Union[CompletionUsage, List[CompletionUsage]]
@@ -677,3 +654,209 @@ class ArkChatCompletionChunk(Response):
 
         self.usage = total_usage
         return total_usage
+
+
+def _join_content_parts(parts: List[Any]) -> Any:
+    """
+    Join content parts in one pass, str parts are joined, list parts
+    (multi-modal content) are concatenated.
+    """
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return None
+    if all(isinstance(part, str) for part in parts):
+        return "".join(parts)
+    if all(isinstance(part, list) for part in parts):
+        return [item for part in parts for item in part]
+    raise TypeError("no supported merge type")
+
+
+def _sum_usages(usages: List[CompletionUsage]) -> CompletionUsage:
+    return CompletionUsage(
+        prompt_tokens=sum(usage.prompt_tokens for usage in usages),
+        completion_tokens=sum(usage.completion_tokens for usage in usages),
+        total_tokens=sum(usage.total_tokens for usage in usages),
+    )
+
+
+class _ToolCallBuffer:
+    def __init__(self, tool_call: completion_chunk.ChoiceDeltaToolCall) -> None:
+        self.index = tool_call.index
+        self.id = tool_call.id
+        self.type = tool_call.type
+        self.name = tool_call.function.name if tool_call.function else None
+        self.arguments: List[str] = []
+
+    def add(self, tool_call: completion_chunk.ChoiceDeltaToolCall) -> None:
+        self.id = self.id or tool_call.id
+        self.type = self.type or tool_call.type
+        if tool_call.function:
+            self.name = self.name or tool_call.function.name
+            if tool_call.function.arguments:
+                self.arguments.append(tool_call.function.arguments)
+
+    def build(self) -> completion_chunk.ChoiceDeltaToolCall:
+        return completion_chunk.ChoiceDeltaToolCall(
+            index=self.index,
+            id=self.id,
+            type=self.type,
+            function=completion_chunk.ChoiceDeltaToolCallFunction(
+                name=self.name, arguments="".join(self.arguments)
+            ),
+        )
+
+
+class _ChoiceBuffer:
+    def __init__(self) -> None:
+        self.last: Optional[completion_chunk.Choice] = None
+        self.role: Optional[str] = None
+        self.finish_reason: Optional[str] = None
+        self.content: List[Any] = []
+        self.reasoning_content: List[str] = []
+        self.tool_calls: Dict[int, _ToolCallBuffer] = {}
+
+    def add(self, choice: completion_chunk.Choice) -> None:
+        self.last = choice
+        delta = choice.delta
+        self.role = self.role or delta.role
+        self.finish_reason = choice.finish_reason or self.finish_reason
+        if delta.content is not None:
+            self.content.append(delta.content)
+        reasoning_content = getattr(delta, "reasoning_content", None)
+        if reasoning_content:
+            self.reasoning_content.append(reasoning_content)
+        for tool_call in delta.tool_calls or []:
+            if tool_call.index not in self.tool_calls:
+                self.tool_calls[tool_call.index] = _ToolCallBuffer(tool_call)
+            self.tool_calls[tool_call.index].add(tool_call)
+
+    def build_content(self) -> Any:
+        return _join_content_parts(self.content) if self.content else None
+
+    def build_tool_calls(self) -> List[completion_chunk.ChoiceDeltaToolCall]:
+        return [tc.build() for _, tc in sorted(self.tool_calls.items())]
+
+
+class ArkChatCompletionAccumulator:
+    """
+    Merges streamed chat completion chunks incrementally.
+
+    Content, reasoning content and tool call arguments are buffered as lists
+    of parts per choice and per tool call index and joined once when the
+    merged result is built, so accumulating a stream is linear in its length.
+    """
+
+    def __init__(self) -> None:
+        self._choices: Dict[int, _ChoiceBuffer] = {}
+        self._last: Optional[
+            Union[
+                ArkChatCompletionChunk,
+                completion_chunk.ChatCompletionChunk,
+                ContextChatCompletionChunk,
+            ]
+        ] = None
+        self._usages: List[CompletionUsage] = []
+        self._bot_usages: List[BotUsage] = []
+
+    def add(
+        self,
+        chunk: Union[
+            ArkChatCompletionChunk,
+            completion_chunk.ChatCompletionChunk,
+            ContextChatCompletionChunk,
+        ],
+    ) -> None:
+        self._last = chunk
+        for choice in chunk.choices:
+            if choice.index not in self._choices:
+                self._choices[choice.index] = _ChoiceBuffer()
+            self._choices[choice.index].add(choice)
+        if chunk.usage:
+            self._usages.append(chunk.usage)
+        bot_usage = getattr(chunk, "bot_usage", None)
+        if bot_usage:
+            self._bot_usages.append(bot_usage)
+
+    @property
+    def usage(self) -> Optional[CompletionUsage]:
+        return _sum_usages(self._usages) if self._usages else None
+
+    @property
+    def bot_usage(self) -> Optional[BotUsage]:
+        if not self._bot_usages:
+            return None
+        return BotUsage(
+            model_usage=[u for b in self._bot_usages for u in b.model_usage or []],
+            action_usage=[u for b in self._bot_usages for u in b.action_usage or []],
+            action_details=[
+                d for b in self._bot_usages for d in b.action_details or []
+            ],
+        )
+
+    def content(self, index: int = 0) -> Any:
+        choice = self._choices.get(index)
+        return choice.build_content() if choice else None
+
+    def tool_calls(self, index: int = 0) -> List[completion_chunk.ChoiceDeltaToolCall]:
+        choice = self._choices.get(index)
+        return choice.build_tool_calls() if choice else []
+
+    def merged_chunk(self) -> Optional[ArkChatCompletionChunk]:
+        """
+        The whole stream as a single chunk, the same as ArkChatCompletionChunk.merge.
+        """
+        if self._last is None:
+            return None
+        merged = ArkChatCompletionChunk(**self._last.__dict__)
+        choices = []
+        for index, buffer in sorted(self._choices.items()):
+            assert buffer.last is not None
+            choice = buffer.last.model_copy()
+            delta = choice.delta.model_copy()
+            delta.content = buffer.build_content()
+            if buffer.reasoning_content:
+                delta.reasoning_content = "".join(buffer.reasoning_content)
+            if buffer.tool_calls:
+                delta.tool_calls = buffer.build_tool_calls()
+            choice.delta = delta
+            choices.append(choice)
+        merged.choices = choices
+        merged.usage = self.usage
+        merged.bot_usage = self.bot_usage
+        return merged
+
+    def merged_response(self) -> Optional[ArkChatResponse]:
+        """
+        The whole stream as a non-stream chat completion response.
+        """
+        if self._last is None:
+            return None
+        choices = []
+        for index, buffer in sorted(self._choices.items()):
+            message: Dict[str, Any] = {
+                "role": buffer.role or "assistant",
+                "content": buffer.build_content(),
+            }
+            if buffer.reasoning_content:
+                message["reasoning_content"] = "".join(buffer.reasoning_content)
+            if buffer.tool_calls:
+                message["tool_calls"] = [
+                    tc.model_dump(exclude={"index"}) for tc in buffer.build_tool_calls()
+                ]
+            choices.append(
+                Choice(
+                    index=index,
+                    finish_reason=buffer.finish_reason or "stop",
+                    message=message,
+                )
+            )
+        return ArkChatResponse(
+            id=self._last.id,
+            created=self._last.created,
+            model=self._last.model,
+            object="chat.completion",
+            choices=choices,
+            usage=self.usage,
+            bot_usage=self.bot_usage,
+            metadata=getattr(self._last, "metadata", None),
+        )
@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from arkitect.core.component.prompts.custom_prompt import CustomPromptTemplate
+from arkitect.core.component.prompts.custom_prompt import (
+    CustomPromptTemplate,
+    compile_template,
+)
 
 __all__ = [
     "CustomPromptTemplate",
+    "compile_template",
 ]
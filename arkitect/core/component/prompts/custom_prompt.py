@@ -14,11 +14,18 @@
 
 from __future__ import annotations
 
+import glob
+import hashlib
+import os
+import threading
 import time
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict, deque
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 import jinja2
+import jinja2.bccache
 import pytz
 from jinja2 import Template
 from langchain.prompts.chat import BaseChatPromptTemplate
@@ -33,6 +40,107 @@ from pydantic.v1 import validator
 
 from arkitect.core.component.llm.model import ArkChatRequest
 
+_WEEKDAYS = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
+
+
+def _datetime_format(value: Union[str, datetime], format: Optional[str] = None) -> str:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+
+    if not format:
+        # `weekday()` 0~6, 6 means Sunday
+        return f'{value.strftime("%Y年%m月%d日%H时")}{_WEEKDAYS[value.weekday()]}'
+
+    return value.strftime(format)
+
+
+class _TemplateSourceLoader(jinja2.BaseLoader):
+    """
+    Loads template sources registered under their content hash.
+    Only the latest max_size sources are kept, like the compiled templates
+    in the cache of the environment.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.sources: "OrderedDict[str, str]" = OrderedDict()
+
+    def register(self, key: str, source: str) -> None:
+        self.sources[key] = source
+        self.sources.move_to_end(key)
+        while len(self.sources) > self.max_size:
+            self.sources.popitem(last=False)
+
+    def get_source(
+        self, environment: jinja2.Environment, template: str
+    ) -> Tuple[str, Optional[str], Callable[[], bool]]:
+        if template not in self.sources:
+            raise jinja2.TemplateNotFound(template)
+        # content addressed, a source never changes
+        return self.sources[template], None, lambda: True
+
+
+class _BoundedBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    Keeps the bytecode of at most max_files templates in directory,
+    the least recently written ones are removed first.
+    """
+
+    def __init__(self, directory: str, max_files: int) -> None:
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(directory)
+        self.max_files = max_files
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        super().dump_bytecode(bucket)
+        # only on a compilation, cached templates do not get here
+        files = glob.glob(os.path.join(self.directory, self.pattern % ("*",)))
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=_mtime)
+        for path in files[: len(files) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
+
+
+_CACHE_SIZE = int(os.getenv("PROMPT_TEMPLATE_CACHE_SIZE", "1000"))
+_CACHE_DIR = os.getenv("PROMPT_TEMPLATE_CACHE_DIR")
+
+_loader = _TemplateSourceLoader(_CACHE_SIZE)
+_loader_lock = threading.Lock()
+# shared by all prompt templates, compiled templates are kept in its cache,
+# and their bytecode in PROMPT_TEMPLATE_CACHE_DIR when it is set
+_environment = jinja2.Environment(
+    loader=_loader,
+    cache_size=_CACHE_SIZE,
+    bytecode_cache=(
+        _BoundedBytecodeCache(_CACHE_DIR, _CACHE_SIZE) if _CACHE_DIR else None
+    ),
+    auto_reload=False,
+)
+_environment.filters["datetime_format"] = _datetime_format
+
+
+def compile_template(source: str) -> Template:
+    """
+    Compiles a jinja2 template source once,
+    the same source returns the same cached Template while it is in the cache.
+    """
+    key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    with _loader_lock:
+        # registered again if it was evicted since, before it is loaded
+        _loader.register(key, source)
+        return _environment.get_template(key)
+
 
 class CustomPromptTemplate(BaseChatPromptTemplate):
     input_variables: List[str] = ["messages"]
@@ -56,37 +164,10 @@ class CustomPromptTemplate(BaseChatPromptTemplate):
     chat_history_keep_ai: bool = False
     chat_history_len_limit: int = 0
 
-    @classmethod
     @validator("template", pre=True)
     def validate_template(cls, v: Union[str, Template]) -> Template:
         if isinstance(v, str):
-            env = jinja2.Environment()
-
-            def _datetime_format(
-                value: Union[str, datetime], format: Optional[str] = None
-            ) -> str:
-                def _gen_time_info(t: datetime) -> str:
-                    weekdays = [
-                        "星期一",
-                        "星期二",
-                        "星期三",
-                        "星期四",
-                        "星期五",
-                        "星期六",
-                        "星期日",
-                    ]  # `tm_wday` 0~6, 6 means Sunday
-                    return f'{t.strftime("%Y年%m月%d日%H时")}{weekdays[t.weekday()]}'
-
-                if isinstance(value, str):
-                    value = datetime.fromisoformat(value)
-
-                if not format:
-                    return _gen_time_info(value)
-
-                return value.strftime(format)
-
-            env.filters["datetime_format"] = _datetime_format
-            return env.from_string(v)
+            return compile_template(v)
         return v
 
     def _gen_location_info(
@@ -106,37 +187,38 @@ class CustomPromptTemplate(BaseChatPromptTemplate):
     def _validate_and_fetch_questions_and_answers(
         self, messages: List[BaseMessage]
     ) -> Tuple[List[str], List[str], List[str]]:
-        systems: List[str] = [
-            self._must_str(msg.content) for msg in messages if msg.type == "system"
-        ]
-        questions: List[BaseMessage] = [msg for msg in messages if msg.type == "human"]
-        answers: List[BaseMessage] = [msg for msg in messages if msg.type == "ai"]
-
-        return (
-            systems,
-            [self._must_str(msg.content) for msg in questions],
-            [self._must_str(msg.content) for msg in answers],
-        )
+        systems: List[str] = []
+        questions: List[str] = []
+        answers: List[str] = []
+        for msg in messages:
+            if msg.type == "system":
+                systems.append(self._must_str(msg.content))
+            elif msg.type == "human":
+                questions.append(self._must_str(msg.content))
+            elif msg.type == "ai":
+                answers.append(self._must_str(msg.content))
+        return systems, questions, answers
 
     def _build_chat_history(self, messages: List[BaseMessage]) -> str:
-        histories: List[Union[AIMessage, HumanMessage]] = []
+        histories: Deque[Union[AIMessage, HumanMessage]] = deque()
+        history_len = 0
         if len(messages) == 0:
             raise ValueError("No user question found in the request")
         elif len(messages) > 1:
             for msg in messages[:-1]:
-                if isinstance(msg, HumanMessage) and self.chat_history_keep_human:
-                    histories.append(msg)
-                elif isinstance(msg, AIMessage) and self.chat_history_keep_ai:
+                if (isinstance(msg, HumanMessage) and self.chat_history_keep_human) or (
+                    isinstance(msg, AIMessage) and self.chat_history_keep_ai
+                ):
                     histories.append(msg)
+                    history_len += len(msg.content)
 
         if self.chat_history_len_limit > 0:
-            history_len = sum([len(msg.content) for msg in histories])
             while history_len > self.chat_history_len_limit:
-                history_len -= len(histories.pop(0).content)
+                history_len -= len(histories.popleft().content)
 
         if len(histories) > 0:
             chat_history = get_buffer_string(
-                histories, human_prefix="User", ai_prefix="Assistant"
+                list(histories), human_prefix="User", ai_prefix="Assistant"
             )
         else:
             chat_history = "无"
@@ -216,12 +298,17 @@ def format_current_meta_info(request: ArkChatRequest) -> str:
     return meta_info
 
 
+@lru_cache(maxsize=None)
+def _timezone(zone: str) -> tzinfo:
+    return pytz.timezone(zone)
+
+
+@lru_cache(maxsize=16)
 def format_time_info(timestamp: int, zone: str = "Asia/Shanghai") -> str:
+    # cached, consecutive requests mostly share the same second
     dt = datetime.fromtimestamp(timestamp)
-    cst = pytz.timezone(zone)
-    dt_cst = dt.astimezone(cst)
-    weekdays = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
+    dt_cst = dt.astimezone(_timezone(zone))
     _time_info = dt_cst.strftime("%Y年%m月%d日 %H:%M:%S")
     _time_info += "(CST) "
-    _time_info += weekdays[dt_cst.weekday()]
+    _time_info += _WEEKDAYS[dt_cst.weekday()]
     return _time_info
@@ -16,6 +16,7 @@ from .manifest import ParameterTypeEnum, ToolManifest, ToolParameter
 from .model import ArkToolRequest, ArkToolResponse
 from .pool import ToolPool
 from .schema import Calculator, LinkReader
+from .utils import execute_tool
 
 __all__ = [
     "ToolManifest",
@@ -26,4 +27,5 @@ __all__ = [
     "ArkToolResponse",
     "Calculator",
     "LinkReader",
+    "execute_tool",
 ]
@@ -194,7 +194,7 @@ class ToolManifest(BaseModel):
         response = await self.client.post(
             path="/tools/execute",
             body=parameter.model_dump(),
-            cast_to=ArkToolResponse,
+            cast_to=Dict[str, Any],
         )
         return ArkToolResponse(**response)
 
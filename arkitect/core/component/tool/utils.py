@@ -0,0 +1,45 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Union
+
+from volcenginesdkarkruntime.types.chat import ChatCompletionMessageParam
+
+from .manifest import ToolManifest
+from .model import ArkToolResponse
+
+
+async def execute_tool(
+    tool: ToolManifest,
+    parameters: Dict[str, Any],
+    timeout: Optional[float] = None,
+    name: Optional[str] = None,
+    **kwargs: Any,
+) -> Union[ArkToolResponse, ChatCompletionMessageParam]:
+    """
+    Runs the executor of tool, a call taking more than timeout seconds
+    is cancelled and answered with a status_code 504 response.
+
+    :param name: the name the model called the tool by, tool.name by default.
+    """
+    try:
+        return await asyncio.wait_for(
+            tool.executor(parameters=parameters, **kwargs), timeout
+        )
+    except asyncio.TimeoutError:
+        name = name or tool.name
+        logging.error(f"Function {name} timed out after {timeout}s")
+        return ArkToolResponse(status_code=504, data=f"Function {name} timed out")
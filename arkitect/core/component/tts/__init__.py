@@ -15,14 +15,19 @@
 from arkitect.core.component.tts.base import AsyncBaseTTSClient, TTSResponseChunk
 from arkitect.core.component.tts.bot_util import create_bot_audio_responses
 from arkitect.core.component.tts.model import AudioParams, ConnectionParams, TextRequest
+from arkitect.core.component.tts.pipeline import TextSegmenter, TTSPipeline
+from arkitect.core.component.tts.pool import TTSConnectionPool
 from arkitect.core.component.tts.tts_client import AsyncTTSClient
 
 __all__ = [
     "AsyncBaseTTSClient",
     "TTSResponseChunk",
     "AsyncTTSClient",
+    "TTSConnectionPool",
     "ConnectionParams",
     "AudioParams",
     "TextRequest",
     "create_bot_audio_responses",
+    "TextSegmenter",
+    "TTSPipeline",
 ]
@@ -13,10 +13,13 @@
 # limitations under the License.
 
 import base64
+import binascii
 import time
-from typing import AsyncIterable, Union
+from typing import Any, AsyncIterable, Dict, List, Optional, Tuple, Union
 
 import volcenginesdkarkruntime.types.chat.chat_completion_chunk as completion_chunk
+from pydantic import BaseModel, PrivateAttr
+from pydantic_core import to_json
 from volcenginesdkarkruntime.types.chat.chat_completion import (
     ChatCompletionMessage,
     Choice,
@@ -32,6 +35,8 @@ from arkitect.utils.context import get_client_reqid, get_reqid
 
 from .base import TTSResponseChunk
 
+_AUDIO_PLACEHOLDER = "__audio__"
+
 
 def _get_first_chunk(request: ArkChatRequest) -> ArkChatCompletionChunk:
     return ArkChatCompletionChunk(
@@ -50,34 +55,125 @@ def _get_first_chunk(request: ArkChatRequest) -> ArkChatCompletionChunk:
     )
 
 
-def _get_normal_chunk(
-    request: ArkChatRequest,
-    chunk: TTSResponseChunk,
-    first_audio_chunk: bool,
-    first_transcript_chunk: bool,
-    audio_id: str,
-) -> ArkChatCompletionChunk:
-    audio_chunk = {}
-    if first_audio_chunk or first_transcript_chunk:
-        audio_chunk["id"] = audio_id
-    if chunk.audio:
-        audio_chunk["data"] = base64.b64encode(chunk.audio).decode("utf-8")
-    if chunk.transcript:
-        audio_chunk["transcript"] = chunk.transcript
-    return ArkChatCompletionChunk(
-        id="1",
-        created=int(time.time()),
-        model=request.model,
-        choices=[
-            completion_chunk.Choice(
-                delta=completion_chunk.ChoiceDelta(
-                    audio=audio_chunk,
-                ),
-                index=0,
-            )
-        ],
-        object="chat.completion.chunk",
-    )
+class _AudioChunk(ArkChatCompletionChunk):
+    """
+    A chunk holding its JSON, rendered from a template.
+    sse_frame writes the JSON as is while the fields of the chunk are unchanged.
+    """
+
+    _sse_payload: Optional[bytes] = PrivateAttr(default=None)
+    # the fields the JSON was rendered from
+    _sse_fields: Optional[Tuple[Any, ...]] = PrivateAttr(default=None)
+
+    def _set_sse_payload(self, payload: bytes) -> None:
+        self._sse_payload = payload
+        self._sse_fields = self._fields()
+
+    def _sse_payload_is_current(self) -> bool:
+        # the same objects compare equal by identity, unchanged chunks are cheap
+        return self._fields() == self._sse_fields
+
+    def _fields(self) -> Tuple[Any, ...]:
+        choices = self.choices
+        if len(choices) != 1 or choices[0].delta is None:
+            return (_model_fields(self), tuple(choices))
+        choice = choices[0]
+        audio = getattr(choice.delta, "audio", None)
+        return (
+            _model_fields(self),
+            tuple(choices),
+            _model_fields(choice),
+            _model_fields(choice.delta),
+            dict(audio) if isinstance(audio, dict) else audio,
+        )
+
+
+def _model_fields(model: BaseModel) -> Tuple[Any, ...]:
+    # the SDK models keep their undeclared fields, e.g. audio, as extra
+    extra = model.__pydantic_extra__
+    return (dict(model.__dict__), dict(extra) if extra else None)
+
+
+class _AudioChunkTemplate:
+    """
+    The audio chunks of a streamed response. The JSON of a chunk is rendered
+    once, each chunk only splices its base64 audio, ids and transcript into it,
+    the audio is never scanned by a JSON serializer.
+    The chunk models are shallow copies of validated templates.
+    """
+
+    def __init__(self, request: ArkChatRequest) -> None:
+        self._delta = completion_chunk.ChoiceDelta(audio=_AUDIO_PLACEHOLDER)
+        self._choice = completion_chunk.Choice(delta=self._delta, index=0)
+        self._chunk = _AudioChunk(
+            id="1",
+            created=int(time.time()),
+            model=request.model,
+            choices=[self._choice],
+            object="chat.completion.chunk",
+        )
+        self._prefix, self._suffix = self._chunk.__pydantic_serializer__.to_json(
+            self._chunk, exclude_none=True
+        ).split(to_json(_AUDIO_PLACEHOLDER), 1)
+
+    def render(
+        self,
+        audio_id: Optional[str],
+        data: Optional[bytes],
+        transcript: Optional[str],
+    ) -> ArkChatCompletionChunk:
+        """
+        :param data: the base64 encoded audio.
+        """
+        audio: Dict[str, str] = {}
+        fields: List[bytes] = []
+        if audio_id is not None:
+            audio["id"] = audio_id
+            fields += (b',"id":', to_json(audio_id))
+        if data:
+            audio["data"] = data.decode("ascii")
+            # base64 needs no JSON escaping
+            fields += (b',"data":"', data, b'"')
+        if transcript:
+            audio["transcript"] = transcript
+            fields += (b',"transcript":', to_json(transcript))
+        if fields:
+            # the object is opened in place of the first comma
+            fields[0] = b"{" + fields[0][1:]
+        else:
+            fields.append(b"{")
+        # model_construct of the SDK models is slower than their validation
+        delta = self._delta.model_copy(update={"audio": audio})
+        choice = self._choice.model_copy(update={"delta": delta})
+        chunk = self._chunk.model_copy(update={"choices": [choice]})
+        chunk._set_sse_payload(b"".join((self._prefix, *fields, b"}", self._suffix)))
+        return chunk
+
+
+class _Base64Encoder:
+    """
+    Encodes an audio stream in base64 chunk by chunk.
+    With align, up to two bytes are carried over to the next chunk, so that only
+    the last chunk is padded and the chunks concatenate to the encoding of the
+    whole stream.
+    """
+
+    def __init__(self, align: bool) -> None:
+        self.align = align
+        self._rest = b""
+
+    def encode(self, audio: bytes) -> bytes:
+        if not self.align:
+            return binascii.b2a_base64(audio, newline=False)
+        if self._rest:
+            audio = self._rest + audio
+        end = len(audio) - len(audio) % 3
+        self._rest = audio[end:]
+        return binascii.b2a_base64(memoryview(audio)[:end], newline=False)
+
+    def flush(self) -> bytes:
+        rest, self._rest = self._rest, b""
+        return binascii.b2a_base64(rest, newline=False) if rest else b""
 
 
 def _get_last_chunk(request: ArkChatRequest) -> ArkChatCompletionChunk:
@@ -100,8 +196,13 @@ def _get_last_chunk(request: ArkChatRequest) -> ArkChatCompletionChunk:
 
 
 async def _stream_bot_response_handler(
-    tts_stream: AsyncIterable[TTSResponseChunk], request: ArkChatRequest, audio_id: str
+    tts_stream: AsyncIterable[TTSResponseChunk],
+    request: ArkChatRequest,
+    audio_id: str,
+    align_audio: bool = False,
 ) -> AsyncIterable[ArkChatCompletionChunk]:
+    template = _AudioChunkTemplate(request)
+    encoder = _Base64Encoder(align_audio)
     first_chunk = True
     first_audio_chunk = True
     first_transcript_chunk = True
@@ -109,24 +210,30 @@ async def _stream_bot_response_handler(
         if first_chunk:
             yield _get_first_chunk(request)
             first_chunk = False
-        if chunk.audio:
-            yield _get_normal_chunk(
-                request=request,
-                chunk=chunk,
-                first_audio_chunk=first_audio_chunk,
-                first_transcript_chunk=first_transcript_chunk,
-                audio_id=audio_id,
-            )
+        data = encoder.encode(chunk.audio) if chunk.audio else None
+        if not data and not chunk.transcript:
+            continue
+        # the audio id is sent until both audio and transcript were sent
+        yield template.render(
+            audio_id=(
+                audio_id if first_audio_chunk or first_transcript_chunk else None
+            ),
+            data=data,
+            transcript=chunk.transcript,
+        )
+        if data:
             first_audio_chunk = False
         if chunk.transcript:
-            yield _get_normal_chunk(
-                request=request,
-                chunk=chunk,
-                first_audio_chunk=first_audio_chunk,
-                first_transcript_chunk=first_transcript_chunk,
-                audio_id=audio_id,
-            )
             first_transcript_chunk = False
+    data = encoder.flush()
+    if data:
+        yield template.render(
+            audio_id=(
+                audio_id if first_audio_chunk or first_transcript_chunk else None
+            ),
+            data=data,
+            transcript=None,
+        )
 
     yield _get_last_chunk(request)
 
@@ -134,13 +241,13 @@ async def _stream_bot_response_handler(
 async def _bot_response_handler(
     tts_stream: AsyncIterable[TTSResponseChunk], request: ArkChatRequest, audio_id: str
 ) -> AsyncIterable[ArkChatResponse]:
-    audio_part: bytes = b""
-    audio_transcript: str = ""
+    audio_part = bytearray()
+    audio_transcript: List[str] = []
     async for chunk in tts_stream:
         if chunk.audio:
             audio_part += chunk.audio
         if chunk.transcript:
-            audio_transcript += chunk.transcript
+            audio_transcript.append(chunk.transcript)
     yield ArkChatResponse(
         id=get_reqid(),
         model=request.model,
@@ -153,7 +260,7 @@ async def _bot_response_handler(
                         id=audio_id,
                         expires_at=int(time.time()),
                         data=base64.b64encode(audio_part).decode("utf-8"),
-                        transcript=audio_transcript,
+                        transcript="".join(audio_transcript),
                     ),
                 ),
                 finish_reason="stop",
@@ -165,11 +272,23 @@ async def _bot_response_handler(
 
 
 async def create_bot_audio_responses(
-    tts_stream: AsyncIterable[TTSResponseChunk], request: ArkChatRequest
+    tts_stream: AsyncIterable[TTSResponseChunk],
+    request: ArkChatRequest,
+    align_audio: bool = False,
 ) -> AsyncIterable[Union[ArkChatCompletionChunk, ArkChatResponse]]:
+    """
+    Turns a TTS stream into chat responses with audio.
+
+    :param align_audio: in streams, carry the audio bytes over between chunks
+        so that the base64 data of the chunks concatenate to the encoding of
+        the whole audio. Each chunk then no longer holds exactly the audio of
+        the corresponding TTS chunk.
+    """
     audio_id = "audio_" + str(get_client_reqid())
     if request.stream:
-        async for chunk in _stream_bot_response_handler(tts_stream, request, audio_id):
+        async for chunk in _stream_bot_response_handler(
+            tts_stream, request, audio_id, align_audio
+        ):
             yield chunk
     else:
         async for response in _bot_response_handler(tts_stream, request, audio_id):
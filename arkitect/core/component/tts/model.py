@@ -22,6 +22,7 @@ from arkitect.core.component.tts.constants import (
     DEFAULT_SPEAKER,
     FULL_CLIENT,
     HEADER_SIZE,
+    INT_SIZE,
     JSON,
     NAMESPACE,
     NO_COMPRESSION,
@@ -52,23 +53,37 @@ class ResponseEvent(BaseModel):
     audio: bytes = b""
 
 
+_UINT = struct.Struct(">I")
+
+
 def _write_message(
+    header: bytes,
     event: Optional[int],
     payload: str,
     connection_id: Optional[str] = None,
     session_id: Optional[str] = None,
 ) -> bytes:
-    event_bytes = struct.pack(">I", event)
-    frame = event_bytes
-    if connection_id is not None:
-        connection_id_len = struct.pack(">I", len(connection_id))
-        frame += connection_id_len + connection_id.encode("utf-8")
-    if session_id is not None:
-        session_id_len = struct.pack(">I", len(session_id))
-        frame += session_id_len + session_id.encode("utf-8")
+    """
+    Builds the frame in one buffer: header, event, optional ids, sized payload.
+    """
+    ids = [
+        value.encode("utf-8")
+        for value in (connection_id, session_id)
+        if value is not None
+    ]
     payload_bytes = payload.encode("utf-8")
-    payload_len_bytes = struct.pack(">I", len(payload_bytes))
-    frame += payload_len_bytes + payload_bytes
+    frame = bytearray(
+        len(header) + 8 + sum(INT_SIZE + len(i) for i in ids) + len(payload_bytes)
+    )
+    frame[: len(header)] = header
+    ptr = len(header)
+    _UINT.pack_into(frame, ptr, event)
+    ptr += INT_SIZE
+    for value in ids + [payload_bytes]:
+        _UINT.pack_into(frame, ptr, len(value))
+        ptr += INT_SIZE
+        frame[ptr : ptr + len(value)] = value
+        ptr += len(value)
     return frame
 
 
@@ -95,31 +110,35 @@ class Message:
         return self.type_and_flag_bits & 0b00001111
 
     def write_start_connection(self) -> bytes:
-        return self._write_header() + _write_message(event=self.event, payload="{}")
+        return _write_message(self._write_header(), event=self.event, payload="{}")
 
     def write_start_tts_session(self) -> bytes:
-        return self._write_header() + _write_message(
+        return _write_message(
+            self._write_header(),
             event=self.event,
             connection_id=self.connection_id,
             payload=json.dumps(self.payload),
         )
 
     def write_text_request(self) -> bytes:
-        return self._write_header() + _write_message(
+        return _write_message(
+            self._write_header(),
             event=self.event,
             session_id=self.session_id,
             payload=json.dumps(self.payload),
         )
 
     def write_finish_session(self) -> bytes:
-        return self._write_header() + _write_message(
+        return _write_message(
+            self._write_header(),
             event=self.event,
             session_id=self.session_id,
             payload=json.dumps(self.payload),
         )
 
     def write_finish_connection(self) -> bytes:
-        return self._write_header() + _write_message(
+        return _write_message(
+            self._write_header(),
             event=self.event,
             connection_id=self.connection_id,
             payload=json.dumps(self.payload),
@@ -0,0 +1,286 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from typing import Any, AsyncIterable, List, Optional, Union
+
+from arkitect.core.component.llm.model import ArkChatCompletionChunk, ArkChatResponse
+from arkitect.core.component.tts.base import AsyncBaseTTSClient, TTSResponseChunk
+from arkitect.core.errors import InvalidParameter
+
+__all__ = ["TextSegmenter", "TTSPipeline"]
+
+# sentence ends, a segment is cut right after them
+_HARD_BREAKS = frozenset("。！？；…\n!?;")
+# clause ends, a segment is cut after them once it is long enough
+_SOFT_BREAKS = frozenset("，、：,:")
+# ascii marks also used inside numbers and abbreviations, e.g. 3.14 or 1,000,
+# only break when followed by a space
+_ASCII_BREAKS = frozenset(".,:")
+# closing marks kept with the sentence they end
+_CLOSERS = "\"')]}”’」』）】》"
+# marks kept with the break before them, e.g. the ! of ?!
+_TRAILERS = frozenset(_CLOSERS) | (_HARD_BREAKS - {"\n"})
+
+_SOURCE_END = None
+
+
+def _is_cjk(char: str) -> bool:
+    return "\u2e80" <= char <= "\u9fff" or "\uf900" <= char <= "\ufaff"
+
+
+class TextSegmenter:
+    """
+    Splits streamed text into speakable segments.
+
+    A segment ends at a sentence end, or at a clause end once it holds
+    min_chars characters. The first segment of a reply uses first_min_chars
+    instead, so the first audio is synthesized as early as possible.
+    Text without any break is cut at max_chars, at the last space for
+    languages written with spaces.
+    """
+
+    def __init__(
+        self, min_chars: int = 12, max_chars: int = 80, first_min_chars: int = 4
+    ) -> None:
+        self.min_chars = min_chars
+        self.max_chars = max(max_chars, min_chars, 1)
+        self.first_min_chars = first_min_chars
+        self._buffer = ""
+        # characters of the buffer already scanned for breaks
+        self._scanned = 0
+        self._first = True
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Adds text and returns the segments it completed.
+        """
+        self._buffer += text
+        segments: List[str] = []
+        buffer = self._buffer
+        start = 0
+        i = self._scanned
+        while i < len(buffer):
+            char = buffer[i]
+            end = None
+            if char in _ASCII_BREAKS:
+                if i + 1 == len(buffer):
+                    # wait for the next character
+                    break
+                if buffer[i + 1].isspace():
+                    end = self._break_end(buffer, start, i, char == ".")
+            elif char in _HARD_BREAKS:
+                end = self._break_end(buffer, start, i, True)
+            elif char in _SOFT_BREAKS:
+                end = self._break_end(buffer, start, i, False)
+            if end is None and i + 1 - start >= self.max_chars:
+                end = self._cut(buffer, start, i + 1)
+            if end is not None:
+                self._emit(buffer[start:end], segments)
+                start = end
+                i = end
+                continue
+            i += 1
+        self._buffer = buffer[start:]
+        self._scanned = i - start
+        return segments
+
+    def flush(self) -> List[str]:
+        """
+        Returns the rest of the text, at the end of the stream.
+        """
+        segments: List[str] = []
+        self._emit(self._buffer, segments)
+        self.reset()
+        return segments
+
+    def reset(self) -> None:
+        """
+        Drops the text not yet segmented, e.g. of an interrupted reply.
+        """
+        self._buffer = ""
+        self._scanned = 0
+        self._first = True
+
+    def _break_end(self, buffer: str, start: int, i: int, hard: bool) -> Optional[int]:
+        end = i + 1
+        while end < len(buffer) and buffer[end] in _TRAILERS:
+            end += 1
+        if hard:
+            return end
+        min_chars = self.first_min_chars if self._first else self.min_chars
+        return end if len(buffer[start:end].strip()) >= min_chars else None
+
+    def _cut(self, buffer: str, start: int, end: int) -> int:
+        if not _is_cjk(buffer[end - 1]):
+            space = buffer.rfind(" ", start + 1, end)
+            if space > start:
+                return space + 1
+        return end
+
+    def _emit(self, text: str, segments: List[str]) -> None:
+        text = text.strip()
+        # closers left over from the previous segment, or blank text
+        if text.strip(_CLOSERS):
+            segments.append(text)
+            self._first = False
+
+
+def _text_of(
+    resp: Union[ArkChatCompletionChunk, ArkChatResponse, str],
+) -> Optional[str]:
+    if isinstance(resp, str):
+        return resp
+    if isinstance(resp, ArkChatCompletionChunk):
+        return resp.choices[0].delta.content if resp.choices else None
+    if isinstance(resp, ArkChatResponse):
+        return resp.choices[0].message.content if resp.choices else None
+    raise InvalidParameter(f"Invalid type: {type(resp)}")
+
+
+class TTSPipeline:
+    """
+    Speaks a streamed LLM reply while it is being generated.
+
+    The reply is read from the start, concurrently with the TTS session setup,
+    split into segments by a TextSegmenter, and each segment is sent to TTS as
+    soon as it is complete. At most max_pending_segments segments wait for TTS
+    and max_pending_audio audio chunks wait for the caller: when TTS or the
+    caller fall behind, reading the reply pauses instead of buffering it.
+
+    cancel() stops both sides at once, e.g. on barge-in: the reply stream is
+    closed and the TTS session is abandoned.
+    """
+
+    def __init__(
+        self,
+        tts_client: AsyncBaseTTSClient,
+        segmenter: Optional[TextSegmenter] = None,
+        max_pending_segments: int = 4,
+        max_pending_audio: int = 64,
+    ) -> None:
+        self.tts_client = tts_client
+        self.segmenter = segmenter or TextSegmenter()
+        self.max_pending_segments = max_pending_segments
+        self.max_pending_audio = max_pending_audio
+        self.first_segment_latency: Optional[float] = None
+        """Seconds from speak() to the first complete segment."""
+        self.first_audio_latency: Optional[float] = None
+        """Seconds from speak() to the first audio chunk."""
+        self._tasks: List[asyncio.Task] = []
+        self._audio: Optional[asyncio.Queue] = None
+        self._cancelled = False
+
+    async def speak(
+        self,
+        source: AsyncIterable[Union[ArkChatCompletionChunk, ArkChatResponse, str]],
+        **kwargs: Any,
+    ) -> AsyncIterable[TTSResponseChunk]:
+        """
+        Yields the TTS stream of the reply, kwargs are passed to the TTS client.
+        """
+        start = time.monotonic()
+        self.first_segment_latency = self.first_audio_latency = None
+        self._cancelled = False
+        # nothing of a previous, interrupted reply is spoken
+        self.segmenter.reset()
+        segments: asyncio.Queue = asyncio.Queue(self.max_pending_segments)
+        audio: asyncio.Queue = asyncio.Queue(self.max_pending_audio)
+        self._audio = audio
+
+        reply_error: Optional[Exception] = None
+
+        async def read_reply() -> None:
+            nonlocal reply_error
+            try:
+                async for resp in source:
+                    text = _text_of(resp)
+                    if not text:
+                        continue
+                    for segment in self.segmenter.feed(text):
+                        if self.first_segment_latency is None:
+                            self.first_segment_latency = time.monotonic() - start
+                        await segments.put(segment)
+                for segment in self.segmenter.flush():
+                    await segments.put(segment)
+            except Exception as e:
+                # speak what was read, speak() raises the error after its audio
+                reply_error = e
+            await segments.put(_SOURCE_END)
+
+        async def segment_stream() -> AsyncIterable[str]:
+            while True:
+                segment = await segments.get()
+                if segment is _SOURCE_END:
+                    return
+                yield segment
+
+        async def synthesize() -> None:
+            try:
+                # tts is declared as a coroutine by the base class,
+                # the clients implement it as an async generator
+                tts_stream = self.tts_client.tts(
+                    segment_stream(), stream=True, **kwargs
+                )
+                async for chunk in tts_stream:  # type: ignore
+                    if chunk.audio and self.first_audio_latency is None:
+                        self.first_audio_latency = time.monotonic() - start
+                    await audio.put(chunk)
+            except Exception as e:
+                await audio.put(e)
+                return
+            await audio.put(_SOURCE_END)
+
+        reader = asyncio.create_task(read_reply())
+        synthesizer = asyncio.create_task(synthesize())
+        self._tasks = [reader, synthesizer]
+        try:
+            while True:
+                item = await audio.get()
+                if item is _SOURCE_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+            # the reader is cancelled in finally if TTS ended before the reply,
+            # nothing takes its segments anymore
+            if reply_error is not None and not self._cancelled:
+                raise reply_error
+        finally:
+            self._cancel_tasks()
+            await asyncio.gather(reader, synthesizer, return_exceptions=True)
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    def cancel(self) -> None:
+        """
+        Barge-in: stop reading the reply and synthesizing it,
+        the speak() stream ends after the audio chunks already yielded.
+        """
+        self._cancelled = True
+        self._cancel_tasks()
+        self.segmenter.reset()
+        audio = self._audio
+        if audio is not None:
+            # drop the audio not yet spoken
+            while not audio.empty():
+                audio.get_nowait()
+            audio.put_nowait(_SOURCE_END)
+
+    def _cancel_tasks(self) -> None:
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,334 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import websockets
+
+from arkitect.core.component.tts.constants import (
+    EventConnectionStarted,
+    EventFinishConnection,
+    EventStartConnection,
+)
+from arkitect.core.component.tts.model import Message
+from arkitect.core.component.tts.utils import parse_response
+from arkitect.telemetry.logger import INFO, WARN
+
+__all__ = ["TTSConnection", "TTSConnectionPool"]
+
+# headers that identify who a connection is authenticated as,
+# connections are only shared between clients with identical credentials
+_CREDENTIAL_HEADERS = ("X-Api-Resource-Id", "X-Api-Access-Key", "X-Api-App-Key")
+
+ConnectionKey = Tuple[str, ...]
+
+
+def _connection_key(base_url: str, headers: Dict[str, str]) -> ConnectionKey:
+    return (base_url,) + tuple(headers.get(h, "") for h in _CREDENTIAL_HEADERS)
+
+
+class TTSConnection:
+    """
+    A started bidirectional TTS websocket connection.
+
+    StartConnection has already been acknowledged by the server, so any number
+    of sequential StartSession/FinishSession rounds can run over it.
+    """
+
+    def __init__(
+        self,
+        conn: websockets.WebSocketClientProtocol,
+        key: ConnectionKey,
+        host: str,
+    ) -> None:
+        self.conn = conn
+        self.key = key
+        self.host = host
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.sessions = 0
+
+    @property
+    def closed(self) -> bool:
+        return not self.conn.open
+
+    async def ping(self, timeout: float) -> bool:
+        try:
+            pong = await self.conn.ping()
+            await asyncio.wait_for(pong, timeout)
+            return True
+        except Exception:
+            return False
+
+    async def close(self) -> None:
+        try:
+            if self.conn.open:
+                msg = Message(event=EventFinishConnection)
+                msg.payload = {}
+                await self.conn.send(msg.write_finish_connection())
+        except Exception:
+            pass
+        finally:
+            await self.conn.close()
+
+
+class _HostState:
+    def __init__(self) -> None:
+        self.idle: Dict[ConnectionKey, Deque[TTSConnection]] = {}
+        self.total = 0
+        self.cond = asyncio.Condition()
+
+    def pop_idle(self, key: ConnectionKey) -> Optional[TTSConnection]:
+        queue = self.idle.get(key)
+        if queue:
+            return queue.pop()
+        return None
+
+    def pop_any_idle(self) -> Optional[TTSConnection]:
+        oldest: Optional[Deque[TTSConnection]] = None
+        for queue in self.idle.values():
+            if queue and (oldest is None or queue[0].last_used < oldest[0].last_used):
+                oldest = queue
+        return oldest.popleft() if oldest else None
+
+
+class TTSConnectionPool:
+    """
+    A pool of warm TTS websocket connections shared by AsyncTTSClient instances.
+
+    Connections are keyed by endpoint and credentials, and limited per host.
+    When all connections of a host are busy, acquire waits for one to be
+    released instead of dialing a new one.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 16,
+        max_idle_time: float = 60.0,
+        max_sessions_per_connection: Optional[int] = None,
+        health_check_interval: float = 15.0,
+        ping_timeout: float = 2.0,
+        acquire_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        :param max_connections_per_host: upper bound of idle and busy connections
+            to a single host.
+        :param max_idle_time: seconds an idle connection is kept before eviction.
+        :param max_sessions_per_connection: recycle a connection after this many
+            sessions, unlimited if None.
+        :param health_check_interval: seconds between idle connection sweeps.
+        :param ping_timeout: seconds to wait for a pong during health checks.
+        :param acquire_timeout: seconds to wait for a free connection,
+            wait forever if None.
+        """
+        self.max_connections_per_host = max_connections_per_host
+        self.max_idle_time = max_idle_time
+        self.max_sessions_per_connection = max_sessions_per_connection
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self.acquire_timeout = acquire_timeout
+
+        self._hosts: Dict[str, _HostState] = {}
+        self._reaper: Optional[asyncio.Task] = None
+        self._closed = False
+
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    def _host_state(self, host: str) -> _HostState:
+        if host not in self._hosts:
+            self._hosts[host] = _HostState()
+        return self._hosts[host]
+
+    def _is_expired(self, conn: TTSConnection) -> bool:
+        if conn.closed:
+            return True
+        if time.monotonic() - conn.last_used > self.max_idle_time:
+            return True
+        return (
+            self.max_sessions_per_connection is not None
+            and conn.sessions >= self.max_sessions_per_connection
+        )
+
+    async def acquire(self, base_url: str, headers: Dict[str, str]) -> TTSConnection:
+        """
+        Get a started connection for base_url, dialing a new one if no idle
+        connection is available and the host is below its connection limit.
+        """
+        if self._closed:
+            raise RuntimeError("TTS connection pool is closed")
+        self._ensure_reaper()
+        key = _connection_key(base_url, headers)
+        host = urlparse(base_url).netloc
+        state = self._host_state(host)
+        stale: List[TTSConnection] = []
+        try:
+            async with state.cond:
+                while True:
+                    conn = state.pop_idle(key)
+                    while conn is not None and self._is_expired(conn):
+                        stale.append(conn)
+                        state.total -= 1
+                        conn = state.pop_idle(key)
+                    if conn is not None:
+                        self.connections_reused += 1
+                        return conn
+                    if state.total >= self.max_connections_per_host:
+                        # make room by evicting idle connections of other credentials
+                        other = state.pop_any_idle()
+                        if other is not None:
+                            stale.append(other)
+                            state.total -= 1
+                    if state.total < self.max_connections_per_host:
+                        state.total += 1
+                        break
+                    await asyncio.wait_for(state.cond.wait(), self.acquire_timeout)
+        finally:
+            for conn in stale:
+                await conn.close()
+
+        try:
+            conn = await self._connect(base_url, headers, key, host)
+        except BaseException:
+            async with state.cond:
+                state.total -= 1
+                state.cond.notify()
+            raise
+        self.connections_created += 1
+        return conn
+
+    async def release(self, conn: TTSConnection, reusable: bool = True) -> None:
+        """
+        Return a connection to the pool. Connections which are not reusable
+        (e.g. a session did not finish cleanly) are closed instead.
+        """
+        conn.sessions += 1
+        await self._put_back(conn, reusable)
+
+    async def _put_back(self, conn: TTSConnection, reusable: bool) -> None:
+        state = self._host_state(conn.host)
+        conn.last_used = time.monotonic()
+        keep = reusable and not self._closed and not self._is_expired(conn)
+        async with state.cond:
+            if keep:
+                state.idle.setdefault(conn.key, deque()).append(conn)
+            else:
+                state.total -= 1
+            state.cond.notify()
+        if not keep:
+            await conn.close()
+
+    @asynccontextmanager
+    async def connection(
+        self, base_url: str, headers: Dict[str, str]
+    ) -> AsyncIterator[TTSConnection]:
+        conn = await self.acquire(base_url, headers)
+        reusable = False
+        try:
+            yield conn
+            reusable = True
+        finally:
+            await self.release(conn, reusable=reusable)
+
+    async def prewarm(self, base_url: str, headers: Dict[str, str], size: int) -> None:
+        """
+        Dial up to size connections ahead of traffic and park them as idle.
+        """
+        size = min(size, self.max_connections_per_host)
+        conns = await asyncio.gather(
+            *[self.acquire(base_url, headers) for _ in range(size)]
+        )
+        for conn in conns:
+            await self._put_back(conn, reusable=True)
+
+    async def evict_idle(self) -> int:
+        """
+        Close idle connections which expired or fail a ping.
+
+        :return: The number of evicted connections.
+        """
+        evicted = 0
+        for state in self._hosts.values():
+            async with state.cond:
+                candidates = [c for q in state.idle.values() for c in q]
+                state.idle.clear()
+            healthy = []
+            for conn in candidates:
+                if not self._is_expired(conn) and await conn.ping(self.ping_timeout):
+                    healthy.append(conn)
+                else:
+                    await conn.close()
+                    evicted += 1
+            async with state.cond:
+                for conn in healthy:
+                    state.idle.setdefault(conn.key, deque()).appendleft(conn)
+                state.total -= len(candidates) - len(healthy)
+                state.cond.notify_all()
+        if evicted:
+            INFO("TTS pool evicted %d idle connections", evicted)
+        return evicted
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for state in self._hosts.values():
+            async with state.cond:
+                conns = [c for q in state.idle.values() for c in q]
+                state.idle.clear()
+                state.total -= len(conns)
+                state.cond.notify_all()
+            for conn in conns:
+                await conn.close()
+
+    def idle_count(self) -> int:
+        return sum(len(q) for s in self._hosts.values() for q in s.idle.values())
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap())
+
+    async def _reap(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                WARN(f"TTS pool health check failed: {e}")
+
+    @staticmethod
+    async def _connect(
+        base_url: str, headers: Dict[str, str], key: ConnectionKey, host: str
+    ) -> TTSConnection:
+        ws = await websockets.connect(base_url, extra_headers=headers)
+        try:
+            msg = Message(event=EventStartConnection)
+            await ws.send(msg.write_start_connection())
+            response = parse_response(await ws.recv())
+            if response.event != EventConnectionStarted:
+                raise ConnectionError(
+                    f"TTS connection failed, event: {response.event}, "
+                    f"payload: {response.payload_msg}"
+                )
+        except BaseException:
+            await ws.close()
+            raise
+        INFO("TTS pool dialed new connection to %s", host)
+        return TTSConnection(ws, key, host)
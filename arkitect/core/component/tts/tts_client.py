@@ -35,6 +35,7 @@ from arkitect.core.component.tts.model import (
     TextRequest,
     TTSRequest,
 )
+from arkitect.core.component.tts.pool import TTSConnection, TTSConnectionPool
 from arkitect.core.component.tts.utils import parse_response
 from arkitect.core.errors import InvalidParameter
 from arkitect.telemetry.logger import ERROR, INFO
@@ -53,7 +54,13 @@ class AsyncTTSClient(AsyncBaseTTSClient):
         conn_id: str = str(uuid.uuid4()),
         log_id: str = str(uuid.uuid4()),
         base_url: str = "wss://openspeech.bytedance.com/api/v3/tts/bidirection",
+        pool: Optional[TTSConnectionPool] = None,
     ):
+        """
+        :param pool: share warm connections with other clients through the pool,
+            sessions then run over a pooled connection which is returned to the
+            pool on close instead of being torn down.
+        """
         self.api_resource_id = api_resource_id
         self.access_key = access_key
         self.app_key = app_key
@@ -66,21 +73,31 @@ class AsyncTTSClient(AsyncBaseTTSClient):
         self.connection_params: ConnectionParams = connection_params
         self.inited = False
 
+        self.pool = pool
+        self._pooled_conn: Optional[TTSConnection] = None
+        self._session_finished = False
+
     async def init(
         self,
         namespace: str = NAMESPACE,
     ) -> None:
         headers = self._build_http_header()
-        INFO("with logID: %s , header: %s", self.log_id, headers)
-        self.conn = await websockets.connect(self.base_url, extra_headers=headers)
-        INFO("Dial server with LogID: %s", self.log_id)
-        # Create a new message with type MsgTypeFullClient and flag MsgTypeFlagWithEvent
-        msg = Message(event=EventStartConnection)
-        frame = msg.write_start_connection()
-        await self._send_frame(frame)
-        # Read ConnectionStarted message
-        response = await self.conn.recv()
-        parse_response(response)
+        if self.pool is not None:
+            self._pooled_conn = await self.pool.acquire(self.base_url, headers)
+            self.conn = self._pooled_conn.conn
+        else:
+            INFO("with logID: %s , header: %s", self.log_id, headers)
+            self.conn = await websockets.connect(self.base_url, extra_headers=headers)
+            INFO("Dial server with LogID: %s", self.log_id)
+            # Create a new message with type MsgTypeFullClient
+            # and flag MsgTypeFlagWithEvent
+            msg = Message(event=EventStartConnection)
+            frame = msg.write_start_connection()
+            await self._send_frame(frame)
+            # Read ConnectionStarted message
+            response = await self.conn.recv()
+            parse_response(response)
+        self._session_finished = False
         await self._start_tts_session(
             namespace=namespace,
             params=self.connection_params,
@@ -166,7 +183,12 @@ class AsyncTTSClient(AsyncBaseTTSClient):
                 return result
 
     async def close(self) -> None:
-        if self.conn is not None:
+        if self._pooled_conn is not None and self.pool is not None:
+            # only a cleanly finished session leaves the connection reusable
+            pooled_conn, self._pooled_conn = self._pooled_conn, None
+            self.conn = None
+            await self.pool.release(pooled_conn, reusable=self._session_finished)
+        elif self.conn is not None:
             await self.conn.close()
             self.conn = None
         self.inited = False
@@ -201,6 +223,7 @@ class AsyncTTSClient(AsyncBaseTTSClient):
             if response.audio_only:
                 yield TTSResponseChunk(event=response.event, audio=response.audio)
             if response.session_finished:
+                self._session_finished = True
                 yield TTSResponseChunk(event=response.event)
                 break
             if response.event == EventTTSSentenceStart and include_transcript:
@@ -217,6 +240,7 @@ class AsyncTTSClient(AsyncBaseTTSClient):
         stream: bool = True,
         **kwargs: Any,
     ) -> AsyncIterable[TTSResponseChunk]:
+        t: Optional[asyncio.Task] = None
         try:
             if not self.inited:
                 await self.init()
@@ -255,20 +279,26 @@ class AsyncTTSClient(AsyncBaseTTSClient):
                     await self._send_finish_session()
 
             t = asyncio.create_task(send_text_to_tts(text_stream=source))
-            audio_part: bytes = b""
-            audio_transcript: str = ""
-            async for chunk in self._get_tts_stream(include_transcript):
-                if stream:
+            if stream:
+                async for chunk in self._get_tts_stream(include_transcript):
                     yield chunk
-                if chunk.audio:
-                    audio_part += chunk.audio
-                if chunk.transcript:
-                    audio_transcript += chunk.transcript
-            if not stream:
-                yield TTSResponseChunk(audio=audio_part, transcript=audio_transcript)
+            else:
+                audio_part = bytearray()
+                audio_transcript = []
+                async for chunk in self._get_tts_stream(include_transcript):
+                    if chunk.audio:
+                        audio_part += chunk.audio
+                    if chunk.transcript:
+                        audio_transcript.append(chunk.transcript)
+                yield TTSResponseChunk(
+                    audio=bytes(audio_part), transcript="".join(audio_transcript)
+                )
             await t
             await self.close()
         except Exception as e:
             ERROR(str(e))
         finally:
+            # the stream was closed or cancelled before the end of the session
+            if t is not None and not t.done():
+                t.cancel()
             await self.close()
@@ -14,6 +14,7 @@
 
 import gzip
 import json
+import struct
 from typing import Union
 
 from arkitect.core.component.tts.constants import (
@@ -31,6 +32,27 @@ from arkitect.core.component.tts.constants import (
 )
 from arkitect.core.component.tts.model import ResponseEvent
 
+_HEADER = struct.Struct(">4B")
+_INT = struct.Struct(">i")
+_UINT = struct.Struct(">I")
+
+_NO_SESSION_ID_EVENTS = frozenset(
+    [
+        EventStartConnection,
+        EventFinishConnection,
+        EventConnectionStarted,
+        EventConnectionFailed,
+        EventConnectionFinished,
+    ]
+)
+_CONNECTION_ID_EVENTS = frozenset(
+    [
+        EventConnectionStarted,
+        EventConnectionFailed,
+        EventConnectionFinished,
+    ]
+)
+
 
 def contain_event(flags: int) -> bool:
     return flags == WITH_EVENT
@@ -47,54 +69,44 @@ def parse_response(res: Union[str, bytes]) -> ResponseEvent:
     """
     if isinstance(res, str):
         res = res.encode("utf-8")
-    header_size = res[0] & 0x0F
-    message_type_specific_flags = res[1] & 0x0F
-    serialization_method = res[2] >> 4
-    message_compression = res[2] & 0x0F
-    ptr = header_size * 4
+    # fields are read in place, only the audio is copied out of the message
+    view = memoryview(res)
+    b0, b1, b2, _ = _HEADER.unpack_from(view)
+    message_type_specific_flags = b1 & 0x0F
+    serialization_method = b2 >> 4
+    message_compression = b2 & 0x0F
+    ptr = (b0 & 0x0F) * 4
     result = ResponseEvent()
     if contain_event(message_type_specific_flags):
-        event = int.from_bytes(res[ptr : ptr + INT_SIZE], "big", signed=True)
-        ptr += 4
+        event = _INT.unpack_from(view, ptr)[0]
+        ptr += INT_SIZE
         result.event = event
         if event == EventSessionFinished:
             result.session_finished = True
-        if event not in [
-            EventStartConnection,
-            EventFinishConnection,
-            EventConnectionStarted,
-            EventConnectionFailed,
-            EventConnectionFinished,
-        ]:
-            session_id_len = int.from_bytes(
-                res[ptr : ptr + INT_SIZE], "big", signed=False
-            )
-            ptr += 4
-            session_id = res[ptr : ptr + session_id_len]
+        if event not in _NO_SESSION_ID_EVENTS:
+            session_id_len = _UINT.unpack_from(view, ptr)[0]
+            ptr += INT_SIZE
+            result.session_id = str(view[ptr : ptr + session_id_len], "utf-8")
             ptr += session_id_len
-            result.session_id = session_id.decode("utf-8")
-        if event in [
-            EventConnectionStarted,
-            EventConnectionFailed,
-            EventConnectionFinished,
-        ]:
-            connection_id_len = int.from_bytes(
-                res[ptr : ptr + INT_SIZE], "big", signed=False
-            )
-            ptr += 4
-            connection_id = res[ptr : ptr + connection_id_len]
+        if event in _CONNECTION_ID_EVENTS:
+            connection_id_len = _UINT.unpack_from(view, ptr)[0]
+            ptr += INT_SIZE
+            result.connection_id = str(view[ptr : ptr + connection_id_len], "utf-8")
             ptr += connection_id_len
-            result.connection_id = connection_id.decode("utf-8")
-    payload_size = int.from_bytes(res[ptr : ptr + INT_SIZE], "big", signed=True)
-    payload = res[ptr + INT_SIZE :]
-    payload_msg = payload
+    payload_size = _INT.unpack_from(view, ptr)[0]
+    payload = view[ptr + INT_SIZE :]
 
-    if message_compression == GZIP:
-        payload_msg = gzip.decompress(payload_msg)
     if serialization_method == JSON:
-        result.payload_msg = json.loads(payload_msg)
+        if message_compression == GZIP:
+            result.payload_msg = json.loads(gzip.decompress(payload))
+        else:
+            result.payload_msg = json.loads(str(payload, "utf-8"))
     elif serialization_method == NO_SERIALIZATION:
         result.audio_only = True
-        result.audio = payload_msg
+        result.audio = (
+            gzip.decompress(payload)
+            if message_compression == GZIP
+            else payload.tobytes()
+        )
     result.payload_size = payload_size
     return result
@@ -15,6 +15,7 @@
 from .asyncio import AsyncRunner, ChatAsyncRunner, CustomAsyncRunner
 from .model import Context, Request, RequestType, Response, ResponseType
 from .runner import load_function
+from .sse import SSE_DONE, coalesce_frames, sse_frame
 from .sync import SyncRunner
 
 __all__ = [
@@ -28,4 +29,7 @@ __all__ = [
     "ResponseType",
     "load_function",
     "Context",
+    "SSE_DONE",
+    "coalesce_frames",
+    "sse_frame",
 ]
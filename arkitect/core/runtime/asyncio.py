@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import abc
-import json
 import logging
 from typing import (
     Any,
@@ -37,10 +36,18 @@ from arkitect.core.errors import (
 )
 
 from .model import RequestType, Response, ResponseType
+from .sse import SSE_DONE, coalesce_frames, sse_frame
 
 
 class AsyncRunner(BaseModel, Generic[RequestType, ResponseType]):
     invoke: Callable[[RequestType], Coroutine[Any, Any, AsyncIterable[ResponseType]]]
+    stream_flush_interval: float = 0.0
+    """
+    seconds the frames of a stream may be held to be sent in a single write,
+    0 writes every frame on its own
+    """
+    stream_flush_bytes: int = 16 * 1024
+    """buffered bytes sent without waiting for stream_flush_interval"""
 
     class Config:
         """Configuration for this pydantic object."""
@@ -67,6 +74,37 @@ class AsyncRunner(BaseModel, Generic[RequestType, ResponseType]):
     def astream(self, request: RequestType) -> AsyncIterator[str]:
         pass
 
+    def astream_bytes(self, request: RequestType) -> AsyncIterator[bytes]:
+        """
+        SSE frames of the stream encoded for the wire,
+        coalesced according to stream_flush_interval.
+        A subclass overriding astream is streamed through its astream.
+        """
+        if _overrides_astream(type(self)):
+            frames = AsyncRunner._astream_frames(self, request)
+        else:
+            frames = self._astream_frames(request)
+        if self.stream_flush_interval > 0:
+            return coalesce_frames(
+                frames, self.stream_flush_interval, self.stream_flush_bytes
+            )
+        return frames
+
+    async def _astream_frames(self, request: RequestType) -> AsyncIterator[bytes]:
+        # runners only implementing astream
+        async for chunk in self.astream(request):
+            yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+
+def _overrides_astream(cls: type) -> bool:
+    # astream is defined below the class implementing _astream_frames
+    for klass in cls.__mro__:
+        if "_astream_frames" in vars(klass):
+            return False
+        if "astream" in vars(klass):
+            return True
+    return False
+
 
 class CustomAsyncRunner(AsyncRunner[RequestType, ResponseType]):
     response_cls: Type[ResponseType]
@@ -96,22 +134,23 @@ class CustomAsyncRunner(AsyncRunner[RequestType, ResponseType]):
             return resp
 
     async def astream(self, request: RequestType) -> AsyncIterator[str]:  # type: ignore
+        async for frame in self._astream_frames(request):
+            yield frame.decode("utf-8")
+
+    async def _astream_frames(self, request: RequestType) -> AsyncIterator[bytes]:
         try:
             async for resp in await self.invoke(request):  # type: ResponseType
-                if isinstance(resp, BaseModel):
-                    yield f"data:{resp.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
-                else:
-                    yield f"data:{json.dumps(resp, ensure_ascii=False)}\r\n\r\n"  # noqa E501
+                yield sse_frame(resp, exclude_unset=True)
         except APIException as e:
             resp = self.response_cls(error=e.to_error())
             logging.error("stream chat meet error")
-            yield f"data:{resp.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
+            yield sse_frame(resp, exclude_unset=True)
         except Exception as e:
             err = InternalServiceError(str(e))
             resp = self.response_cls(error=err.to_error())
             logging.error("stream chat meet error")
-            yield f"data:{resp.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
-        yield "data:[DONE]\r\n\r\n"
+            yield sse_frame(resp, exclude_unset=True)
+        yield SSE_DONE
 
 
 class ChatAsyncRunner(AsyncRunner[RequestType, ResponseType]):
@@ -134,17 +173,21 @@ class ChatAsyncRunner(AsyncRunner[RequestType, ResponseType]):
             raise err
 
     async def astream(self, request: RequestType) -> AsyncIterator[str]:
+        async for frame in self._astream_frames(request):
+            yield frame.decode("utf-8")
+
+    async def _astream_frames(self, request: RequestType) -> AsyncIterator[bytes]:
         try:
             async for resp in await self.invoke(request):  # type: ResponseType
-                yield f"data:{resp.model_dump_json(exclude_none=True)}\r\n\r\n"  # noqa E501
+                yield sse_frame(resp)
         except APIException as e:
             err = Response(error=e.to_error())
             logging.error(f"[API Error]: stream chat meet error:{e}")
-            yield f"data:{err.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
+            yield sse_frame(err, exclude_unset=True)
         except ValidationError as e:
             err = Response(error=parse_pydantic_error(e).to_error())
             logging.error(f"[Validation Error]: stream chat meet parameter error:{e}")
-            yield f"data:{err.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
+            yield sse_frame(err, exclude_unset=True)
         except ArkAPIError as e:
             err = Response(
                 error=ArkError(
@@ -155,9 +198,9 @@ class ChatAsyncRunner(AsyncRunner[RequestType, ResponseType]):
                 )
             )
             logging.error(f"[Calling Chat Error]: stream chat meet error:{e}")
-            yield f"data:{err.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
+            yield sse_frame(err, exclude_unset=True)
         except Exception as e:
             err = Response(error=InternalServiceError(str(e)).to_error())
             logging.error(f"[Internal Error]: stream chat meet error:{e}")
-            yield f"data:{err.model_dump_json(exclude_unset=True, exclude_none=True)}\r\n\r\n"  # noqa E501
-        yield "data:[DONE]\r\n\r\n"
+            yield sse_frame(err, exclude_unset=True)
+        yield SSE_DONE
@@ -0,0 +1,124 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+from typing import Any, AsyncIterable, AsyncIterator
+
+from pydantic import BaseModel
+
+SSE_DONE = b"data:[DONE]\r\n\r\n"
+
+_DATA = b"data:"
+_END = b"\r\n\r\n"
+
+
+def sse_frame(data: Any, exclude_unset: bool = False) -> bytes:
+    """
+    Encodes a stream response as an SSE event.
+    Models are serialized straight to bytes by pydantic-core,
+    without the intermediate strings of model_dump_json.
+    A model already holding its JSON in the private attribute _sse_payload,
+    e.g. rendered from a template, is written as is while its
+    _sse_payload_is_current() holds.
+    """
+    if isinstance(data, BaseModel):
+        private = data.__pydantic_private__
+        payload = private.get("_sse_payload") if private else None
+        if payload is None or not data._sse_payload_is_current():  # type: ignore
+            payload = data.__pydantic_serializer__.to_json(
+                data, exclude_unset=exclude_unset, exclude_none=True
+            )
+    else:
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    return b"".join((_DATA, payload, _END))
+
+
+async def coalesce_frames(
+    frames: AsyncIterable[bytes],
+    flush_interval: float,
+    flush_bytes: int = 16 * 1024,
+) -> AsyncIterator[bytes]:
+    """
+    Groups the frames of a stream into fewer, larger writes.
+
+    The first frame is sent right away, so the time to first token is unchanged.
+    Later frames are buffered until flush_bytes are buffered or flush_interval
+    seconds have passed since the buffer was empty, whichever comes first,
+    then sent as one write. Nothing is held after the source is exhausted.
+    The source is read ahead by at most flush_bytes.
+    """
+    iterator = frames.__aiter__()
+    async for frame in iterator:
+        yield frame
+        break
+    else:
+        return
+
+    buffer = bytearray()
+    filled = asyncio.Event()
+    full = asyncio.Event()
+    drained = asyncio.Event()
+    ended = False
+
+    async def read() -> None:
+        nonlocal ended
+        try:
+            async for frame in iterator:
+                if len(buffer) >= flush_bytes:
+                    drained.clear()
+                    await drained.wait()
+                buffer.extend(frame)
+                filled.set()
+                if len(buffer) >= flush_bytes:
+                    full.set()
+        finally:
+            ended = True
+            filled.set()
+            full.set()
+
+    # one reader task per stream, frames are not awaited one by one
+    reader = asyncio.create_task(read())
+    try:
+        while True:
+            if not buffer:
+                if ended:
+                    break
+                filled.clear()
+                await filled.wait()
+                continue
+            if not full.is_set():
+                try:
+                    await asyncio.wait_for(full.wait(), flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            data = bytes(buffer)
+            buffer.clear()
+            if not ended:
+                full.clear()
+            drained.set()
+            yield data
+        # errors of the source
+        await reader
+    finally:
+        # the client went away: stop the source as well
+        if not reader.done():
+            reader.cancel()
+            try:
+                await reader
+            except (asyncio.CancelledError, Exception):
+                pass
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -13,8 +13,11 @@
 # limitations under the License.
 
 import os
+from functools import partial
 from typing import Any, Dict, Optional, Tuple, Type
 
+from fastapi import FastAPI
+
 from arkitect.core.client import Client
 from arkitect.core.component.bot import BotServer
 from arkitect.core.runtime import load_function
@@ -24,18 +27,16 @@ from arkitect.utils.context import set_account_id, set_resource_id, set_resource
 from ..runner import get_default_client_configs, get_endpoint_config, get_runner
 
 
-def launch_serve(
+def _build_app(
     package_path: str,
-    host: str = "0.0.0.0",
-    port: int = 8080,
-    endpoint_path: str = "/api/v3/bots/chat/completions",
-    health_check_path: Optional[str] = "/healthz",
-    clients: Optional[Dict[str, Tuple[Type[Client], Any]]] = None,
-    trace_config: Optional[TraceConfig] = None,
-    trace_on: bool = True,
-    trace_log_dir: Optional[str] = "./",
-    **kwargs: Any,
-) -> None:
+    endpoint_path: str,
+    health_check_path: Optional[str],
+    clients: Optional[Dict[str, Tuple[Type[Client], Any]]],
+    trace_config: Optional[TraceConfig],
+    trace_on: bool,
+    trace_log_dir: Optional[str],
+) -> FastAPI:
+    # runs in each worker, tracing exporters and clients are per process
     set_resource_type(os.getenv("RESOURCE_TYPE") or "")
     set_resource_id(os.getenv("RESOURCE_ID") or "")
     set_account_id(os.getenv("ACCOUNT_ID") or "")
@@ -55,4 +56,42 @@ def launch_serve(
         endpoint_config=get_endpoint_config(endpoint_path, runnable_func),
         clients=clients if clients else get_default_client_configs(),
     )
-    server.run(app=server.app, host=host, port=port, **kwargs)
+    return server.app
+
+
+def launch_serve(
+    package_path: str,
+    host: str = "0.0.0.0",
+    port: int = 8080,
+    endpoint_path: str = "/api/v3/bots/chat/completions",
+    health_check_path: Optional[str] = "/healthz",
+    clients: Optional[Dict[str, Tuple[Type[Client], Any]]] = None,
+    trace_config: Optional[TraceConfig] = None,
+    trace_on: bool = True,
+    trace_log_dir: Optional[str] = "./",
+    workers_num: int = 1,
+    graceful_timeout: float = 30.0,
+    **kwargs: Any,
+) -> None:
+    app_factory = partial(
+        _build_app,
+        package_path,
+        endpoint_path,
+        health_check_path,
+        clients,
+        trace_config,
+        trace_on,
+        trace_log_dir,
+    )
+    if workers_num > 1:
+        BotServer.serve(
+            app_factory,
+            host=host,
+            port=port,
+            workers_num=workers_num,
+            graceful_timeout=graceful_timeout,
+            **kwargs,
+        )
+        return
+
+    BotServer.run(app=app_factory(), host=host, port=port, **kwargs)
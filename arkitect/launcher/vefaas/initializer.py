@@ -26,13 +26,21 @@ from arkitect.utils.context import (
 from ..runner import get_default_client_configs
 
 
-def setup_environment(
-    trace_on: bool = True, trace_config: Optional[TraceConfig] = None
-) -> None:
+def setup_context() -> None:
+    """
+    Set the per request context variables, needed on every invocation
+    as each request may run in a fresh context.
+    """
     set_resource_type(os.getenv("RESOURCE_TYPE") or "")
     set_resource_id(os.getenv("RESOURCE_ID") or "")
     set_account_id(os.getenv("ACCOUNT_ID") or "")
 
+
+def setup_environment(
+    trace_on: bool = True, trace_config: Optional[TraceConfig] = None
+) -> None:
+    setup_context()
+
     setup_tracing(
         endpoint=os.getenv("TRACE_ENDPOINT"),
         trace_on=trace_on,
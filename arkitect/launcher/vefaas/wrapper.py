@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import os
+import threading
 from enum import Enum
 from typing import (
     Any,
@@ -37,6 +38,7 @@ from arkitect.core.errors import (
     parse_pydantic_error,
 )
 from arkitect.core.runtime import (
+    AsyncRunner,
     Context,
     Request,
     Response,
@@ -45,7 +47,7 @@ from arkitect.launcher.runner import get_endpoint_config, get_runner
 from arkitect.telemetry.trace import TraceConfig
 
 from .common import parse_request, parse_response
-from .initializer import initialize
+from .initializer import initialize, setup_context
 
 StreamingResponse = AsyncIterator[str]
 JsonResponse = Dict[str, Any]
@@ -75,17 +77,70 @@ def _get_parameters(
         raise TypeError("No valid faas input")
 
 
+def _resolve_request_cls(endpoint_path: str, func: Callable) -> Type[Request]:
+    # load request class type by signature
+    endpoint_config = get_endpoint_config(
+        endpoint_path=endpoint_path, runnable_func=func
+    )
+    return endpoint_config.get(endpoint_path, Request)
+
+
+class _ColdPathCache:
+    """
+    Holds what bot_wrapper resolves by reflection on the handler:
+    the runner, the request class and the process level initialization.
+    They are resolved on the first invocation only,
+    warm invocations reuse them until invalidate() is called.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        endpoint_path: str,
+        clients: Optional[Dict[str, Tuple[Type[Client], Any]]],
+        trace_on: bool,
+        trace_config: Optional[TraceConfig],
+    ) -> None:
+        self.func = func
+        self.endpoint_path = endpoint_path
+        self.clients = clients
+        self.trace_on = trace_on
+        self.trace_config = trace_config
+        self._lock = threading.Lock()
+        self._resolved: Optional[Tuple[AsyncRunner, Type[Request]]] = None
+
+    def resolve(self, context: Any) -> Tuple[AsyncRunner, Type[Request]]:
+        resolved = self._resolved
+        if resolved is not None:
+            setup_context()
+            return resolved
+        with self._lock:
+            if self._resolved is None:
+                # initialize environment
+                initialize(context, self.clients, self.trace_on, self.trace_config)
+                # get runner for handler(handle sse & error code)
+                self._resolved = (
+                    get_runner(self.func),
+                    _resolve_request_cls(self.endpoint_path, self.func),
+                )
+            else:
+                setup_context()
+            return self._resolved
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._resolved = None
+
+
 def parse_function_request(
     environment: Environment,
     parameters: Union[Dict[str, Any], Request],
     endpoint_path: str,
     func: Callable,
+    request_cls: Optional[Type[Request]] = None,
 ) -> Request:
-    # load request class type by signature
-    endpoint_config = get_endpoint_config(
-        endpoint_path=endpoint_path, runnable_func=func
-    )
-    request_cls = endpoint_config.get(endpoint_path, Request)
+    if request_cls is None:
+        request_cls = _resolve_request_cls(endpoint_path, func)
 
     if environment == Environment.LOCAL:
         # load args as it looks
@@ -161,6 +216,9 @@ def bot_wrapper(
         if turn on, with @task decorator represents tracing
         the duration & input/output of the decorated function.
         trace_config: Detailed trace config for tracing
+
+    The runner, the request class and the clients are resolved once per process,
+    call `cache_clear()` on the wrapped function to resolve them again.
     """
 
     def wrapper(
@@ -172,6 +230,8 @@ def bot_wrapper(
             JsonResponse,
         ],
     ]:
+        cache = _ColdPathCache(func, endpoint_path, clients, trace_on, trace_config)
+
         def run_bot(
             *args: Any, **kwargs: Any
         ) -> Union[
@@ -185,15 +245,11 @@ def bot_wrapper(
             # decode environment-related parameters
             parameters, context = _get_parameters(environment, *args, **kwargs)
 
-            # initialize environment
-            initialize(context, clients, trace_on, trace_config)
-
-            # get runner for handler(handle sse & error code)
-            runner = get_runner(func)
+            runner, request_cls = cache.resolve(context)
             try:
                 # encode request
                 request = parse_function_request(
-                    environment, parameters, endpoint_path, func
+                    environment, parameters, endpoint_path, func, request_cls
                 )
             except Exception as e:
                 if isinstance(e, APIException):
@@ -243,6 +299,7 @@ def bot_wrapper(
 
             return entry()
 
+        setattr(run_bot, "cache_clear", cache.invalidate)
         return run_bot
 
     return wrapper
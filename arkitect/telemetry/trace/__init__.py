@@ -13,7 +13,20 @@
 # limitations under the License.
 
 from .attributes import set_trace_attributes
+from .sampling import (
+    SpanNameRateLimitSampler,
+    TailSamplingSpanProcessor,
+    build_sampler,
+)
 from .setup import TraceConfig, setup_tracing
 from .wrapper import task
 
-__all__ = ["set_trace_attributes", "task", "setup_tracing", "TraceConfig"]
+__all__ = [
+    "set_trace_attributes",
+    "task",
+    "setup_tracing",
+    "TraceConfig",
+    "SpanNameRateLimitSampler",
+    "TailSamplingSpanProcessor",
+    "build_sampler",
+]
@@ -19,12 +19,62 @@ from opentelemetry import trace
 from opentelemetry.trace.span import Span
 from opentelemetry.trace.status import StatusCode
 
-from arkitect.utils import dump_json_str_truncate
+from arkitect.utils import dump_json_str_bounded
 from arkitect.utils.context import get_custom_attributes
 
 _TRACE_MAX_STRING_LEN = os.environ.get("TRACE_MAX_STRING_LEN", "10000")
 
 
+class DeferredAttributes:
+    """
+    Raw values of the JSON attributes of a span,
+    serialized only once the span is known to be exported.
+    """
+
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {}
+
+    def materialize(self) -> Dict[str, str]:
+        return {
+            k: dump_json_str_bounded(v, int(_TRACE_MAX_STRING_LEN))
+            for k, v in self.values.items()
+        }
+
+
+# span_id -> attributes, only filled while a tail sampling processor is set up
+_deferred_attributes: Optional[Dict[int, DeferredAttributes]] = None
+
+
+def enable_deferred_attributes() -> None:
+    global _deferred_attributes
+    if _deferred_attributes is None:
+        _deferred_attributes = {}
+
+
+def disable_deferred_attributes() -> None:
+    global _deferred_attributes
+    _deferred_attributes = None
+
+
+def pop_deferred_attributes(span_id: int) -> Optional[DeferredAttributes]:
+    if _deferred_attributes is None:
+        return None
+    return _deferred_attributes.pop(span_id, None)
+
+
+def _set_json_attribute(span: Span, key: str, value: Any) -> None:
+    deferred = _deferred_attributes
+    if deferred is None:
+        span.set_attribute(
+            key, dump_json_str_bounded(value, int(_TRACE_MAX_STRING_LEN))
+        )
+        return
+    span_id = span.get_span_context().span_id
+    if span_id not in deferred:
+        deferred[span_id] = DeferredAttributes()
+    deferred[span_id].values[key] = value
+
+
 def set_trace_attributes(
     span: Span,
     *,
@@ -39,12 +89,12 @@ def set_trace_attributes(
     merge_output: Optional[bool] = None,
     custom_attributes: Optional[Dict[str, Any]] = None,
 ) -> None:
-    span.set_attribute(
-        "input", dump_json_str_truncate(input, int(_TRACE_MAX_STRING_LEN))
-    )
-    span.set_attribute(
-        "output", dump_json_str_truncate(output, int(_TRACE_MAX_STRING_LEN))
-    )
+    # spans dropped by the sampler are never exported, skip serialization
+    if not span.is_recording():
+        return
+
+    _set_json_attribute(span, "input", input)
+    _set_json_attribute(span, "output", output)
     span.set_attribute("request_id", request_id)
     span.set_attribute("client_request_id", client_request_id)
     span.set_attribute("resource_type", resource_type)
@@ -57,4 +107,4 @@ def set_trace_attributes(
         custom_attributes = get_custom_attributes()
     if custom_attributes:
         for k, v in custom_attributes.items():
-            span.set_attribute(k, dump_json_str_truncate(v, int(_TRACE_MAX_STRING_LEN)))
+            _set_json_attribute(span, k, v)
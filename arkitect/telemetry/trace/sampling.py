@@ -0,0 +1,190 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from opentelemetry.context import Context
+from opentelemetry.sdk.trace import ReadableSpan, Span, SpanProcessor
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_ON,
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.trace import Link, SpanKind, StatusCode
+from opentelemetry.trace.span import TraceState
+from opentelemetry.util.types import Attributes
+
+from arkitect.telemetry.trace import attributes
+
+_TRACE_ID_LIMIT = (1 << 64) - 1
+
+
+class _TokenBucket:
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.tokens = max(rate, 1.0)
+        self.updated_at = time.monotonic()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(
+            max(self.rate, 1.0), self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class SpanNameRateLimitSampler(Sampler):
+    """
+    Limits how many spans per second are sampled for each span name,
+    on top of the decision of a delegate sampler.
+
+    :param rate_limits: spans per second by span name.
+    :param default_rate_limit: spans per second for names not in rate_limits,
+        unlimited if None.
+    """
+
+    def __init__(
+        self,
+        delegate: Sampler = ALWAYS_ON,
+        rate_limits: Optional[Dict[str, float]] = None,
+        default_rate_limit: Optional[float] = None,
+    ) -> None:
+        self.delegate = delegate
+        self.rate_limits = rate_limits or {}
+        self.default_rate_limit = default_rate_limit
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _allow(self, name: str) -> bool:
+        rate = self.rate_limits.get(name, self.default_rate_limit)
+        if rate is None:
+            return True
+        with self._lock:
+            if name not in self._buckets:
+                self._buckets[name] = _TokenBucket(rate)
+            return self._buckets[name].try_acquire()
+
+    def should_sample(
+        self,
+        parent_context: Optional[Context],
+        trace_id: int,
+        name: str,
+        kind: Optional[SpanKind] = None,
+        attributes: Attributes = None,
+        links: Optional[Sequence[Link]] = None,
+        trace_state: Optional[TraceState] = None,
+    ) -> SamplingResult:
+        result = self.delegate.should_sample(
+            parent_context, trace_id, name, kind, attributes, links, trace_state
+        )
+        if result.decision.is_sampled() and not self._allow(name):
+            return SamplingResult(Decision.DROP, None, result.trace_state)
+        return result
+
+    def get_description(self) -> str:
+        return f"SpanNameRateLimitSampler{{{self.delegate.get_description()}}}"
+
+
+def build_sampler(
+    sample_ratio: Optional[float] = None,
+    rate_limits: Optional[Dict[str, float]] = None,
+    default_rate_limit: Optional[float] = None,
+) -> Sampler:
+    """
+    Head sampling: keep sample_ratio of the traces (child spans follow their
+    parent), then apply per span name rate limits.
+    """
+    sampler: Sampler = ALWAYS_ON
+    if sample_ratio is not None and sample_ratio < 1:
+        sampler = ParentBased(root=TraceIdRatioBased(sample_ratio))
+    if rate_limits or default_rate_limit is not None:
+        sampler = SpanNameRateLimitSampler(sampler, rate_limits, default_rate_limit)
+    return sampler
+
+
+class TailSamplingSpanProcessor(SpanProcessor):
+    """
+    Decides whether to export a span after it ended.
+
+    Failed spans and spans slower than latency_threshold_ms are always kept,
+    the others are kept for sample_ratio of the traces. While this processor
+    is installed, input/output attributes are serialized only for kept spans.
+    """
+
+    def __init__(
+        self,
+        delegate: SpanProcessor,
+        sample_ratio: float = 0.0,
+        latency_threshold_ms: Optional[float] = None,
+    ) -> None:
+        self.delegate = delegate
+        self.sample_ratio = sample_ratio
+        self.latency_threshold_ms = latency_threshold_ms
+        self._trace_id_bound = round(sample_ratio * (_TRACE_ID_LIMIT + 1))
+        attributes.enable_deferred_attributes()
+
+    def on_start(self, span: Span, parent_context: Optional[Context] = None) -> None:
+        self.delegate.on_start(span, parent_context=parent_context)
+
+    def should_keep(self, span: ReadableSpan) -> bool:
+        if span.status.status_code == StatusCode.ERROR:
+            return True
+        if (
+            self.latency_threshold_ms is not None
+            and span.start_time is not None
+            and span.end_time is not None
+            and (span.end_time - span.start_time) / 1e6 >= self.latency_threshold_ms
+        ):
+            return True
+        trace_id = span.context.trace_id if span.context else 0
+        # decide on the trace id, so spans of a trace are kept together
+        return (trace_id & _TRACE_ID_LIMIT) < self._trace_id_bound
+
+    def on_end(self, span: ReadableSpan) -> None:
+        span_id = span.context.span_id if span.context else 0
+        deferred = attributes.pop_deferred_attributes(span_id)
+        if not self.should_keep(span):
+            return
+        if deferred:
+            span = ReadableSpan(
+                name=span.name,
+                context=span.context,
+                parent=span.parent,
+                resource=span.resource,
+                attributes={**(span.attributes or {}), **deferred.materialize()},
+                events=span.events,
+                links=span.links,
+                kind=span.kind,
+                status=span.status,
+                start_time=span.start_time,
+                end_time=span.end_time,
+                instrumentation_scope=span.instrumentation_scope,
+            )
+        self.delegate.on_end(span)
+
+    def shutdown(self) -> None:
+        attributes.disable_deferred_attributes()
+        self.delegate.shutdown()
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self.delegate.force_flush(timeout_millis)
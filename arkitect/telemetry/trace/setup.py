@@ -18,11 +18,11 @@ import os
 import sys
 from datetime import datetime
 from os import linesep
-from typing import IO, Optional
+from typing import IO, Dict, Optional
 
 from opentelemetry import trace
 from opentelemetry.sdk.resources import Resource, ResourceAttributes
-from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
 from opentelemetry.sdk.trace.export import (
     BatchSpanProcessor,
     ConsoleSpanExporter,
@@ -30,6 +30,8 @@ from opentelemetry.sdk.trace.export import (
 )
 from pydantic import BaseModel
 
+from arkitect.telemetry.trace.sampling import TailSamplingSpanProcessor, build_sampler
+
 
 class TraceConfig(BaseModel):
     # trace basic config
@@ -44,6 +46,15 @@ class TraceConfig(BaseModel):
     max_export_batch_size: Optional[int] = None
     export_timeout_millis: Optional[float] = None
 
+    # head sampling config
+    sample_ratio: Optional[float] = None
+    span_rate_limits: Optional[Dict[str, float]] = None
+    default_span_rate_limit: Optional[float] = None
+
+    # tail sampling config, errors are always kept
+    tail_sample_ratio: Optional[float] = None
+    tail_latency_threshold_ms: Optional[float] = None
+
     def __init__(
         self,
         ak: Optional[str] = None,
@@ -54,6 +65,11 @@ class TraceConfig(BaseModel):
         schedule_delay_millis: Optional[float] = None,
         max_export_batch_size: Optional[int] = None,
         export_timeout_millis: Optional[float] = None,
+        sample_ratio: Optional[float] = None,
+        span_rate_limits: Optional[Dict[str, float]] = None,
+        default_span_rate_limit: Optional[float] = None,
+        tail_sample_ratio: Optional[float] = None,
+        tail_latency_threshold_ms: Optional[float] = None,
     ):
         super().__init__(
             ak=ak or os.getenv("VOLC_ACCESSKEY", os.getenv("VOLC_ACCESS_KEY", "")),
@@ -64,9 +80,25 @@ class TraceConfig(BaseModel):
             schedule_delay_millis=schedule_delay_millis,
             max_export_batch_size=max_export_batch_size,
             export_timeout_millis=export_timeout_millis,
+            sample_ratio=sample_ratio
+            if sample_ratio is not None
+            else _getenv_float("TRACE_SAMPLE_RATIO"),
+            span_rate_limits=span_rate_limits,
+            default_span_rate_limit=default_span_rate_limit,
+            tail_sample_ratio=tail_sample_ratio
+            if tail_sample_ratio is not None
+            else _getenv_float("TRACE_TAIL_SAMPLE_RATIO"),
+            tail_latency_threshold_ms=tail_latency_threshold_ms
+            if tail_latency_threshold_ms is not None
+            else _getenv_float("TRACE_TAIL_LATENCY_THRESHOLD_MS"),
         )
 
 
+def _getenv_float(key: str) -> Optional[float]:
+    value = os.getenv(key)
+    return float(value) if value else None
+
+
 def setup_tracing(
     endpoint: Optional[str] = None,
     trace_on: bool = True,
@@ -117,16 +149,31 @@ def setup_tracing(
         logging.info(f"initialize tls trace info: {headers}")
         exporter = OTLPSpanExporter(endpoint=endpoint, insecure=True, headers=headers)  # type: ignore
 
-    provider = TracerProvider(resource=resource)
-    provider.add_span_processor(
-        BatchSpanProcessor(
-            exporter,
-            max_queue_size=trace_config.max_queue_size,  # type: ignore
-            schedule_delay_millis=trace_config.schedule_delay_millis,  # type: ignore
-            max_export_batch_size=trace_config.max_export_batch_size,  # type: ignore
-            export_timeout_millis=trace_config.export_timeout_millis,  # type: ignore
-        )
+    provider = TracerProvider(
+        resource=resource,
+        sampler=build_sampler(
+            trace_config.sample_ratio,
+            trace_config.span_rate_limits,
+            trace_config.default_span_rate_limit,
+        ),
+    )
+    processor: SpanProcessor = BatchSpanProcessor(
+        exporter,
+        max_queue_size=trace_config.max_queue_size,  # type: ignore
+        schedule_delay_millis=trace_config.schedule_delay_millis,  # type: ignore
+        max_export_batch_size=trace_config.max_export_batch_size,  # type: ignore
+        export_timeout_millis=trace_config.export_timeout_millis,  # type: ignore
     )
+    if (
+        trace_config.tail_sample_ratio is not None
+        or trace_config.tail_latency_threshold_ms is not None
+    ):
+        processor = TailSamplingSpanProcessor(
+            processor,
+            sample_ratio=trace_config.tail_sample_ratio or 0.0,
+            latency_threshold_ms=trace_config.tail_latency_threshold_ms,
+        )
+    provider.add_span_processor(processor)
     trace.set_tracer_provider(provider)
 
 
@@ -13,7 +13,12 @@
 # limitations under the License.
 
 from .asyncio import AsyncTimedIterable, aenumerate, anext, gather
-from .json import dump_json_str, dump_json_str_truncate, dump_json_truncate
+from .json import (
+    dump_json_str,
+    dump_json_str_bounded,
+    dump_json_str_truncate,
+    dump_json_truncate,
+)
 from .merge import dict_merge, list_item_merge
 
 __all__ = [
@@ -25,5 +30,6 @@ __all__ = [
     "list_item_merge",
     "dump_json_str",
     "dump_json_str_truncate",
+    "dump_json_str_bounded",
     "dump_json_truncate",
 ]
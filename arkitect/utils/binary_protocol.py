@@ -15,7 +15,8 @@
 # type: ignore
 import gzip
 import json
-from typing import Optional, Union
+import struct
+from typing import Any, Optional, Union
 
 PROTOCOL_VERSION = 0b0001
 DEFAULT_HEADER_SIZE = 0b0001
@@ -72,6 +73,136 @@ def generate_before_payload(sequence: int) -> bytearray:
     return before_payload
 
 
+_HEADER = struct.Struct(">4B")
+_INT = struct.Struct(">i")
+_UINT = struct.Struct(">I")
+# header and payload size, with a sequence in between or not
+_HEADER_SIZE = struct.Struct(">4BI")
+_HEADER_SEQUENCE_SIZE = struct.Struct(">4BiI")
+
+
+class Frame:
+    """
+    A decoded frame.
+
+    payload is a memoryview on the received message: decoding copies nothing,
+    and the payload is only decompressed and deserialized by message(),
+    so audio frames are never inspected.
+    """
+
+    __slots__ = (
+        "message_type",
+        "flags",
+        "serialization_method",
+        "compression",
+        "payload_sequence",
+        "seq",
+        "code",
+        "payload_size",
+        "payload",
+    )
+
+    def __init__(self, message_type, flags, serialization_method, compression):
+        self.message_type = message_type
+        self.flags = flags
+        self.serialization_method = serialization_method
+        self.compression = compression
+        self.payload_sequence = None
+        self.seq = None
+        self.code = None
+        self.payload_size = 0
+        self.payload = None
+
+    @property
+    def is_last_package(self) -> bool:
+        return bool(self.flags & 0x02)
+
+    def message(self) -> Any:
+        """
+        The payload, decompressed and deserialized according to the header.
+        """
+        payload = self.payload
+        if payload is None:
+            return None
+        if self.compression == GZIP:
+            payload = gzip.decompress(payload)
+        if self.serialization_method == JSON:
+            return json.loads(str(payload, "utf-8"))
+        if self.serialization_method != NO_SERIALIZATION:
+            return str(payload, "utf-8")
+        return payload
+
+
+def decode_frame(data: Union[bytes, bytearray, memoryview]) -> Frame:
+    """
+    Decodes the header fields of a frame, see parse_response for the layout.
+    """
+    view = memoryview(data)
+    b0, b1, b2, _ = _HEADER.unpack_from(view)
+    message_type = b1 >> 4
+    frame = Frame(message_type, b1 & 0x0F, b2 >> 4, b2 & 0x0F)
+    ptr = (b0 & 0x0F) * 4
+    if frame.flags & 0x01:
+        # frame with sequence
+        frame.payload_sequence = _INT.unpack_from(view, ptr)[0]
+        ptr += 4
+    if message_type in (FULL_SERVER_RESPONSE, FULL_CLIENT_REQUEST, AUDIO_ONLY_REQUEST):
+        frame.payload_size = _INT.unpack_from(view, ptr)[0]
+        frame.payload = view[ptr + 4 :]
+    elif message_type == SERVER_ACK:
+        frame.seq = _INT.unpack_from(view, ptr)[0]
+        if len(view) - ptr >= 8:
+            frame.payload_size = _UINT.unpack_from(view, ptr + 4)[0]
+            frame.payload = view[ptr + 8 :]
+    elif message_type == SERVER_ERROR_RESPONSE:
+        frame.code, frame.payload_size = struct.unpack_from(">II", view, ptr)
+        frame.payload = view[ptr + 8 :]
+    return frame
+
+
+class FrameEncoder:
+    """
+    Encodes frames into a preallocated buffer reused from one frame to the next:
+    the header and the payload are written in place, without intermediate bytes.
+    The returned view is only valid until the next call to encode,
+    frames must be sent before the next one is encoded.
+    """
+
+    def __init__(self, capacity: int = 16 * 1024) -> None:
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+
+    def encode(
+        self,
+        payload: Union[bytes, bytearray, memoryview],
+        message_type: int = FULL_CLIENT_REQUEST,
+        message_type_specific_flags: int = NO_SEQUENCE,
+        serial_method: int = JSON,
+        compression_type: int = GZIP,
+        sequence: Optional[int] = None,
+    ) -> memoryview:
+        size = len(payload)
+        head = 8 if sequence is None else 12
+        end = head + size
+        if len(self._buffer) < end:
+            # views on the previous buffer stay valid
+            self._buffer = bytearray(max(end, 2 * len(self._buffer)))
+            self._view = memoryview(self._buffer)
+        header = (
+            (PROTOCOL_VERSION << 4) | DEFAULT_HEADER_SIZE,
+            (message_type << 4) | message_type_specific_flags,
+            (serial_method << 4) | compression_type,
+            0x00,
+        )
+        if sequence is None:
+            _HEADER_SIZE.pack_into(self._buffer, 0, *header, size)
+        else:
+            _HEADER_SEQUENCE_SIZE.pack_into(self._buffer, 0, *header, sequence, size)
+        # a memoryview assignment is a plain copy, faster than a bytearray slice
+        self._view[head:end] = payload
+        return self._view[:end]
+
+
 def parse_response(res: bytes) -> dict:
     """
     protocol_version(4 bits), header_size(4 bits),
@@ -81,54 +212,26 @@ def parse_response(res: bytes) -> dict:
     header_extensions 扩展头(大小等于 8 * 4 * (header_size - 1) )
     payload 类似与http 请求体
     """
-    # protocol_version = res[0] >> 4
-    header_size = res[0] & 0x0F
-    message_type = res[1] >> 4
-    message_type_specific_flags = res[1] & 0x0F
-    serialization_method = res[2] >> 4
-    message_compression = res[2] & 0x0F
-    # reserved = res[3]
-    # header_extensions = res[4 : header_size * 4]
-    payload = res[header_size * 4 :]
+    frame = decode_frame(res)
     result = {
-        "is_last_package": False,
+        "is_last_package": frame.is_last_package,
     }
-    payload_msg = None
-    payload_size = 0
-    if message_type_specific_flags & 0x01:
-        # receive frame with sequence
-        seq = int.from_bytes(payload[:4], "big", signed=True)
-        result["payload_sequence"] = seq
-        payload = payload[4:]
-
-    if message_type_specific_flags & 0x02:
-        # receive last package
-        result["is_last_package"] = True
-
-    if message_type == FULL_SERVER_RESPONSE:
-        payload_size = int.from_bytes(payload[:4], "big", signed=True)
-        payload_msg = payload[4:]
-    elif message_type == SERVER_ACK:
-        seq = int.from_bytes(payload[:4], "big", signed=True)
-        result["seq"] = seq
-        if len(payload) >= 8:
-            payload_size = int.from_bytes(payload[4:8], "big", signed=False)
-            payload_msg = payload[8:]
-    elif message_type == SERVER_ERROR_RESPONSE:
-        code = int.from_bytes(payload[:4], "big", signed=False)
-        result["code"] = code
-        payload_size = int.from_bytes(payload[4:8], "big", signed=False)
-        payload_msg = payload[8:]
-    if payload_msg is None:
+    if frame.payload_sequence is not None:
+        result["payload_sequence"] = frame.payload_sequence
+    if frame.seq is not None:
+        result["seq"] = frame.seq
+    if frame.code is not None:
+        result["code"] = frame.code
+    if frame.payload is None or frame.message_type in (
+        FULL_CLIENT_REQUEST,
+        AUDIO_ONLY_REQUEST,
+    ):
         return result
-    if message_compression == GZIP:
-        payload_msg = gzip.decompress(payload_msg)
-    if serialization_method == JSON:
-        payload_msg = json.loads(str(payload_msg, "utf-8"))
-    elif serialization_method != NO_SERIALIZATION:
-        payload_msg = str(payload_msg, "utf-8")
+    payload_msg = frame.message()
+    if isinstance(payload_msg, memoryview):
+        payload_msg = bytes(payload_msg)
     result["payload_msg"] = payload_msg
-    result["payload_size"] = payload_size
+    result["payload_size"] = frame.payload_size
     return result
 
 
@@ -137,14 +240,13 @@ def parse_request(req: bytes) -> Optional[Union[bytes, dict]]:
     message_type = req[1] >> 4
     serialization_method = req[2] >> 4
     # message_compression = req[2] & 0x0F
-    payload = req[header_size * 4 :]
 
     if message_type == FULL_CLIENT_REQUEST:
         # payload_size = int.from_bytes(payload[:4], "big", signed=True)
-        payload_msg = payload[4:]
         if serialization_method == JSON:
+            payload_msg = memoryview(req)[header_size * 4 + 4 :]
             return json.loads(str(payload_msg, "utf-8"))
     elif message_type == AUDIO_ONLY_REQUEST:
-        return payload
+        return req[header_size * 4 :]
 
     return None
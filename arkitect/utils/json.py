@@ -19,6 +19,9 @@ from typing import (
     AsyncGenerator,
     AsyncIterable,
     Generator,
+    Iterable,
+    List,
+    Tuple,
 )
 
 from pydantic import BaseModel
@@ -89,3 +92,75 @@ def dump_json_truncate(obj: Any, string_length_limit: int, depth: int = 0) -> An
         return result_dict
     else:
         return obj
+
+
+class _BudgetExhausted(Exception):
+    pass
+
+
+class _BoundedJSONWriter:
+    def __init__(self, max_len: int) -> None:
+        self.max_len = max_len
+        self.parts: List[str] = []
+        self.length = 0
+
+    def emit(self, part: str) -> None:
+        self.parts.append(part)
+        self.length += len(part)
+        if self.length >= self.max_len:
+            raise _BudgetExhausted()
+
+    def write(self, obj: Any, depth: int = 0) -> None:
+        if depth > _MAX_DEPTH:  # for safety
+            self.emit('"max recursion depth exceeded"')
+        elif isinstance(obj, dict):
+            self.write_mapping(obj.items(), depth)
+        elif isinstance(obj, Enum):
+            self.write(obj.value, depth)
+        elif isinstance(obj, (AsyncGenerator, Generator, AsyncIterable)):
+            self.emit(json.dumps(str(obj), ensure_ascii=False))
+        elif isinstance(obj, (list, tuple)):
+            self.emit("[")
+            for i, item in enumerate(obj):
+                if i:
+                    self.emit(", ")
+                self.write(item, depth + 1)
+            self.emit("]")
+        elif isinstance(obj, str):
+            self.emit(json.dumps(obj[: self.max_len], ensure_ascii=False))
+        elif isinstance(obj, BaseModel) and hasattr(obj, "__dict__"):
+            self.write_mapping(obj.__dict__.items(), depth)
+        elif obj is None or isinstance(obj, (bool, int, float)):
+            self.emit(json.dumps(obj))
+        else:
+            self.emit(json.dumps(str(obj), ensure_ascii=False))
+
+    def write_mapping(self, items: Iterable[Tuple[Any, Any]], depth: int) -> None:
+        self.emit("{")
+        first = True
+        for k, v in items:
+            # same as dump_json_truncate, None values are skipped
+            if v is None:
+                continue
+            if not first:
+                self.emit(", ")
+            first = False
+            self.emit(json.dumps(str(k), ensure_ascii=False) + ": ")
+            self.write(v, depth + 1)
+        self.emit("}")
+
+
+def dump_json_str_bounded(obj: Any, max_len: int) -> str:
+    """
+    Only for trace
+    Serialize obj to a JSON string of at most max_len characters,
+    the object is walked only until the budget is used up,
+    so large inputs (e.g. long message lists) cost O(max_len) to dump.
+    The result is cut at max_len and may not be valid JSON then.
+    """
+    writer = _BoundedJSONWriter(max_len)
+    try:
+        writer.write(obj)
+    except _BudgetExhausted:
+        pass
+    return "".join(writer.parts)[:max_len]
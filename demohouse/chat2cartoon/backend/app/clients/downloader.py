@@ -9,17 +9,54 @@
 # See the License for the specific language governing permissions and
 # limitations under the License. 
 
+import asyncio
 import io
-from typing import Tuple
+import os
+from typing import AsyncIterator, Callable, Optional, Tuple
 
-import requests
+import httpx
 
+from app.constants import (
+    DOWNLOAD_MAX_CONCURRENCY,
+    DOWNLOAD_MAX_CONNECTIONS,
+    DOWNLOAD_MAX_RETRIES,
+)
 from arkitect.core.errors import InvalidParameter
 from arkitect.telemetry.logger import ERROR, INFO, WARN
 
+_MIN_CHUNK_SIZE = 64 * 1024
+_MAX_CHUNK_SIZE = 1024 * 1024
+# partial files of download_to_file, only they are resumed
+_PART_SUFFIX = ".part"
 
-def _get_image_extension_from_response(response):
-    # Extract Content-Type header
+# shared by all the DownloaderClient of the process so that connections are kept alive
+_http_client: Optional[httpx.AsyncClient] = None
+_download_slots: Optional[asyncio.Semaphore] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=DOWNLOAD_MAX_CONNECTIONS,
+                max_keepalive_connections=DOWNLOAD_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            follow_redirects=True,
+        )
+    return _http_client
+
+
+def _get_download_slots() -> asyncio.Semaphore:
+    global _download_slots
+    if _download_slots is None:
+        _download_slots = asyncio.Semaphore(DOWNLOAD_MAX_CONCURRENCY)
+    return _download_slots
+
+
+def _get_extension_from_response(response):
+    # Extract Content-Type header, without its parameters
     content_type = response.headers.get("Content-Type")
 
     if content_type:
@@ -31,38 +68,159 @@ def _get_image_extension_from_response(response):
             "image/webp": "webp",
             "image/bmp": "bmp",
             "image/tiff": "tiff",
+            "video/mp4": "mp4",
+            "video/quicktime": "mov",
+            "video/webm": "webm",
+            "audio/mpeg": "mp3",
+            "audio/mp3": "mp3",
+            "audio/wav": "wav",
+            "audio/x-wav": "wav",
+            "audio/aac": "aac",
+            "audio/ogg": "ogg",
             # Add more mappings if needed
         }
-        return extension_map.get(content_type, None)
+        mime_type = content_type.split(";", 1)[0].strip().lower()
+        return extension_map.get(mime_type, None)
     return None
 
 
+class _Progress:
+    __slots__ = ("offset",)
+
+    def __init__(self, offset: int):
+        self.offset = offset
+
+
 class DownloaderClient:
-    """Downloads media content via http. Mainly used to download the AI-generated image, video and audio files in chat2cartoon."""
+    """
+    Downloads media content via http. Mainly used to download the AI-generated image, video and audio files in chat2cartoon.
+    Downloads share a keep-alive connection pool and at most DOWNLOAD_MAX_CONCURRENCY run at once in the process.
+    Interrupted downloads are resumed with range requests when the server supports them.
+    """
+
+    def __init__(self, max_file_size: int = 20 * 1024 * 1024):  # 20 MB
+        self.max_file_size = max_file_size
+        self.max_retries = DOWNLOAD_MAX_RETRIES
+
+    async def download_to_memory(self, url: str) -> Tuple[io.BytesIO, str]:
+        file_buffer = io.BytesIO()
+
+        def truncate() -> None:
+            file_buffer.seek(0)
+            file_buffer.truncate()
+
+        file_extension = await self.download(url, file_buffer.write, restart=truncate)
+        file_buffer.seek(0)
+        return file_buffer, file_extension
+
+    async def download_to_file(self, url: str, path: str) -> str:
+        """
+        Streams url to path without buffering the file in memory.
+        The file is written to path + ".part" and moved to path once complete,
+        a partial file left by an interrupted download is resumed.
+        A file already at path is replaced, never resumed.
+        """
+        part_path = path + _PART_SUFFIX
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        # large buffer, the chunks are written in few system calls
+        with open(
+            part_path, "r+b" if offset else "wb", buffering=_MAX_CHUNK_SIZE
+        ) as f:
+            f.seek(offset)
 
-    def __init__(self):
-        self.chunk_size = 1024
-        self.max_file_size = 20 * 1024 * 1024  # 20 MB
+            def truncate() -> None:
+                f.seek(0)
+                f.truncate()
 
-    def download_to_memory(self, url: str) -> Tuple[io.BytesIO, str]:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
+            file_extension = await self.download(
+                url, f.write, offset=offset, restart=truncate
+            )
+        os.replace(part_path, path)
+        return file_extension
+
+    async def download(
+        self,
+        url: str,
+        write: Callable[[bytes], object],
+        offset: int = 0,
+        restart: Optional[Callable[[], None]] = None,
+    ) -> str:
+        """
+        Streams url to write, from offset if the first offset bytes were already written.
+        The transfer is resumed after transport errors, restart is called instead
+        if the server ignores the range and sends the whole file again.
+        Returns the file extension.
+        """
+        progress = _Progress(offset)
+        async with _get_download_slots():
+            attempt = 0
+            while True:
+                try:
+                    file_extension = await self._download_once(
+                        url, write, progress, restart
+                    )
+                    break
+                except httpx.TransportError as e:
+                    attempt += 1
+                    if attempt > self.max_retries:
+                        raise
+                    WARN(
+                        f"download interrupted at {progress.offset} bytes, retrying: {e}"
+                    )
+                    await asyncio.sleep(0.5 * attempt)
 
-        file_extension = _get_image_extension_from_response(response)
         if file_extension is None:
             WARN("file extension is not determined")
+        INFO(f"downloaded file, size: {progress.offset / (1024 * 1024):.2f} MB")
+        return file_extension
 
-        file_buffer = io.BytesIO()
-        total_size = 0
+    async def _download_once(
+        self,
+        url: str,
+        write: Callable[[bytes], object],
+        progress: "_Progress",
+        restart: Optional[Callable[[], None]],
+    ) -> Optional[str]:
+        headers = {"Range": f"bytes={progress.offset}-"} if progress.offset else {}
+        async with _get_http_client().stream("GET", url, headers=headers) as response:
+            if response.status_code == 416 and progress.offset:
+                # the partial file was already complete
+                return _get_extension_from_response(response)
+            response.raise_for_status()
+            if progress.offset and response.status_code != 206:
+                if restart is None:
+                    raise InvalidParameter("messages", "download cannot be resumed")
+                restart()
+                progress.offset = 0
+
+            content_length = response.headers.get("Content-Length")
+            if (
+                content_length
+                and progress.offset + int(content_length) > self.max_file_size
+            ):
+                ERROR("file size exceeds limit. Download stopped.")
+                raise InvalidParameter("messages", "file size exceed limit")
 
-        for chunk in response.iter_content(chunk_size=self.chunk_size):
-            if chunk:
-                total_size += len(chunk)
-                if total_size > self.max_file_size:
-                    ERROR("file size exceeds 20 MB. Download stopped.")
+            async for chunk in self._aiter_chunks(response):
+                if progress.offset + len(chunk) > self.max_file_size:
+                    ERROR("file size exceeds limit. Download stopped.")
                     raise InvalidParameter("messages", "file size exceed limit")
-                file_buffer.write(chunk)
+                write(chunk)
+                # kept up to date for a resume after a transport error
+                progress.offset += len(chunk)
+            return _get_extension_from_response(response)
 
-        file_buffer.seek(0)
-        INFO(f"downloaded file to memory, size: {total_size / (1024 * 1024):.2f} MB")
-        return file_buffer, file_extension
+    @staticmethod
+    async def _aiter_chunks(response: httpx.Response) -> AsyncIterator[bytes]:
+        # the network chunks are coalesced in growing chunks, a few KB at first
+        # for slow links, up to 1MB on fast ones
+        chunk_size = _MIN_CHUNK_SIZE
+        buffer = bytearray()
+        async for data in response.aiter_bytes():
+            buffer += data
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+                chunk_size = min(chunk_size * 2, _MAX_CHUNK_SIZE)
+        if buffer:
+            yield bytes(buffer)
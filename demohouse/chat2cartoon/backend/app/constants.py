@@ -80,3 +80,16 @@ VALID_TONES = [
     "zh_female_tiexinnvsheng_mars_bigtts",
     "zh_female_qiaopinvsheng_mars_bigtts",
 ]
+
+# film rendering: concurrent render jobs, jobs waiting for a worker beyond which
+# requests are rejected, and jobs run before the worker processes are replaced
+RENDER_MAX_WORKERS = int(os.getenv("RENDER_MAX_WORKERS", min(4, os.cpu_count() or 1)))
+RENDER_MAX_QUEUE_SIZE = int(os.getenv("RENDER_MAX_QUEUE_SIZE", 16))
+RENDER_JOBS_PER_EXECUTOR = int(os.getenv("RENDER_JOBS_PER_EXECUTOR", 32))
+# concurrent clip downloads of a film
+FILM_DOWNLOAD_CONCURRENCY = int(os.getenv("FILM_DOWNLOAD_CONCURRENCY", 8))
+
+# downloads of media files, shared by all the requests of the process
+DOWNLOAD_MAX_CONCURRENCY = int(os.getenv("DOWNLOAD_MAX_CONCURRENCY", 16))
+DOWNLOAD_MAX_CONNECTIONS = int(os.getenv("DOWNLOAD_MAX_CONNECTIONS", 32))
+DOWNLOAD_MAX_RETRIES = int(os.getenv("DOWNLOAD_MAX_RETRIES", 3))
@@ -14,12 +14,12 @@ import json
 import os
 import tempfile
 import time
-from concurrent.futures import ProcessPoolExecutor
-from typing import AsyncIterable, List, Optional
+from typing import AsyncIterable, List, Optional, Tuple
 
 from moviepy import AudioFileClip, CompositeVideoClip, TextClip, VideoFileClip
 from moviepy.video.fx import CrossFadeIn, CrossFadeOut
 from moviepy.video.tools.subtitles import SubtitlesClip
+from proglog import ProgressBarLogger
 from volcenginesdkarkruntime import Ark
 from volcenginesdkarkruntime.types.chat.chat_completion_chunk import (
     Choice,
@@ -28,7 +28,11 @@ from volcenginesdkarkruntime.types.chat.chat_completion_chunk import (
 
 from app.clients.downloader import DownloaderClient
 from app.clients.tos import TOSClient
-from app.constants import ARTIFACT_TOS_BUCKET, MAX_STORY_BOARD_NUMBER
+from app.constants import (
+    ARTIFACT_TOS_BUCKET,
+    FILM_DOWNLOAD_CONCURRENCY,
+    MAX_STORY_BOARD_NUMBER,
+)
 from app.generators.base import Generator
 from app.generators.phase import Phase
 from app.mode import Mode
@@ -37,12 +41,18 @@ from app.models.film import Film
 from app.models.tone import Tone
 from app.models.video import Video
 from app.output_parsers import OutputParser
+from app.render_pool import CancelToken, get_render_pool
+from arkitect.core.client import default_sync_ark_client
 from arkitect.core.component.llm.model import (
     ArkChatCompletionChunk,
     ArkChatRequest,
     ArkChatResponse,
 )
-from arkitect.core.errors import InternalServiceError, InvalidParameter
+from arkitect.core.errors import (
+    InternalServiceError,
+    InvalidParameter,
+    ServerOverloaded,
+)
 from arkitect.telemetry.logger import ERROR, INFO
 from arkitect.utils.context import get_reqid, get_resource_id
 
@@ -100,11 +110,32 @@ def _split_subtitle(line: str, start_time: int, end_time: int, split_fn) -> List
     return subtitles
 
 
-def _generate_film(
-    req_id: str, tones: List[Tone], videos: List[Video], audios: List[Audio]
-):
-    videos.sort(key=lambda video: video.index)
-    audios.sort(key=lambda audio: audio.index)
+class _CancellableLogger(ProgressBarLogger):
+    """moviepy progress logger stopping the rendering once the job is cancelled."""
+
+    def __init__(self, cancel_token: CancelToken):
+        super().__init__()
+        self.cancel_token = cancel_token
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        self.cancel_token.raise_if_cancelled()
+
+
+def _clip_paths(job_dir: str, index: int) -> Tuple[str, str]:
+    # video and audio of a clip
+    return (
+        os.path.join(job_dir, f"{index}.mp4"),
+        os.path.join(job_dir, f"{index}.mp3"),
+    )
+
+
+def _render_film(
+    tones: List[Tone], job_dir: str, output_path: str, cancel_path: str
+) -> str:
+    """
+    Runs in a render pool worker, once all the clips are downloaded to job_dir.
+    """
+    cancel_token = CancelToken(cancel_path)
 
     video_clips = []
     cn_subtitles = []
@@ -112,19 +143,15 @@ def _generate_film(
 
     clip_start_time = 0.0
     start = []
-    elements = list(zip(tones, videos, audios))
-    for i, (t, v, a) in enumerate(elements):
+    for i, t in enumerate(tones):
+        cancel_token.raise_if_cancelled()
+        video_path, audio_path = _clip_paths(job_dir, i)
         start.append(clip_start_time)
 
-        with tempfile.NamedTemporaryFile(suffix=".mp4") as video_temp:
-            video_temp.write(v.video_data)
-            video_clip = VideoFileClip(video_temp.name)
-
-        with tempfile.NamedTemporaryFile(suffix=".mp3") as audio_temp:
-            audio_temp.write(a.audio_data)
-            audio_clip = AudioFileClip(audio_temp.name)
-            if audio_clip.duration > video_clip.duration:
-                audio_clip = audio_clip.subclipped(0, video_clip.duration)
+        video_clip = VideoFileClip(video_path)
+        audio_clip = AudioFileClip(audio_path)
+        if audio_clip.duration > video_clip.duration:
+            audio_clip = audio_clip.subclipped(0, video_clip.duration)
 
         video_clip = video_clip.with_audio(audio_clip)
 
@@ -149,7 +176,7 @@ def _generate_film(
             video_clip = CrossFadeIn(duration=_FADE_IN_DURATION_IN_SECONDS).apply(
                 video_clip
             )
-        if i != len(elements) - 1:
+        if i != len(tones) - 1:
             video_clip = CrossFadeOut(duration=_FADE_OUT_DURATION_IN_SECONDS).apply(
                 video_clip
             )
@@ -191,33 +218,30 @@ def _generate_film(
     en_subtitle_clip = SubtitlesClip(en_subtitles, make_textclip=en_generator)
     final_video = CompositeVideoClip(clips + [cn_subtitle_clip, en_subtitle_clip])
 
-    tos_client = TOSClient()
-    try:
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            tmp_film_file_path = f"{tmp_dir}/{req_id}.mp4"
-            final_video.write_videofile(
-                tmp_film_file_path,
-                codec="libx264",
-                audio_codec="aac",
-                temp_audiofile_path=f"{tmp_dir}/",
-            )
-            INFO("generated final video")
+    cancel_token.raise_if_cancelled()
+    final_video.write_videofile(
+        output_path,
+        codec="libx264",
+        audio_codec="aac",
+        temp_audiofile_path=f"{job_dir}/",
+        logger=_CancellableLogger(cancel_token),
+    )
+    final_video.close()
+    for video_clip in video_clips:
+        video_clip.close()
+    INFO("generated final video")
+    return output_path
 
-            tos_bucket_name = ARTIFACT_TOS_BUCKET
-            tos_object_key = f"{req_id}/{Phase.FILM.value}.mp4"
-            tos_client.put_object_from_file(
-                tos_bucket_name, tos_object_key, tmp_film_file_path
-            )
-            INFO("put final video to TOS")
 
-    except Exception as e:
-        ERROR(f"failed to generate film, error: {e}")
-        raise InternalServiceError("failed to generate film")
+def _upload_film(req_id: str, film_path: str) -> str:
+    tos_client = TOSClient()
+    tos_bucket_name = ARTIFACT_TOS_BUCKET
+    tos_object_key = f"{req_id}/{Phase.FILM.value}.mp4"
+    tos_client.put_object_from_file(tos_bucket_name, tos_object_key, film_path)
+    INFO("put final video to TOS")
 
     output = tos_client.pre_signed_url(tos_bucket_name, tos_object_key)
-    film_pre_signed_url = output.signed_url
-
-    return film_pre_signed_url
+    return output.signed_url
 
 
 class FilmGenerator(Generator):
@@ -231,7 +255,7 @@ class FilmGenerator(Generator):
 
     def __init__(self, request: ArkChatRequest, mode: Mode = Mode.CONFIRMATION):
         super().__init__(request, mode)
-        self.ark_runtime_client = Ark()
+        self.ark_runtime_client = default_sync_ark_client()
         self.downloader_client = DownloaderClient()
         self.output_parser = OutputParser(request)
         self.request = request
@@ -284,21 +308,37 @@ class FilmGenerator(Generator):
             object="chat.completion.chunk",
         )
 
-        video_download_tasks = [
-            asyncio.create_task(self._download_video(v)) for v in videos
-        ]
-        audio_download_tasks = [
-            asyncio.create_task(self._download_audio(a)) for a in audios
-        ]
-        tasks = video_download_tasks + audio_download_tasks
-        await asyncio.gather(*tasks)
-
-        # generates film using moviepy. since moviepy has potential memory leak problem, a new process is created to run
-        # so that memory is automatically released after the process is completed and terminated
-        loop = asyncio.get_event_loop()
-        film_pre_signed_url = await loop.run_in_executor(
-            ProcessPoolExecutor(), _generate_film, get_reqid(), tones, videos, audios
-        )
+        videos.sort(key=lambda video: video.index)
+        audios.sort(key=lambda audio: audio.index)
+
+        req_id = get_reqid()
+        with tempfile.TemporaryDirectory() as job_dir:
+            cancel_token = CancelToken(os.path.join(job_dir, "cancel"))
+            # the clips are downloaded before the render job takes a worker,
+            # slow downloads do not hold the render slots of other requests.
+            # The render does not overlap the downloads: the film is encoded in
+            # one pass whose cross-fades and subtitles need the duration of every
+            # clip, rendering each clip on arrival would encode the video twice
+            await self._download_clips(videos, audios, job_dir)
+            try:
+                # moviepy runs in the shared render pool: its memory leaks are released
+                # when the worker processes are recycled, no process is spawned per request
+                film_path = await get_render_pool().run(
+                    _render_film,
+                    tones,
+                    job_dir,
+                    os.path.join(job_dir, f"{req_id}.mp4"),
+                    cancel_token.path,
+                    cancel_token=cancel_token,
+                )
+                film_pre_signed_url = await asyncio.to_thread(
+                    _upload_film, req_id, film_path
+                )
+            except ServerOverloaded:
+                raise
+            except Exception as e:
+                ERROR(f"failed to generate film, error: {e}")
+                raise InternalServiceError("failed to generate film")
 
         content = {"film": Film(url=film_pre_signed_url).model_dump()}
         yield ArkChatCompletionChunk(
@@ -334,25 +374,46 @@ class FilmGenerator(Generator):
             object="chat.completion.chunk",
         )
 
-    async def _download_video(self, v: Video):
-        content_generation_task = self.ark_runtime_client.content_generation.tasks.get(
-            task_id=v.content_generation_task_id
+    async def _download_clips(
+        self, videos: List[Video], audios: List[Audio], job_dir: str
+    ) -> None:
+        semaphore = asyncio.Semaphore(FILM_DOWNLOAD_CONCURRENCY)
+
+        async def download_clip(index: int, v: Video, a: Audio) -> None:
+            video_path, audio_path = _clip_paths(job_dir, index)
+            async with semaphore:
+                await asyncio.gather(
+                    self._download_video(v, video_path),
+                    self._download_audio(a, audio_path),
+                )
+
+        tasks = [
+            asyncio.create_task(download_clip(i, v, a))
+            for i, (v, a) in enumerate(zip(videos, audios))
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _download_video(self, v: Video, path: str):
+        content_generation_task = await asyncio.to_thread(
+            self.ark_runtime_client.content_generation.tasks.get,
+            task_id=v.content_generation_task_id,
         )
         if content_generation_task.status != "succeeded":
             ERROR(f"video is not ready, index: {v.index}")
             raise InvalidParameter("messages", "video is not ready")
 
         # Download video
-        image_binary, _ = self.downloader_client.download_to_memory(
-            content_generation_task.content.video_url
+        await self.downloader_client.download_to_file(
+            content_generation_task.content.video_url, path
         )
-
-        v.video_data = image_binary.read()
         INFO(f"downloaded video, index: {v.index}")
 
-    async def _download_audio(self, a: Audio):
+    async def _download_audio(self, a: Audio, path: str):
         if not a.url.startswith("http"):
             raise InvalidParameter("message", "invalid audio url")
-        audio_data, _ = self.downloader_client.download_to_memory(a.url)
-        a.audio_data = audio_data.read()
+        await self.downloader_client.download_to_file(a.url, path)
         INFO(f"downloaded audio, index: {a.index}")
@@ -32,6 +32,7 @@ from app.models.first_frame_image import FirstFrameImage
 from app.models.video import Video
 from app.models.video_description import VideoDescription
 from app.output_parsers import OutputParser
+from arkitect.core.client import default_sync_ark_client
 from arkitect.core.component.llm.model import (
     ArkChatCompletionChunk,
     ArkChatRequest,
@@ -86,7 +87,7 @@ class VideoGenerator(Generator):
 
     def __init__(self, request: ArkChatRequest, mode: Mode = Mode.CONFIRMATION):
         super().__init__(request, mode)
-        self.ark_runtime_client = Ark()
+        self.ark_runtime_client = default_sync_ark_client()
         self.output_parser = OutputParser(request)
         self.request = request
         self.mode = mode
@@ -0,0 +1,179 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# Licensed under the 【火山方舟】原型应用软件自用许可协议
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     https://www.volcengine.com/docs/82379/1433703
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple
+
+from arkitect.core.errors import ServerOverloaded
+from arkitect.telemetry.logger import INFO, WARN
+
+from app.constants import (
+    RENDER_JOBS_PER_EXECUTOR,
+    RENDER_MAX_QUEUE_SIZE,
+    RENDER_MAX_WORKERS,
+)
+
+
+class RenderJobCancelled(Exception):
+    """Raised in a render worker when the job was cancelled by its request."""
+
+
+class CancelToken:
+    """
+    Cancellation flag shared with a render worker process.
+    It is a file, so it needs no manager process and survives pickling.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def cancel(self) -> None:
+        with open(self.path, "w"):
+            pass
+
+    @property
+    def cancelled(self) -> bool:
+        return os.path.exists(self.path)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise RenderJobCancelled()
+
+
+class RenderPool:
+    """
+    Long-lived process pool running the render jobs of all requests.
+
+    At most max_workers jobs run at once, at most max_queue_size more wait for a
+    worker, beyond that a job is rejected right away. The worker processes are
+    replaced after jobs_per_executor jobs so that the memory moviepy leaks is
+    released, without paying a process spawn and the imports on every request.
+    An executor broken by a dead worker, e.g. killed when out of memory, is
+    replaced right away.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = RENDER_MAX_WORKERS,
+        max_queue_size: int = RENDER_MAX_QUEUE_SIZE,
+        jobs_per_executor: int = RENDER_JOBS_PER_EXECUTOR,
+        initializer: Optional[Callable[[], Any]] = None,
+    ):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.jobs_per_executor = jobs_per_executor
+        self.initializer = initializer
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_jobs = 0
+        self._running = 0
+        self._waiting = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._executor_jobs >= self.jobs_per_executor:
+                if self._executor is not None:
+                    # the running jobs of the old executor complete before it exits
+                    self._executor.shutdown(wait=False)
+                    INFO("render pool executor recycled")
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, initializer=self.initializer
+                )
+                self._executor_jobs = 0
+            self._executor_jobs += 1
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+        WARN("render pool executor is broken, replaced")
+
+    def _submit(
+        self, fn: Callable[..., Any], *args: Any
+    ) -> Tuple[ProcessPoolExecutor, "asyncio.Future[Any]"]:
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            return executor, loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # a worker died after the last job of the executor
+            self._discard_executor(executor)
+            executor = self._get_executor()
+            return executor, loop.run_in_executor(executor, fn, *args)
+
+    @property
+    def stats(self) -> dict:
+        return {"running": self._running, "waiting": self._waiting}
+
+    async def run(
+        self, fn: Callable[..., Any], *args: Any, cancel_token: Optional[CancelToken] = None
+    ) -> Any:
+        """
+        Runs fn(*args) in a worker process.
+        If the calling task is cancelled, cancel_token is set for fn to stop early,
+        the worker slot is kept until fn returns.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        if self._slots.locked() and self._waiting >= self.max_queue_size:
+            WARN(f"render queue is full, {self.stats}")
+            raise ServerOverloaded("film render")
+
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        try:
+            executor, future = self._submit(fn, *args)
+            try:
+                return await asyncio.shield(future)
+            except BrokenProcessPool:
+                # a worker died during this job, the next jobs get a new executor
+                self._discard_executor(executor)
+                raise
+            except asyncio.CancelledError:
+                if cancel_token is not None:
+                    cancel_token.cancel()
+                try:
+                    await future
+                except BaseException:
+                    pass
+                raise
+        finally:
+            self._running -= 1
+            self._slots.release()
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+_render_pool: Optional[RenderPool] = None
+
+
+def get_render_pool(initializer: Optional[Callable[[], Any]] = None) -> RenderPool:
+    """Returns the render pool of the process, created on first use."""
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = RenderPool(initializer=initializer)
+    return _render_pool
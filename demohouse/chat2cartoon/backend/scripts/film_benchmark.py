@@ -0,0 +1,150 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# Licensed under the 【火山方舟】原型应用软件自用许可协议
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     https://www.volcengine.com/docs/82379/1433703
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Film rendering benchmark on synthetic clips, no network or TOS involved.
+
+legacy: clips downloaded one after the other, then rendered in a new process pool.
+pooled: clips downloaded concurrently, then rendered in the shared render pool.
+Downloads are simulated by copying the synthetic clips after a latency.
+
+    cd backend && python -m scripts.film_benchmark --films 4 --clips 5
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import numpy as np
+from moviepy import AudioClip, ColorClip
+
+from app.generators.phases.film import _clip_paths, _render_film
+from app.models.tone import Tone
+from app.render_pool import CancelToken, RenderPool
+
+
+def _make_clips(source_dir: str, clips: int, duration: float, size: int) -> None:
+    for i in range(clips):
+        video_path, audio_path = _clip_paths(source_dir, i)
+        color = (40 * i % 255, 120, 200)
+        video = ColorClip(size=(size, size * 9 // 16), color=color, duration=duration)
+        video.write_videofile(
+            video_path, fps=24, codec="libx264", audio=False, logger=None
+        )
+        tone = AudioClip(
+            lambda t: np.sin(2 * np.pi * 440 * t), duration=duration + 0.5, fps=44100
+        )
+        tone.write_audiofile(audio_path, logger=None)
+
+
+def _tones(clips: int) -> List[Tone]:
+    return [
+        Tone(index=i, line=f"第{i}句台词", line_en=f"line number {i}", tone="")
+        for i in range(clips)
+    ]
+
+
+async def _download(source_dir: str, job_dir: str, index: int, latency: float) -> None:
+    # one request per file, as the video and the audio of a clip are
+    source_paths = _clip_paths(source_dir, index)
+    job_paths = _clip_paths(job_dir, index)
+    for src, dst in zip(source_paths, job_paths):
+        await asyncio.sleep(latency)
+        await asyncio.to_thread(shutil.copyfile, src, dst)
+
+
+async def _legacy_film(source_dir: str, clips: int, latency: float) -> None:
+    with tempfile.TemporaryDirectory() as job_dir:
+        for i in range(clips):
+            await _download(source_dir, job_dir, i, latency)
+        token = CancelToken(os.path.join(job_dir, "cancel"))
+        await asyncio.get_running_loop().run_in_executor(
+            ProcessPoolExecutor(),
+            _render_film,
+            _tones(clips),
+            job_dir,
+            os.path.join(job_dir, "film.mp4"),
+            token.path,
+        )
+
+
+async def _pooled_film(
+    pool: RenderPool, source_dir: str, clips: int, latency: float
+) -> None:
+    with tempfile.TemporaryDirectory() as job_dir:
+        token = CancelToken(os.path.join(job_dir, "cancel"))
+        # as FilmGenerator: the render job takes a worker once the clips are there
+        await asyncio.gather(
+            *[_download(source_dir, job_dir, i, latency) for i in range(clips)]
+        )
+        await pool.run(
+            _render_film,
+            _tones(clips),
+            job_dir,
+            os.path.join(job_dir, "film.mp4"),
+            token.path,
+            cancel_token=token,
+        )
+
+
+async def _run(args: argparse.Namespace, source_dir: str) -> None:
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            _legacy_film(source_dir, args.clips, args.latency)
+            for _ in range(args.films)
+        ]
+    )
+    legacy = time.perf_counter() - start
+
+    pool = RenderPool(max_workers=args.workers, max_queue_size=args.films)
+    # the pool is long-lived in the server, its start is not part of a request
+    await _pooled_film(pool, source_dir, 1, 0)
+    start = time.perf_counter()
+    await asyncio.gather(
+        *[
+            _pooled_film(pool, source_dir, args.clips, args.latency)
+            for _ in range(args.films)
+        ]
+    )
+    pooled = time.perf_counter() - start
+    pool.shutdown()
+
+    print(f"{'films':>6} {'clips':>6} {'legacy s':>9} {'pooled s':>9} {'speedup':>8}")
+    print(
+        f"{args.films:>6} {args.clips:>6} {legacy:>9.2f} {pooled:>9.2f} "
+        f"{legacy / pooled:>7.1f}x"
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    source_dir = tempfile.mkdtemp()
+    try:
+        _make_clips(source_dir, args.clips, args.duration, args.size)
+        asyncio.run(_run(args, source_dir))
+    finally:
+        shutil.rmtree(source_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--films", type=int, default=4, help="concurrent requests")
+    parser.add_argument("--clips", type=int, default=5, help="clips per film")
+    parser.add_argument("--duration", type=float, default=2.0, help="clip seconds")
+    parser.add_argument("--size", type=int, default=320, help="clip width")
+    parser.add_argument("--latency", type=float, default=0.5, help="download seconds")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    main(parser.parse_args())
@@ -23,6 +23,10 @@ SEARCH_ENGINE = os.getenv('SEARCH_ENGINE') or "volc_bot"
 TAVILY_API_KEY = os.getenv('TAVILY_API_KEY') or "{YOUR_TAVILY_API_KEY}"
 # optional, if you select volc bot as search engine, please configure this
 SEARCH_BOT_ID = os.getenv('SEARCH_BOT_ID') or "{YOUR_SEARCH_BOT_ID}"
+# seconds a search result is reused for, 0 to disable the search cache
+SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL') or 3600)
+# optional, directory of the on-disk search cache, in memory if not set
+SEARCH_CACHE_DIR = os.getenv('SEARCH_CACHE_DIR') or None
 
 """
 for webui
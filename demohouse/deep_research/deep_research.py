@@ -9,7 +9,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, List, AsyncIterable
+from typing import Dict, List, AsyncIterable, Set
 
 from jinja2 import Template
 from pydantic import BaseModel, Field
@@ -37,8 +37,15 @@ class ResultsSummary(BaseModel):
     values: list of searched references for this query
     """
     ref_dict: Dict[str, List[SearchResult]] = Field(default_factory=dict)
+    # urls of the references added so far in this research session
+    seen_urls: Set[str] = Field(default_factory=set)
+    # summaries already put in the prompt by a previous query
+    seen_summaries: Set[str] = Field(default_factory=set)
 
     def add_result(self, query: str, results: List[SearchResult]) -> None:
+        results = [r for r in (self._dedupe(result) for result in results) if r is not None]
+        if not results:
+            return
         if query not in self.ref_dict:
             self.ref_dict[query] = results.copy()
         else:
@@ -46,6 +53,28 @@ class ResultsSummary(BaseModel):
             extended_references.extend(results)
             self.ref_dict[query] = extended_references
 
+    def _dedupe(self, result: SearchResult) -> Optional[SearchResult]:
+        """
+        drop the result if its summary is already in the prompt,
+        otherwise keep its summary and drop the references found by a previous query.
+        """
+        if result.summary_content:
+            if result.summary_content in self.seen_summaries:
+                return None
+            self.seen_summaries.add(result.summary_content)
+        if not result.search_references:
+            return result
+        references = []
+        for reference in result.search_references:
+            if reference.url:
+                if reference.url in self.seen_urls:
+                    continue
+                self.seen_urls.add(reference.url)
+            references.append(reference)
+        if len(references) == len(result.search_references):
+            return result
+        return result.model_copy(update={"search_references": references})
+
     def to_plaintext(self) -> str:
         output = ""
 
@@ -15,6 +15,7 @@ import logging
 from arkitect.core.component.llm.model import ArkMessage, ArkChatRequest
 
 from deep_research import DeepResearch, ExtraConfig
+from search_engine import CachedSearchEngine
 from search_engine.volc_bot import VolcBotSearchEngine
 from search_engine.tavily import TavilySearchEngine
 
@@ -40,6 +41,9 @@ async def main():
     if "tavily" == SEARCH_ENGINE:
         search_engine = TavilySearchEngine(api_key=TAVILY_API_KEY)
 
+    # repeated queries across planning rounds are searched once
+    search_engine = CachedSearchEngine(engine=search_engine)
+
     deep_research = DeepResearch(
         search_engine=search_engine,
         planning_endpoint_id=REASONING_EP_ID,
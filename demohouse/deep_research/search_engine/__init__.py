@@ -10,9 +10,21 @@
 # limitations under the License.
 
 from .search_engine import SearchEngine, SearchResult, SearchReference
+from .cache import (
+    CachedSearchEngine,
+    SearchCacheStore,
+    InMemoryLRUStore,
+    DiskStore,
+    normalize_query,
+)
 
 __all__ = [
     "SearchEngine",
     "SearchResult",
-    "SearchReference"
+    "SearchReference",
+    "CachedSearchEngine",
+    "SearchCacheStore",
+    "InMemoryLRUStore",
+    "DiskStore",
+    "normalize_query",
 ]
\ No newline at end of file
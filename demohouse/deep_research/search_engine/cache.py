@@ -0,0 +1,197 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# Licensed under the 【火山方舟】原型应用软件自用许可协议
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     https://www.volcengine.com/docs/82379/1433703
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from arkitect.telemetry.logger import INFO
+
+from .search_engine import SearchEngine, SearchResult
+
+"""
+query normalization
+"""
+
+
+def normalize_query(query: str) -> str:
+    """
+    near-identical queries share a cache entry:
+    full width forms, case, punctuation and whitespace are ignored.
+    """
+    query = unicodedata.normalize("NFKC", query).casefold()
+    query = "".join(
+        " " if unicodedata.category(c).startswith("P") else c for c in query
+    )
+    return " ".join(query.split())
+
+
+"""
+cache store interface
+"""
+
+
+class SearchCacheStore(ABC):
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[SearchResult]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, result: SearchResult, ttl: float) -> None:
+        pass
+
+
+class InMemoryLRUStore(SearchCacheStore):
+    """
+    in process store, the least recently used entries are evicted beyond max_size.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self._max_size = max_size
+        self._entries: OrderedDict[str, Tuple[float, SearchResult]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[SearchResult]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    async def set(self, key: str, result: SearchResult, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+
+class DiskStore(SearchCacheStore):
+    """
+    one json file per entry under directory, shared by the processes of a host
+    and kept across restarts. expired entries are removed when read.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, f"{key}.json")
+
+    async def get(self, key: str) -> Optional[SearchResult]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, result: SearchResult, ttl: float) -> None:
+        await asyncio.to_thread(self._write, key, result, ttl)
+
+    def _read(self, key: str) -> Optional[SearchResult]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return SearchResult.model_validate(entry.get("result"))
+
+    def _write(self, key: str, result: SearchResult, ttl: float) -> None:
+        entry = {"expires_at": time.time() + ttl, "result": result.model_dump()}
+        # write then rename, readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+"""
+cached search engine
+"""
+
+
+class CachedSearchEngine(SearchEngine, ABC):
+    """
+    wraps a search engine with a result cache keyed by the normalized query.
+    concurrent searches of the same query (planning rounds, concurrent users)
+    share a single backend request. failed searches are not cached.
+
+    the engine is meant to be shared: create it once per process, not per request.
+    """
+
+    def __init__(
+            self,
+            engine: SearchEngine,
+            store: Optional[SearchCacheStore] = None,
+            ttl: float = 3600,
+            namespace: Optional[str] = None,
+    ):
+        super().__init__()
+        self._engine = engine
+        self._store = store or InMemoryLRUStore()
+        self._ttl = ttl
+        # different engines give different results for the same query
+        self._namespace = namespace or type(engine).__name__
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _key(self, query: str) -> str:
+        key = f"{self._namespace}\0{normalize_query(query)}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def search(self, queries: List[str]) -> List[SearchResult]:
+        return asyncio.run(self.asearch(queries=queries))
+
+    async def asearch(self, queries: List[str]) -> List[SearchResult]:
+        tasks = [self._single_search(query) for query in queries]
+        return list(await asyncio.gather(*tasks))
+
+    async def _single_search(self, query: str) -> SearchResult:
+        key = self._key(query)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, query))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # a cancelled caller does not cancel the search of the others
+        result = await asyncio.shield(task)
+        if result.query == query:
+            return result
+        return result.model_copy(update={"query": query})
+
+    async def _fetch(self, key: str, query: str) -> SearchResult:
+        result = await self._store.get(key)
+        if result is not None:
+            INFO(f"search cache hit: {query}")
+            return result
+        results = await self._engine.asearch([query])
+        result = results[0]
+        await self._store.set(key, result, self._ttl)
+        return result
@@ -14,7 +14,7 @@ from typing import Literal, Optional, List
 
 from tavily import TavilyClient
 
-from .search_engine import SearchEngine, SearchResult
+from .search_engine import SearchEngine, SearchResult, SearchReference
 
 import asyncio
 
@@ -66,6 +66,14 @@ class TavilySearchEngine(SearchEngine, ABC):
         return SearchResult(
             query=query,
             summary_content=self._format_result(response),
+            search_references=[
+                SearchReference(
+                    site=None,
+                    title=r.get("title"),
+                    url=r.get("url"),
+                    content=r.get("content"),
+                ) for r in response.get("results", [])
+            ],
         )
 
     @classmethod
@@ -21,6 +21,7 @@ from arkitect.core.component.llm.model import (
 from arkitect.launcher.local.serve import launch_serve
 from arkitect.launcher.vefaas import bot_wrapper
 from arkitect.telemetry.trace import task
+from search_engine import CachedSearchEngine, DiskStore, InMemoryLRUStore, SearchEngine
 from search_engine.tavily import TavilySearchEngine
 from search_engine.volc_bot import VolcBotSearchEngine
 from deep_research import DeepResearch, ExtraConfig
@@ -32,6 +33,8 @@ from config import (
     SEARCH_ENGINE,
     TAVILY_API_KEY,
     SEARCH_BOT_ID,
+    SEARCH_CACHE_TTL,
+    SEARCH_CACHE_DIR,
 )
 
 logging.basicConfig(
@@ -40,16 +43,29 @@ logging.basicConfig(
 LOGGER = logging.getLogger(__name__)
 
 
+def build_search_engine() -> SearchEngine:
+    search_engine = VolcBotSearchEngine(bot_id=SEARCH_BOT_ID)
+    if "tavily" == SEARCH_ENGINE:
+        search_engine = TavilySearchEngine(api_key=TAVILY_API_KEY)
+    if SEARCH_CACHE_TTL <= 0:
+        return search_engine
+    # shared by all requests, so identical queries of concurrent users are searched once
+    return CachedSearchEngine(
+        engine=search_engine,
+        store=DiskStore(SEARCH_CACHE_DIR) if SEARCH_CACHE_DIR else InMemoryLRUStore(),
+        ttl=SEARCH_CACHE_TTL,
+    )
+
+
+SEARCH_ENGINE_INSTANCE = build_search_engine()
+
+
 @task()
 async def main(
         request: ArkChatRequest,
 ) -> AsyncIterable[Union[ArkChatCompletionChunk, ArkChatResponse]]:
     # using last_user_message as query
     last_user_message = get_last_message(request.messages, "user")
-    # set search_engine
-    search_engine = VolcBotSearchEngine(bot_id=SEARCH_BOT_ID)
-    if "tavily" == SEARCH_ENGINE:
-        search_engine = TavilySearchEngine(api_key=TAVILY_API_KEY)
 
     # settings from request
     metadata = request.metadata or {}
@@ -57,7 +73,7 @@ async def main(
     max_planning_rounds = metadata.get('max_planning_rounds', 5)
 
     deep_research = DeepResearch(
-        search_engine=search_engine,
+        search_engine=SEARCH_ENGINE_INSTANCE,
         planning_endpoint_id=REASONING_MODEL,
         summary_endpoint_id=REASONING_MODEL,
         extra_config=ExtraConfig(
@@ -22,6 +22,7 @@ SENTENCE_RECOGNIZED = "SentenceRecognized"
 TTS_SENTENCE_START = "TTSSentenceStart"
 TTS_SENTENCE_END = "TTSSentenceEnd"
 TTS_DONE = "TTSDone"
+BOT_INTERRUPTED = "BotInterrupted"
 BOT_ERROR = "BotError"
 CONNECTION_CLOSED = "ConnectionClosed"
 
@@ -112,6 +113,15 @@ class TTSDonePayload(WebPayload, BaseModel):
     pass
 
 
+class BotInterruptedPayload(WebPayload, BaseModel):
+    """
+    Payload for the BotInterrupted event.
+    The user spoke over the bot, the audio of its reply not yet played is stale.
+    """
+
+    pass
+
+
 class BotErrorPayload(WebPayload, BaseModel):
     """
     Payload for the BotError event.
@@ -169,6 +179,8 @@ class WebEvent(BaseModel):
             return cls(event=TTS_SENTENCE_END, data=payload.data)
         elif isinstance(payload, TTSDonePayload):
             return cls(event=TTS_DONE)
+        elif isinstance(payload, BotInterruptedPayload):
+            return cls(event=BOT_INTERRUPTED)
         elif isinstance(payload, BotErrorPayload):
             return cls(event=BOT_ERROR, payload=payload)
         else:
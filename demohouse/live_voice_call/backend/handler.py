@@ -98,12 +98,17 @@ async def handler(websocket: websockets.WebSocketCommonProtocol, path):
             await ws.send(convert_web_event_to_binary(output_event))
 
     INFO(f"New connection: {websocket.remote_address}")
+    # Start the handler loop and asynchronously fetch output events
+    outputs = service.handler_loop(async_gen(websocket))
     try:
-        # Start the handler loop and asynchronously fetch output events
-        outputs = service.handler_loop(async_gen(websocket))
         await asyncio.create_task(fetch_output(websocket, outputs))
     except websockets.exceptions.ConnectionClosed as e:
         INFO(f"Connection closed: {e}")
+    finally:
+        # stops the turns still generating or speaking for the hung up call
+        await outputs.aclose()
+        # the asr and tts connections live as long as the call
+        await service.close()
 
 
 async def main():
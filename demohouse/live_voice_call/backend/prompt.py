@@ -79,6 +79,12 @@ SYSTEM_PROMPT = """
 - 想要凸显情绪时，会在句末加语气词，例如：“好咩？”、“跟我说说呗”、“我完全没听说诶”
 """
 
+SUMMARY_PROMPT = """
+你负责压缩一段语音聊天的历史记录。请把【已有摘要】和【新增对话】合并成一份新的摘要，
+保留用户的个人信息、偏好、提到的事情和尚未结束的话题，省略寒暄。
+只输出摘要本身，不超过200字。
+"""
+
 
 class VoiceBotPrompt(BaseChatPromptTemplate):
     input_variables: List[str] = ["messages"]
@@ -9,20 +9,30 @@
 # See the License for the specific language governing permissions and
 # limitations under the License. 
 
-from typing import AsyncIterable, List, Union
+import asyncio
+from collections import deque
+from typing import AsyncIterable, Deque, List, Optional, Union
 
 from arkitect.core.component.asr import ASRFullServerResponse, AsyncASRClient
+from arkitect.core.component.context.history import estimate_message_tokens
 from arkitect.core.component.llm import BaseChatLanguageModel
 from arkitect.core.component.llm.model import ArkMessage
-from arkitect.core.component.tts import AsyncTTSClient, AudioParams, ConnectionParams
+from arkitect.core.component.tts import (
+    AsyncTTSClient,
+    AudioParams,
+    ConnectionParams,
+    TTSConnectionPool,
+    TTSPipeline,
+)
 from arkitect.core.component.tts.constants import (
     EventSessionFinished,
     EventTTSSentenceEnd,
     EventTTSSentenceStart,
 )
-from arkitect.telemetry.logger import INFO
+from arkitect.telemetry.logger import ERROR, INFO
 from event import *
-from prompt import VoiceBotPrompt
+from prompt import SUMMARY_PROMPT, VoiceBotPrompt
+from turn import TurnController
 
 StateInProgress = "InProgress"
 StateIdle = "Idle"
@@ -30,11 +40,22 @@ StateIdle = "Idle"
 ASRInterval = 2000
 # Default tts live_voice_call
 DEFAULT_SPEAKER = "zh_female_sajiaonvyou_moon_bigtts"
+# Default token budget of the history sent to the llm
+DEFAULT_HISTORY_MAX_TOKENS = 2000
+# Longest rolling summary kept, the summary prompt asks for at most 200 characters
+DEFAULT_HISTORY_SUMMARY_MAX_CHARS = 400
+# Newly recognized characters that count as the user speaking over the bot
+DEFAULT_BARGE_IN_MIN_CHARS = 2
 
 
 class VoiceBotService(BaseModel):
     asr_client: Optional[AsyncASRClient] = None
     tts_client: Optional[AsyncTTSClient] = None
+    # keeps the tts connection of the call open between turns,
+    # each turn only starts a new tts session on it
+    tts_pool: Optional[TTSConnectionPool] = None
+    # sends the reply to tts sentence by sentence while the llm generates it
+    tts_pipeline: Optional[TTSPipeline] = None
     llm_ep_id: str
     state: str = StateIdle
     tts_speaker: str = DEFAULT_SPEAKER  # TTS live_voice_call
@@ -47,9 +68,27 @@ class VoiceBotService(BaseModel):
     tts_app_key: str
     tts_access_key: str
 
-    history_messages: List[ArkMessage] = []  # Store historical dialogue information
+    # Store historical dialogue information
+    history_messages: Deque[ArkMessage] = Field(default_factory=deque)
+    # oldest turns are dropped beyond this budget (estimated tokens)
+    history_max_tokens: int = DEFAULT_HISTORY_MAX_TOKENS
+    # if set, dropped turns are folded into a rolling summary by this endpoint
+    summary_ep_id: Optional[str] = None
+    history_summary: str = ""
+    # a longer summary returned by the endpoint is cut to this length
+    history_summary_max_chars: int = DEFAULT_HISTORY_SUMMARY_MAX_CHARS
+    # accept the next question as soon as the reply text is complete,
+    # its llm call then overlaps the tts of the previous reply
+    overlap_turns: bool = True
+    # keep listening while the bot answers, and cancel the answer as soon as
+    # the user speaks: the client is expected to cancel its own echo
+    barge_in: bool = True
+    barge_in_min_chars: int = DEFAULT_BARGE_IN_MIN_CHARS
+    # the running turns, cancelled together on barge-in
+    turns: TurnController = Field(default_factory=TurnController)
 
     asr_buffer: str = ""  # Reservoir asr recognition result
+    asr_committed_len: int = 0  # Length of the asr text already recognized as sentences
     asr_no_input_duration: int = 0  # Cumulated no live_voice_call recognition duration
     asr_last_duration: int = 0  # Last asr recognition duration
 
@@ -58,22 +97,49 @@ class VoiceBotService(BaseModel):
 
         arbitrary_types_allowed = True
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._history_tokens: Deque[int] = deque(
+            estimate_message_tokens(m) for m in self.history_messages
+        )
+        # running total of _history_tokens
+        self._history_total = sum(self._history_tokens)
+        self._summary_task: Optional[asyncio.Task] = None
+
     async def init(self):
         """
         Initialize the TTS and ASR clients.
+        The connections are kept for the whole call.
         """
+        self.tts_pool = TTSConnectionPool(max_connections_per_host=1)
         self.tts_client = AsyncTTSClient(
             app_key=self.tts_app_key,
             access_key=self.tts_access_key,
             connection_params=ConnectionParams(
                 speaker=self.tts_speaker, audio_params=AudioParams()
             ),
+            pool=self.tts_pool,
         )
+        self.tts_pipeline = TTSPipeline(self.tts_client)
         self.asr_client = AsyncASRClient(
             app_key=self.asr_app_key, access_key=self.asr_access_key
         )
-        await self.asr_client.init()
-        await self.tts_client.init()
+        await asyncio.gather(self.asr_client.init(), self.tts_client.init())
+
+    async def close(self):
+        """
+        Close the connections at the end of the call.
+        """
+        # the turns of a hung up call are not spoken anymore
+        await self.turns.interrupt()
+        if self._summary_task is not None:
+            self._summary_task.cancel()
+        if self.asr_client is not None:
+            await self.asr_client.close()
+        if self.tts_client is not None:
+            await self.tts_client.close()
+        if self.tts_pool is not None:
+            await self.tts_pool.close()
 
     async def handler_loop(
         self, inputs: AsyncIterable[WebEvent]
@@ -81,16 +147,80 @@ class VoiceBotService(BaseModel):
         """
         Main loop for handling input events and generating responses.
         """
-        asr_responses = await self.handle_input_event(inputs)
-        async for asr_recognized in self.handle_asr_response(asr_responses):
-            # set state into InProgress
-            self.state = StateInProgress
-            yield WebEvent.from_payload(asr_recognized)
-            llm_stream_rsp = self.stream_llm_chat(asr_recognized.sentence)
-            async for payload in self.handle_tts_response(llm_stream_rsp):
-                yield WebEvent.from_payload(payload)
-            # recreate the asr and tts client
-            self.state = StateIdle
+        outputs: asyncio.Queue[Optional[WebEvent]] = asyncio.Queue()
+
+        async def run_turns() -> None:
+            try:
+                asr_responses = await self.handle_input_event(inputs)
+                async for payload in self.handle_asr_response(asr_responses):
+                    await outputs.put(WebEvent.from_payload(payload))
+                    if not isinstance(payload, SentenceRecognizedPayload):
+                        continue
+                    # set state into InProgress
+                    self.state = StateInProgress
+                    turn = self.turns.start(
+                        self.run_turn(payload.sentence, self.turns.last_turn, outputs)
+                    )
+                    if not self.overlap_turns and not self.barge_in:
+                        # the asr responses are watched for barge-in otherwise
+                        await asyncio.wait([turn])
+                await self.turns.wait()
+            finally:
+                await self.turns.interrupt()
+                await outputs.put(None)
+
+        runner = asyncio.create_task(run_turns())
+        try:
+            while True:
+                event = await outputs.get()
+                if event is None:
+                    break
+                yield event
+            await runner
+        finally:
+            runner.cancel()
+
+    async def run_turn(
+        self,
+        sentence: str,
+        previous_turn: Optional[asyncio.Task],
+        outputs: "asyncio.Queue[Optional[WebEvent]]",
+    ) -> None:
+        """
+        Answer a recognized sentence. The llm call starts right away, the tts
+        starts once the previous reply is fully spoken so replies never interleave.
+        """
+        texts: asyncio.Queue[Optional[str]] = asyncio.Queue()
+
+        async def generate() -> None:
+            try:
+                async for text in self.stream_llm_chat(sentence):
+                    await texts.put(text)
+            finally:
+                texts.put_nowait(None)
+                if self.overlap_turns:
+                    self.state = StateIdle
+
+        async def reply_texts() -> AsyncIterable[str]:
+            while True:
+                text = await texts.get()
+                if text is None:
+                    return
+                yield text
+
+        llm_task = asyncio.create_task(generate())
+        try:
+            if previous_turn is not None:
+                await asyncio.wait([previous_turn])
+            async for payload in self.handle_tts_response(reply_texts()):
+                await outputs.put(WebEvent.from_payload(payload))
+            await llm_task
+        finally:
+            # on barge-in, the llm stream is closed with the task
+            llm_task.cancel()
+            await asyncio.wait([llm_task])
+            if not self.overlap_turns:
+                self.state = StateIdle
 
     async def handle_input_event(
         self, inputs: AsyncIterable[WebEvent]
@@ -101,12 +231,17 @@ class VoiceBotService(BaseModel):
 
         async def async_gen() -> AsyncIterable[bytes]:
             async for input_event in inputs:
-                if self.state != StateIdle:
+                if self.state != StateIdle and not self.barge_in:
                     INFO("service is InProgress, will ignore the incoming input")
                     continue
                 elif not self.asr_client.inited:
                     INFO("need recreate asr conn")
                     await self.asr_client.init()
+                    # a new connection recognizes from an empty text
+                    self.asr_committed_len = 0
+                    self.asr_buffer = ""
+                    self.asr_last_duration = 0
+                    self.asr_no_input_duration = 0
 
                 INFO(
                     f"receive input, event={input_event.event} payload={input_event.payload}"
@@ -122,22 +257,30 @@ class VoiceBotService(BaseModel):
 
     async def handle_asr_response(
         self, asr_responses: AsyncIterable[ASRFullServerResponse]
-    ) -> AsyncIterable[SentenceRecognizedPayload]:
+    ) -> AsyncIterable[Union[SentenceRecognizedPayload, BotInterruptedPayload]]:
         """
         Handle ASR responses and generate recognized sentences.
+        When the user speaks over the bot, its turns are interrupted first.
         """
         async for response in asr_responses:
+            if self.barge_in and self.turns.active and self._user_speaking(response):
+                await self.turns.interrupt()
+                self.state = StateIdle
+                yield BotInterruptedPayload()
             if self.state == StateIdle:
                 if self.asr_buffer and self.asr_no_input_duration > ASRInterval:
-                    yield SentenceRecognizedPayload(sentence=self.asr_buffer)
+                    sentence = self.asr_buffer
+                    # the asr session stays open, the text of the session keeps
+                    # growing: the next sentence starts after this one
+                    self.asr_committed_len += len(self.asr_buffer)
                     self.asr_buffer = ""
                     self.asr_no_input_duration = 0
-                    self.asr_last_duration = 0
-                    await self.asr_client.close()
+                    yield SentenceRecognizedPayload(sentence=sentence)
                 elif response.result and response.result.text:
                     # buffering
-                    increment_len = len(response.result.text) - len(self.asr_buffer)
-                    self.asr_buffer = response.result.text
+                    text = response.result.text[self.asr_committed_len :]
+                    increment_len = len(text) - len(self.asr_buffer)
+                    self.asr_buffer = text
                     if increment_len > 0:
                         self.asr_last_duration = response.audio.duration
                     else:
@@ -151,6 +294,15 @@ class VoiceBotService(BaseModel):
                 INFO("service is InProgress, will ignore the newer asr response")
                 continue
 
+    def _user_speaking(self, response: ASRFullServerResponse) -> bool:
+        """
+        Whether the response recognized new speech after the committed sentences.
+        """
+        if not response.result or not response.result.text:
+            return False
+        text = response.result.text[self.asr_committed_len :]
+        return len(text) - len(self.asr_buffer) >= self.barge_in_min_chars
+
     async def handle_tts_response(
         self, llm_output: AsyncIterable[str]
     ) -> AsyncIterable[
@@ -160,11 +312,15 @@ class VoiceBotService(BaseModel):
         Handle TTS responses and generate TTS events.
         """
         buffer = bytearray()
+        # the session of the turn runs over the pooled connection of the call
+        if self.tts_client.connection_params.speaker != self.tts_speaker:
+            self.tts_client.connection_params.speaker = self.tts_speaker
+            if self.tts_client.inited:
+                await self.tts_client.close()
         if not self.tts_client.inited:
-            INFO("need recreate tts client")
             await self.tts_client.init()
-        async for tts_rsp in self.tts_client.tts(
-            source=llm_output, include_transcript=True
+        async for tts_rsp in self.tts_pipeline.speak(
+            llm_output, include_transcript=True
         ):
             INFO(
                 f"receive tts response: event={tts_rsp.event} transcript={tts_rsp.transcript} \
@@ -180,28 +336,90 @@ class VoiceBotService(BaseModel):
 
             if tts_rsp.event == EventSessionFinished:
                 yield TTSDonePayload()
-                await self.tts_client.close()
                 break
 
     async def stream_llm_chat(self, text: str) -> AsyncIterable[str]:
         """
         Stream chat with the LLM and generate responses.
         """
-        self.history_messages.append(ArkMessage(**{"role": "user", "content": text}))
+        self._append_history(ArkMessage(**{"role": "user", "content": text}))
 
+        messages = list(self.history_messages)
+        if self.history_summary:
+            messages.insert(
+                0,
+                ArkMessage(
+                    role="system", content=f"之前的聊天摘要：{self.history_summary}"
+                ),
+            )
         llm = BaseChatLanguageModel(
             template=VoiceBotPrompt(),
-            messages=self.history_messages,
+            messages=messages,
             endpoint_id=self.llm_ep_id,
         )
         completion_buffer = ""
 
-        async for chunk in llm.astream():
-            if chunk.choices and chunk.choices[0].delta:
-                yield chunk.choices[0].delta.content
-                completion_buffer += chunk.choices[0].delta.content
+        try:
+            async for chunk in llm.astream():
+                if chunk.choices and chunk.choices[0].delta:
+                    yield chunk.choices[0].delta.content
+                    completion_buffer += chunk.choices[0].delta.content
+        finally:
+            # an interrupted reply is kept up to where it was generated
+            if completion_buffer:
+                self._append_history(
+                    ArkMessage(**{"role": "assistant", "content": completion_buffer})
+                )
 
-        if completion_buffer:
-            self.history_messages.append(
-                ArkMessage(**{"role": "assistant", "content": completion_buffer})
+    def _append_history(self, message: ArkMessage) -> None:
+        """
+        Append to the history, dropping the oldest messages beyond the token budget.
+        Each message is estimated once, trimming is O(dropped messages).
+        """
+        tokens = estimate_message_tokens(message)
+        self.history_messages.append(message)
+        self._history_tokens.append(tokens)
+        self._history_total += tokens
+        dropped: List[ArkMessage] = []
+        # the latest message is always kept
+        while (
+            self._history_total > self.history_max_tokens
+            and len(self.history_messages) > 1
+        ):
+            self._history_total -= self._history_tokens.popleft()
+            dropped.append(self.history_messages.popleft())
+        if dropped and self.summary_ep_id:
+            previous = self._summary_task
+            self._summary_task = asyncio.create_task(
+                self._summarize(dropped, previous)
             )
+
+    async def _summarize(
+        self, dropped: List[ArkMessage], previous: Optional[asyncio.Task]
+    ) -> None:
+        """
+        Fold dropped messages into the rolling summary, off the reply path.
+        """
+        if previous is not None:
+            # summaries are folded in order
+            await asyncio.wait([previous])
+        dialogue = "\n".join(f"{m.role}: {m.content}" for m in dropped)
+        llm = BaseChatLanguageModel(
+            endpoint_id=self.summary_ep_id,
+            messages=[
+                ArkMessage(role="system", content=SUMMARY_PROMPT),
+                ArkMessage(
+                    role="user",
+                    content=f"【已有摘要】\n{self.history_summary}\n【新增对话】\n{dialogue}",
+                ),
+            ],
+        )
+        try:
+            resp = await llm.arun()
+            summary = resp.choices[0].message.content or ""
+            if len(summary) > self.history_summary_max_chars:
+                INFO(f"history summary of {len(summary)} characters is cut")
+                summary = summary[: self.history_summary_max_chars]
+            self.history_summary = summary
+        except Exception as e:
+            ERROR(f"failed to summarize history: {e}")
@@ -0,0 +1,81 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# Licensed under the 【火山方舟】原型应用软件自用许可协议
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     https://www.volcengine.com/docs/82379/1433703
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from typing import Awaitable, Optional, Set
+
+from arkitect.telemetry.logger import INFO
+
+
+class TurnController:
+    """
+    Owns the bot turns of a call.
+
+    A turn answers one recognized sentence, its llm generation and tts
+    synthesis run inside the turn task. interrupt() cancels every running turn
+    at once, e.g. when the user speaks over the bot, and waits until they have
+    closed their llm stream and given back their tts session.
+    """
+
+    def __init__(self) -> None:
+        self._turns: Set[asyncio.Task] = set()
+        self._last: Optional[asyncio.Task] = None
+        # turns cancelled before their reply was fully spoken
+        self.interrupted_turns = 0
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether a turn is generating or speaking.
+        """
+        return bool(self._turns)
+
+    @property
+    def last_turn(self) -> Optional[asyncio.Task]:
+        """
+        The latest turn still running, the next turn speaks after it.
+        """
+        if self._last is not None and self._last.done():
+            self._last = None
+        return self._last
+
+    def start(self, turn: Awaitable[None]) -> asyncio.Task:
+        """
+        Run a turn in its own task.
+        """
+        task = asyncio.ensure_future(turn)
+        self._turns.add(task)
+        task.add_done_callback(self._turns.discard)
+        self._last = task
+        return task
+
+    async def wait(self) -> None:
+        """
+        Wait for the running turns to end, raising the error of a failed turn.
+        """
+        while self._turns:
+            await asyncio.gather(*self._turns)
+
+    async def interrupt(self) -> int:
+        """
+        Cancel the running turns and wait for their cleanup.
+
+        :return: the number of turns cancelled.
+        """
+        turns = list(self._turns)
+        for task in turns:
+            task.cancel()
+        await asyncio.gather(*turns, return_exceptions=True)
+        self._last = None
+        self.interrupted_turns += len(turns)
+        if turns:
+            INFO(f"interrupted {len(turns)} turn(s)")
+        return len(turns)
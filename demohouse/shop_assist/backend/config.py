@@ -7,3 +7,8 @@ faq_collection_name = os.getenv("FAQ_COLLECTION_NAME", "")
 endpoint_id = os.getenv("LLM_ENDPOINT_ID", "doubao-1-5-pro-32k-250115")
 bucket_name = os.getenv("BUCKET_NAME", "")
 use_server_auth = os.getenv("USE_SERVER_AUTH", "False").lower() in ("true", "1", "t")
+
+# knowledge retrieval latency budget in seconds, and result cache
+retrieval_timeout = float(os.getenv("RETRIEVAL_TIMEOUT", "3"))
+retrieval_cache_ttl = float(os.getenv("RETRIEVAL_CACHE_TTL", "300"))
+retrieval_cache_size = int(os.getenv("RETRIEVAL_CACHE_SIZE", "1000"))
@@ -1,5 +1,6 @@
+import time
 from collections import OrderedDict
-from typing import Generic, Optional, TypeVar
+from typing import Dict, Generic, Optional, TypeVar
 
 T = TypeVar("T")  # Generic type for cache values
 
@@ -39,3 +40,43 @@ class LRUCache(Generic[T]):
         self.cache[key] = value
         if len(self.cache) > self.capacity:
             self.cache.popitem(last=False)
+
+
+class TTLCache(LRUCache[T]):
+    """LRU Cache whose entries expire ttl seconds after they are put"""
+
+    def __init__(self, capacity: int = 1000, ttl: float = 300):
+        super().__init__(capacity)
+        self.ttl = ttl
+        self._expire_at: Dict[str, float] = {}
+
+    def get(self, key: str) -> Optional[T]:
+        """
+        Get value from cache if it has not expired
+
+        Args:
+            key: Cache key to look up
+
+        Returns:
+            Cached value if found and fresh, None otherwise
+        """
+        expire_at = self._expire_at.get(key)
+        if expire_at is not None and expire_at <= time.monotonic():
+            self.cache.pop(key, None)
+            del self._expire_at[key]
+            return None
+        return super().get(key)
+
+    def put(self, key: str, value: T) -> None:
+        """
+        Put value in cache for ttl seconds, evict least recently used if at capacity
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if key not in self.cache and len(self.cache) >= self.capacity:
+            # the least recently used entry is about to be evicted
+            self._expire_at.pop(next(iter(self.cache)), None)
+        super().put(key, value)
+        self._expire_at[key] = time.monotonic() + self.ttl
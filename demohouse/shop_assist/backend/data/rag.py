@@ -1,5 +1,7 @@
+import asyncio
 import io
-from typing import List, Tuple
+import json
+from typing import Any, Dict, List, Tuple
 
 import config
 import pandas as pd
@@ -8,6 +10,9 @@ from tos.exceptions import TosServerError
 from volcengine.viking_knowledgebase import VikingKnowledgeBaseService
 
 from arkitect.core.component.llm.model import ActionDetail, ArkMessage, ToolDetail
+from arkitect.telemetry.logger import ERROR, WARN
+
+from .cache import TTLCache
 
 viking_knowledgebase_service = VikingKnowledgeBaseService(
     host="api-knowledgebase.mlp.cn-beijing.volces.com",
@@ -18,6 +23,11 @@ viking_knowledgebase_service = VikingKnowledgeBaseService(
 viking_knowledgebase_service.set_ak(config.ak)
 viking_knowledgebase_service.set_sk(config.sk)
 
+# retrieval results by collection and normalized conversation
+_retrieval_cache = TTLCache[dict](
+    capacity=config.retrieval_cache_size, ttl=config.retrieval_cache_ttl
+)
+
 # Initialize TOS client
 tos_client = TosClientV2(
     ak=config.ak,
@@ -70,9 +80,39 @@ def save_faq(faq_data: pd.DataFrame, account_id: str) -> None:
     collection.add_doc(add_type="tos", tos_path=f"{bucket_name}/{object_key}")
 
 
-def retrieval_knowledge(
-    messages: List[ArkMessage], doc_filter: dict
-) -> Tuple[str, ActionDetail]:
+def _normalize(text: Any) -> str:
+    if not isinstance(text, str):
+        text = json.dumps(text, ensure_ascii=False, sort_keys=True, default=str)
+    return " ".join(text.split()).lower()
+
+
+def _cache_key(
+    collection_name: str, messages: List[ArkMessage], doc_filter: dict
+) -> str:
+    # the query is rewritten with the conversation, it is part of the key.
+    # the system prompt is not, the doc filter already scopes the account
+    conversation = [
+        (m.role, _normalize(m.content)) for m in messages if m.role != "system"
+    ]
+    return json.dumps(
+        [collection_name, conversation, doc_filter],
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+
+
+async def _search_knowledge(
+    collection_name: str,
+    limit: int,
+    messages: List[ArkMessage],
+    doc_filter: dict,
+) -> dict:
+    key = _cache_key(collection_name, messages, doc_filter)
+    cached = _retrieval_cache.get(key)
+    if cached is not None:
+        return cached
+
     # Rewriting queries in RAG incorporates historical context, ensuring the user’s key
     #  concerns from prior conversations are reflected, improving retrieval relevance.
     pre_processing = {
@@ -81,38 +121,77 @@ def retrieval_knowledge(
         "messages": [m.model_dump() for m in messages],
         "return_token_usage": True,
     }
-
-    # seperate retrieval for different doc types
-    res = viking_knowledgebase_service.search_knowledge(
-        collection_name=config.collection_name,
+    # the sdk is synchronous, it runs in a thread not to block the event loop
+    res = await asyncio.to_thread(
+        viking_knowledgebase_service.search_knowledge,
+        collection_name=collection_name,
         query=messages[-1].content,
         pre_processing=pre_processing,
-        limit=3,
+        limit=limit,
         dense_weight=0.5,
         post_processing={},
         query_param={"doc_filter": doc_filter},
         project="default",
     )
-    faq_res = viking_knowledgebase_service.search_knowledge(
-        collection_name=config.faq_collection_name,
-        query=messages[-1].content,
-        pre_processing=pre_processing,
-        limit=5,
-        dense_weight=0.5,
-        post_processing={},
-        query_param={"doc_filter": doc_filter},
-        project="default",
-    )
-    ref = [
-        res["doc_info"]
-        for res in (res.get("result_list") or []) + (faq_res.get("result_list") or [])
+    _retrieval_cache.put(key, res)
+    return res
+
+
+def _merge_results(results: List[dict]) -> List[dict]:
+    """
+    Merge the result lists of the collections, deduplicated and ranked by score
+    """
+    merged: Dict[str, dict] = {}
+    for res in results:
+        for item in res.get("result_list") or []:
+            key = str(item.get("point_id") or item.get("id") or item.get("content"))
+            if key not in merged or item.get("score", 0) > merged[key].get("score", 0):
+                merged[key] = item
+    return sorted(merged.values(), key=lambda item: item.get("score", 0), reverse=True)
+
+
+async def retrieval_knowledge(
+    messages: List[ArkMessage],
+    doc_filter: dict,
+    timeout: float = config.retrieval_timeout,
+) -> Tuple[str, ActionDetail]:
+    # seperate retrieval for different doc types, run concurrently.
+    # a retrieval slower than timeout is left out of this answer,
+    # it still completes in the background and fills the cache
+    tasks = [
+        asyncio.create_task(
+            _search_knowledge(config.collection_name, 3, messages, doc_filter)
+        ),
+        asyncio.create_task(
+            _search_knowledge(config.faq_collection_name, 5, messages, doc_filter)
+        ),
     ]
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    if pending:
+        WARN(f"{len(pending)} knowledge retrieval(s) exceeded {timeout}s, skipped")
+    results = []
+    for task in tasks:
+        if task not in done:
+            # retrieve the exception, if any, once it completes
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            continue
+        if task.exception() is not None:
+            ERROR(f"knowledge retrieval failed: {task.exception()}")
+            continue
+        results.append(task.result())
+
+    result_list = _merge_results(results)
+    rewrite_query = next(
+        (r.get("rewrite_query") for r in reversed(results) if r.get("rewrite_query")),
+        None,
+    )
+    ref = [res["doc_info"] for res in result_list]
     action_detail = ActionDetail(
         name="knowledge",
         tool_details=[
             ToolDetail(
                 name="retrieval",
-                input=faq_res.get("rewrite_query"),
+                input=rewrite_query,
                 output=ref,
             )
         ],
@@ -121,8 +200,7 @@ def retrieval_knowledge(
         f"""
 # 参考资料
 <context>
-{res["result_list"]}
-{faq_res["result_list"]}
+{result_list}
 </context>
 """,
         action_detail,
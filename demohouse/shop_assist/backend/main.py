@@ -55,7 +55,7 @@ async def custom_support_chat(
     tools, system_prompt = register_support_functions(functions, products, account_id)
     messages = [ArkMessage(role="system", content=system_prompt)]
     messages.extend(request.messages)
-    knowledge_prompt, action_detail = retrieval_knowledge(
+    knowledge_prompt, action_detail = await retrieval_knowledge(
         messages,
         {
             "op": "or",
@@ -1,9 +1,12 @@
 import io
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
+import config
 import pandas as pd
-from data.rag import save_faq
+from data import rag
+from data.rag import retrieval_knowledge, save_faq
 from tos.exceptions import TosServerError
 
 
@@ -99,5 +102,55 @@ class TestSaveFAQ(unittest.TestCase):
         )
 
 
+class TestRetrievalKnowledge(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = []
+
+        def search_knowledge(collection_name, **kwargs):
+            self.calls.append(collection_name)
+            if collection_name == "slow":
+                time.sleep(0.5)
+            return {
+                "rewrite_query": "rewritten",
+                "result_list": [
+                    {"point_id": "shared", "score": 0.5, "doc_info": collection_name},
+                    {"point_id": collection_name, "score": 0.9, "doc_info": "own"},
+                ],
+            }
+
+        self.mock_viking_service = MagicMock()
+        self.mock_viking_service.search_knowledge.side_effect = search_knowledge
+        self.patchers = [
+            patch("data.rag.viking_knowledgebase_service", self.mock_viking_service),
+            patch.object(config, "collection_name", "products"),
+            patch.object(config, "faq_collection_name", "faq"),
+            patch.object(rag, "_retrieval_cache", rag.TTLCache(capacity=10, ttl=60)),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    async def test_merged_deduplicated_and_cached(self):
+        messages = [rag.ArkMessage(role="user", content="How  to Refund")]
+        _, action_detail = await retrieval_knowledge(messages, {})
+        refs = action_detail.tool_details[0].output
+        # ranked by score, the shared point is kept once
+        self.assertEqual(refs[:2], ["own", "own"])
+        self.assertEqual(len(refs), 3)
+
+        messages = [rag.ArkMessage(role="user", content="how to refund")]
+        await retrieval_knowledge(messages, {})
+        self.assertEqual(sorted(self.calls), ["faq", "products"])
+
+    async def test_partial_results_on_timeout(self):
+        with patch.object(config, "faq_collection_name", "slow"):
+            messages = [rag.ArkMessage(role="user", content="q")]
+            _, action_detail = await retrieval_knowledge(messages, {}, timeout=0.1)
+        self.assertEqual(action_detail.tool_details[0].output, ["own", "products"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -197,7 +197,7 @@ async def default_model_calling(
     # local in-memory storage should be changed to other storage in production
     context_id: Optional[str] = get_headers().get("X-Context-Id", None)
     assert context_id is not None
-    contexts: utils.Storage = utils.CoroutineSafeMap.get_instance_sync()
+    contexts: utils.Storage = utils.TTLStore.get_instance_sync()
     if not await contexts.contains(context_id):
         await contexts.set(context_id, utils.Context())
 
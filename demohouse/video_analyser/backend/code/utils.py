@@ -10,9 +10,12 @@
 # limitations under the License. 
 
 import asyncio
+import heapq
+import os
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from arkitect.core.component.llm.model import ArkMessage
 from arkitect.utils.common import Singleton
@@ -20,120 +23,164 @@ from arkitect.utils.common import Singleton
 STATE_IDLE = 0
 STATE_PENDING_FOR_RESPONSE = 1
 
+CONTEXT_TTL_SECONDS = float(os.getenv("CONTEXT_TTL_SECONDS", 600))
+CONTEXT_MAX_SIZE = int(os.getenv("CONTEXT_MAX_SIZE", 10000))
+_CLEANUP_RESOLUTION_SECONDS = 1.0
+
 
 class Context:
     def __init__(self):
         self.history = []
         self.state = STATE_IDLE
-        self.expire_at = time.time() + 600
+        self.expire_at = time.time() + CONTEXT_TTL_SECONDS
 
 
 class Storage(ABC):
-    @classmethod
     @abstractmethod
-    async def get_history(cls, key: str) -> List[ArkMessage]:
+    async def get_history(self, key: str) -> List[ArkMessage]:
         pass
 
-    @classmethod
     @abstractmethod
-    async def append(cls, key: str, value: ArkMessage) -> None:
+    async def append(self, key: str, value: ArkMessage) -> None:
         pass
 
-    @classmethod
     @abstractmethod
-    async def contains(cls, key: str) -> bool:
+    async def contains(self, key: str) -> bool:
         pass
 
-    @classmethod
     @abstractmethod
-    async def set(cls, key: str, value: Context) -> None:
+    async def set(self, key: str, value: Context) -> None:
         pass
 
 
-class CoroutineSafeMap(Storage, Singleton):
-    _lock = asyncio.Lock()
-    _map: Dict[str, Context] = {}
-
-    def __init__(self):
-        asyncio.create_task(self.cleanup())
-
-    @classmethod
-    async def get(cls, key: str, default=None) -> Context:
-        async with cls._lock:
-            return cls._map.get(key, default)
-
-    @classmethod
-    async def get_history(cls, key: str) -> List[ArkMessage]:
-        async with cls._lock:
-            ctx = cls._map.get(key)
-            if ctx is None:
-                return []
-            return ctx.history
-
-    @classmethod
-    async def get_state(cls, key: str) -> int:
-        async with cls._lock:
-            ctx = cls._map.get(key)
-            if ctx is None:
-                return STATE_IDLE
-            return ctx.state
-
-    @classmethod
-    async def set_state(cls, key: str, value: Context) -> None:
-        async with cls._lock:
-            if key not in cls._map:
-                return
-            cls._map[key].state = value
-
-    @classmethod
-    async def set(cls, key: str, value: Context) -> None:
-        async with cls._lock:
-            cls._map[key] = value
-
-    @classmethod
-    async def append(cls, key: str, value: ArkMessage) -> None:
-        async with cls._lock:
-            if key not in cls._map:
-                return
-            cls._map[key].history.append(value)
-            cls._map[key].expire_at = time.time() + 600
-
-    @classmethod
-    async def delete(cls, key: str):
-        async with cls._lock:
-            if key in cls._map:
-                del cls._map[key]
-
-    @classmethod
-    async def contains(cls, key: str) -> bool:
-        async with cls._lock:
-            return key in cls._map
-
-    @classmethod
-    async def keys(cls) -> List[str]:
-        async with cls._lock:
-            return list(cls._map.keys())
-
-    @classmethod
-    async def items(cls) -> List[Any]:
-        async with cls._lock:
-            return list(cls._map.items())
-
-    @classmethod
-    async def clear(cls) -> None:
-        async with cls._lock:
-            cls._map.clear()
-
-    @classmethod
-    async def cleanup(cls) -> None:
+class TTLStore(Storage, Singleton):
+    """
+    In-memory context store of the event loop.
+
+    All the accesses run on the event loop thread and never await in between,
+    so no lock is needed. Contexts expire ttl seconds after their last update,
+    an expiry heap makes the cleanup O(expired) instead of a scan of every
+    context. Beyond max_size the least recently used contexts are evicted.
+    """
+
+    def __init__(
+        self, ttl: float = CONTEXT_TTL_SECONDS, max_size: int = CONTEXT_MAX_SIZE
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._map: "OrderedDict[str, Context]" = OrderedDict()
+        # (expire_at, key), entries of refreshed or deleted contexts are stale
+        # and skipped, the heap is rebuilt when they outnumber the live ones
+        self._heap: List[Tuple[float, str]] = []
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self.metrics: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evicted": 0,
+        }
+
+    def _ensure_cleanup(self) -> None:
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self.cleanup())
+
+    def _lookup(self, key: str) -> Optional[Context]:
+        ctx = self._map.get(key)
+        if ctx is not None and ctx.expire_at <= time.time():
+            # expired but not cleaned up yet
+            self._remove(key)
+            self.metrics["expired"] += 1
+            ctx = None
+        if ctx is None:
+            self.metrics["misses"] += 1
+            return None
+        self.metrics["hits"] += 1
+        self._map.move_to_end(key)
+        return ctx
+
+    def _touch(self, key: str, ctx: Context) -> None:
+        ctx.expire_at = time.time() + self.ttl
+        heapq.heappush(self._heap, (ctx.expire_at, key))
+        if len(self._heap) > 2 * len(self._map) + 64:
+            self._heap = [(c.expire_at, k) for k, c in self._map.items()]
+            heapq.heapify(self._heap)
+
+    def _remove(self, key: str) -> None:
+        # its heap entry becomes stale
+        self._map.pop(key, None)
+
+    async def get(self, key: str, default=None) -> Context:
+        ctx = self._lookup(key)
+        return default if ctx is None else ctx
+
+    async def get_history(self, key: str) -> List[ArkMessage]:
+        ctx = self._lookup(key)
+        if ctx is None:
+            return []
+        return ctx.history
+
+    async def get_state(self, key: str) -> int:
+        ctx = self._lookup(key)
+        if ctx is None:
+            return STATE_IDLE
+        return ctx.state
+
+    async def set_state(self, key: str, value: int) -> None:
+        ctx = self._lookup(key)
+        if ctx is None:
+            return
+        ctx.state = value
+
+    async def set(self, key: str, value: Context) -> None:
+        self._ensure_cleanup()
+        self._map[key] = value
+        self._map.move_to_end(key)
+        self._touch(key, value)
+        while len(self._map) > self.max_size:
+            self._map.popitem(last=False)
+            self.metrics["evicted"] += 1
+
+    async def append(self, key: str, value: ArkMessage) -> None:
+        ctx = self._lookup(key)
+        if ctx is None:
+            return
+        ctx.history.append(value)
+        self._touch(key, ctx)
+
+    async def delete(self, key: str):
+        self._remove(key)
+
+    async def contains(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    async def keys(self) -> List[str]:
+        return list(self._map.keys())
+
+    async def items(self) -> List[Any]:
+        return list(self._map.items())
+
+    async def clear(self) -> None:
+        self._map.clear()
+        self._heap.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._map), **self.metrics}
+
+    def _expire(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expire_at, key = heapq.heappop(heap)
+            ctx = self._map.get(key)
+            # skip the stale entries
+            if ctx is not None and ctx.expire_at == expire_at:
+                del self._map[key]
+                self.metrics["expired"] += 1
+
+    async def cleanup(self) -> None:
+        # the ttl is the same for every context, a new one never expires before
+        # the earliest in the heap, so sleeping until that one is enough
         while True:
-            await asyncio.sleep(60)
-            current_time = time.time()
-            async with cls._lock:
-                keys_to_delete = [
-                    key
-                    for key, entry in cls._map.items()
-                    if current_time > entry.expire_at
-                ]
-                for key in keys_to_delete:
-                    del cls._map[key]
+            self._expire(time.time())
+            delay = self._heap[0][0] - time.time() if self._heap else self.ttl
+            # expiries close to each other are handled together
+            await asyncio.sleep(max(delay, _CLEANUP_RESOLUTION_SECONDS))
@@ -0,0 +1,401 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Throughput and latency of the serving stack against the local fake Ark server,
+streaming and not streaming:
+
+llm: BaseChatLanguageModel.astream / arun in the benchmark process.
+context: Context.completions.create in the benchmark process,
+    with --tool-calls the tools are executed through tools/execute.
+bot: BotServer serving a ChatAsyncRunner over BaseChatLanguageModel
+    in a separate process, loaded over HTTP.
+
+Reports requests/s, time to first token, inter-token latency, CPU time per
+request and resident memory per concurrent stream of the measured process
+(the benchmark process, or the bot server for bot). Linux only, CPU and memory
+are read from /proc. The fake Ark server runs in its own process.
+
+    python -m tests.benchmark.ark_stack --scenarios llm context bot \
+        --concurrency 32 --requests 500 --ttft 0.05 --tokens-per-second 200
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import statistics
+import time
+from typing import Any, AsyncIterable, Callable, Dict, List, Union
+
+import httpx
+from fastapi import FastAPI
+from volcenginesdkarkruntime import AsyncArk
+
+from arkitect.core.client.base import get_client_pool
+from arkitect.core.component.bot import BotServer
+from arkitect.core.component.context.context import Context
+from arkitect.core.component.llm import BaseChatLanguageModel
+from arkitect.core.component.llm.model import (
+    ArkChatCompletionChunk,
+    ArkChatRequest,
+    ArkChatResponse,
+    ArkMessage,
+)
+from arkitect.core.component.tool import ToolManifest
+from arkitect.core.component.tool.pool import tool_key
+from arkitect.core.runtime import ChatAsyncRunner
+from tests.mock.ark_server import FakeArkServer
+from tests.mock.bot_app import free_port
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+_PROMPT = "hello " * 200
+
+
+def _cpu_seconds(pid: Union[int, str]) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        # the command name in parentheses may contain spaces
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime and stime, fields 14 and 15 of proc(5)
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+
+
+def _rss_bytes(pid: Union[int, str]) -> int:
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * _PAGE_SIZE
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.completed = 0
+        self.errors = 0
+        self.ttft: List[float] = []
+        self.itl: List[float] = []
+
+    def request(self) -> "_Request":
+        return _Request(self)
+
+
+class _Request:
+    """Timings of a request, the first token of a unary request is the response."""
+
+    def __init__(self, recorder: _Recorder) -> None:
+        self._recorder = recorder
+        self._start = self._last = time.perf_counter()
+
+    def token(self) -> None:
+        now = time.perf_counter()
+        if self._last == self._start:
+            self._recorder.ttft.append(now - self._start)
+        else:
+            self._recorder.itl.append(now - self._last)
+        self._last = now
+
+
+def _start_ark_server(args: argparse.Namespace) -> multiprocessing.Process:
+    server = FakeArkServer(
+        port=free_port(),
+        ttft=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        chunk_tokens=args.chunk_tokens,
+        tool_calls=args.tool_calls,
+        tool_latency=args.tool_latency,
+        error_rate=args.error_rate,
+        seed=0,
+    )
+    process = multiprocessing.get_context("fork").Process(
+        target=server.serve_forever, daemon=True
+    )
+    process.start()
+    _wait_port(server.port)
+    args.ark_url = server.url
+    args.ark_pid = process.pid
+    return process
+
+
+def _wait_port(port: int) -> None:
+    for _ in range(200):
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"port {port} not ready")
+
+
+def _ark_client(url: str) -> AsyncArk:
+    return AsyncArk(base_url=url, api_key="fake", max_retries=0)
+
+
+def _messages() -> List[Dict[str, Any]]:
+    return [{"role": "user", "content": _PROMPT}]
+
+
+"""
+scenarios, one request each
+"""
+
+
+async def _llm_request(
+    args: argparse.Namespace, client: AsyncArk, timing: _Request
+) -> None:
+    llm = BaseChatLanguageModel(
+        endpoint_id="fake-model",
+        messages=[ArkMessage(**m) for m in _messages()],
+        client=client,
+    )
+    if not args.stream:
+        await llm.arun()
+        timing.token()
+        return
+    async for chunk in llm.astream():
+        if chunk.choices and chunk.choices[0].delta.content:
+            timing.token()
+
+
+async def _context_request(
+    args: argparse.Namespace, client: AsyncArk, timing: _Request
+) -> None:
+    tools = {}
+    if args.tool_calls:
+        tools = {
+            tool_key("bench", "echo"): ToolManifest(
+                "bench", "echo", "echo the query", client=client
+            )
+        }
+    ctx = Context(model="fake-model", tools=tools)
+    completion = await ctx.completions.create(_messages(), stream=args.stream)
+    if not args.stream:
+        timing.token()
+        return
+    assert isinstance(completion, AsyncIterable)
+    async for chunk in completion:
+        if chunk.choices and chunk.choices[0].delta.content:
+            timing.token()
+
+
+async def _bot_request(
+    args: argparse.Namespace, client: httpx.AsyncClient, timing: _Request
+) -> None:
+    body = {"model": "fake-model", "stream": args.stream, "messages": _messages()}
+    if not args.stream:
+        response = await client.post("/api/v3/bots/chat/completions", json=body)
+        response.raise_for_status()
+        timing.token()
+        return
+    async with client.stream(
+        "POST", "/api/v3/bots/chat/completions", json=body
+    ) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith("data:") and "[DONE]" not in line:
+                timing.token()
+
+
+def build_bot_app(ark_url: str, stream_flush_interval: float = 0.0) -> FastAPI:
+    async def main(
+        request: ArkChatRequest,
+    ) -> AsyncIterable[Union[ArkChatCompletionChunk, ArkChatResponse]]:
+        llm = BaseChatLanguageModel(
+            endpoint_id=request.model, messages=request.messages
+        )
+        if request.stream:
+            async for resp in llm.astream():
+                yield resp
+        else:
+            yield await llm.arun()
+
+    return BotServer(
+        runner=ChatAsyncRunner(main, stream_flush_interval=stream_flush_interval),  # type: ignore
+        clients={"ark": (AsyncArk, {"base_url": ark_url, "api_key": "fake"})},
+    ).app
+
+
+def _serve_bot(ark_url: str, port: int, stream_flush_interval: float) -> None:
+    BotServer.serve(
+        lambda: build_bot_app(ark_url, stream_flush_interval),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning",
+    )
+
+
+"""
+load
+"""
+
+
+async def _sample_rss(pid: Union[int, str], samples: List[int]) -> None:
+    while True:
+        samples.append(_rss_bytes(pid))
+        await asyncio.sleep(0.05)
+
+
+async def _load(
+    args: argparse.Namespace,
+    request: Callable[[_Request], Any],
+    pid: Union[int, str],
+) -> Dict[str, float]:
+    recorder = _Recorder()
+    remaining = args.requests
+
+    async def user() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            try:
+                await request(recorder.request())
+                recorder.completed += 1
+            except Exception:
+                recorder.errors += 1
+
+    rss_before = _rss_bytes(pid)
+    cpu_before = _cpu_seconds(pid)
+    ark_cpu_before = _cpu_seconds(args.ark_pid)
+    rss_samples: List[int] = []
+    sampler = asyncio.create_task(_sample_rss(pid, rss_samples))
+    start = time.perf_counter()
+    await asyncio.gather(*[user() for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - start
+    sampler.cancel()
+    cpu = _cpu_seconds(pid) - cpu_before
+    ark_cpu = _cpu_seconds(args.ark_pid) - ark_cpu_before
+    requests = recorder.completed + recorder.errors
+    return {
+        "rps": recorder.completed / elapsed,
+        "errors": recorder.errors,
+        "ttft_p50": _percentile(recorder.ttft, 50) * 1000,
+        "ttft_p99": _percentile(recorder.ttft, 99) * 1000,
+        "itl_p50": _percentile(recorder.itl, 50) * 1000,
+        "itl_p99": _percentile(recorder.itl, 99) * 1000,
+        "cpu_ms": cpu / max(requests, 1) * 1000,
+        "mem_kb": max(max(rss_samples, default=0) - rss_before, 0)
+        / args.concurrency
+        / 1024,
+        # close to 100, the fake server is the bottleneck, not the stack
+        "ark_cpu": ark_cpu / elapsed * 100,
+    }
+
+
+async def _run_in_process(
+    args: argparse.Namespace,
+    request: Callable[[argparse.Namespace, AsyncArk, _Request], Any],
+) -> Dict[str, float]:
+    client = _ark_client(args.ark_url)
+    # contexts use the ark client of the pool
+    get_client_pool().clients["ark"] = client  # type: ignore
+    try:
+        # warm up connections and lazy imports outside of the measure
+        warmup = argparse.Namespace(**{**vars(args), "requests": args.concurrency})
+        await _load(warmup, lambda r: request(args, client, r), "self")
+        return await _load(args, lambda r: request(args, client, r), "self")
+    finally:
+        get_client_pool().clients.pop("ark", None)
+        await client.close()
+
+
+async def _run_bot(args: argparse.Namespace) -> Dict[str, float]:
+    port = free_port()
+    # spawned, the server does not inherit the client pool of this process
+    server = multiprocessing.get_context("spawn").Process(
+        target=_serve_bot,
+        args=(args.ark_url, port, args.stream_flush_interval),
+    )
+    server.start()
+    try:
+        _wait_port(port)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            timeout=60,
+            limits=httpx.Limits(max_connections=args.concurrency),
+        ) as client:
+            warmup = argparse.Namespace(**{**vars(args), "requests": args.concurrency})
+            await _load(warmup, lambda r: _bot_request(args, client, r), server.pid)
+            return await _load(
+                args, lambda r: _bot_request(args, client, r), server.pid
+            )
+    finally:
+        server.terminate()
+        server.join()
+
+
+def run(scenario: str, args: argparse.Namespace) -> Dict[str, float]:
+    if scenario == "llm":
+        return asyncio.run(_run_in_process(args, _llm_request))
+    if scenario == "context":
+        return asyncio.run(_run_in_process(args, _context_request))
+    if scenario == "bot":
+        return asyncio.run(_run_bot(args))
+    raise ValueError(f"unknown scenario {scenario}")
+
+
+def main(args: argparse.Namespace) -> None:
+    ark_server = _start_ark_server(args)
+    columns = [
+        ("rps", "req/s"),
+        ("errors", "errors"),
+        ("ttft_p50", "ttft p50 ms"),
+        ("ttft_p99", "ttft p99 ms"),
+        ("itl_p50", "itl p50 ms"),
+        ("itl_p99", "itl p99 ms"),
+        ("cpu_ms", "cpu ms/req"),
+        ("mem_kb", "KB/stream"),
+        ("ark_cpu", "ark cpu %"),
+    ]
+    print(f"{'scenario':>10} {'stream':>7} " + " ".join(f"{t:>12}" for _, t in columns))
+    try:
+        for scenario in args.scenarios:
+            for stream in args.stream_modes:
+                args.stream = stream == "stream"
+                result = run(scenario, args)
+                print(
+                    f"{scenario:>10} {stream:>7} "
+                    + " ".join(f"{result[k]:>12.2f}" for k, _ in columns)
+                )
+    finally:
+        ark_server.terminate()
+        ark_server.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", nargs="+", default=["llm", "context", "bot"])
+    parser.add_argument("--stream-modes", nargs="+", default=["stream", "unary"])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--ttft", type=float, default=0.05, help="seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=200)
+    parser.add_argument("--completion-tokens", type=int, default=64)
+    parser.add_argument("--chunk-tokens", type=int, default=1)
+    parser.add_argument("--tool-calls", type=int, default=0)
+    parser.add_argument("--tool-latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--stream-flush-interval",
+        type=float,
+        default=0.0,
+        help="seconds the bot server may hold stream frames to write them together",
+    )
+    main(parser.parse_args())
@@ -0,0 +1,127 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Load test of BotServer streams, single process against pre-fork workers.
+Each stream does some CPU work per chunk, reports streams per second
+and streams per second per core.
+
+    python -m tests.benchmark.bot_server --workers 1 2 4 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from functools import partial
+from typing import List
+
+import httpx
+
+from arkitect.core.component.bot import BotServer
+from tests.mock.bot_app import build_bot_app, free_port
+
+
+def _serve(port: int, workers: int, chunks: int, cpu_per_chunk: int) -> None:
+    BotServer.serve(
+        partial(build_bot_app, chunks=chunks, cpu_per_chunk=cpu_per_chunk),
+        host="127.0.0.1",
+        port=port,
+        workers_num=workers,
+        log_level="warning",
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient) -> None:
+    for _ in range(200):
+        try:
+            if (await client.get("/healthz")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.05)
+    raise TimeoutError("server not ready")
+
+
+async def _stream(client: httpx.AsyncClient) -> None:
+    async with client.stream(
+        "POST",
+        "/api/v3/bots/chat/completions",
+        json={
+            "model": "fake-model",
+            "stream": True,
+            "messages": [{"role": "user", "content": "hello " * 200}] * 10,
+        },
+    ) as response:
+        async for _ in response.aiter_lines():
+            pass
+
+
+async def _load(port: int, concurrency: int, duration: float) -> int:
+    completed = 0
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}",
+        timeout=60,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+        await _wait_ready(client)
+        deadline = time.monotonic() + duration
+
+        async def user() -> None:
+            nonlocal completed
+            while time.monotonic() < deadline:
+                await _stream(client)
+                completed += 1
+
+        await asyncio.gather(*[user() for _ in range(concurrency)])
+    return completed
+
+
+def run(workers: int, args: argparse.Namespace) -> float:
+    port = free_port()
+    server = multiprocessing.get_context("fork").Process(
+        target=_serve, args=(port, workers, args.chunks, args.cpu_per_chunk)
+    )
+    server.start()
+    try:
+        start = time.monotonic()
+        completed = asyncio.run(_load(port, args.concurrency, args.duration))
+        return completed / (time.monotonic() - start)
+    finally:
+        server.terminate()
+        server.join()
+
+
+def main(args: argparse.Namespace) -> None:
+    cores = os.cpu_count() or 1
+    results: List[str] = []
+    for workers in args.workers:
+        streams_per_second = run(workers, args)
+        results.append(
+            f"{workers:>8} {streams_per_second:>12.1f} "
+            f"{streams_per_second / min(workers, cores):>14.1f}"
+        )
+    print(f"{'workers':>8} {'streams/s':>12} {'streams/s/core':>14}")
+    print("\n".join(results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--chunks", type=int, default=20)
+    parser.add_argument("--cpu-per-chunk", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,106 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cost of merging a streamed response, the previous prepend-per-chunk merge
+against ArkChatCompletionAccumulator, across response sizes.
+
+    python -m tests.benchmark.chunk_merge --sizes 1000 10000 50000
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+import volcenginesdkarkruntime.types.chat.chat_completion_chunk as completion_chunk
+
+from arkitect.core.component.llm.model import (
+    ArkChatCompletionAccumulator,
+    ArkChatCompletionChunk,
+)
+
+
+def _chunks(size: int) -> List[ArkChatCompletionChunk]:
+    return [
+        ArkChatCompletionChunk(
+            id="1",
+            created=0,
+            model="fake-model",
+            object="chat.completion.chunk",
+            choices=[
+                completion_chunk.Choice(
+                    index=0,
+                    delta=completion_chunk.ChoiceDelta(
+                        role="assistant", content="token", reasoning_content="token"
+                    ),
+                )
+            ],
+        )
+        for _ in range(size)
+    ]
+
+
+def legacy_merge(responses: List[ArkChatCompletionChunk]) -> ArkChatCompletionChunk:
+    # the merge loop ArkChatCompletionChunk.merge used before the accumulator
+    merged = ArkChatCompletionChunk(**responses[-1].__dict__)
+    for resp in reversed(responses[:-1]):
+        for i, j in zip(merged.choices, resp.choices):
+            i.delta.content = j.delta.content + i.delta.content
+            i.delta.reasoning_content = (
+                j.delta.reasoning_content + i.delta.reasoning_content
+            )
+    return merged
+
+
+def accumulator_merge(
+    responses: List[ArkChatCompletionChunk],
+) -> ArkChatCompletionChunk:
+    accumulator = ArkChatCompletionAccumulator()
+    for resp in responses:
+        accumulator.add(resp)
+    return accumulator.merged_chunk()
+
+
+def _measure(
+    merge: Callable[[List[ArkChatCompletionChunk]], ArkChatCompletionChunk],
+    size: int,
+    repeat: int,
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        chunks = _chunks(size)
+        start = time.perf_counter()
+        merge(chunks)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"{'chunks':>8} {'legacy':>12} {'accumulator':>12} {'speedup':>8}")
+    for size in args.sizes:
+        legacy = _measure(legacy_merge, size, args.repeat)
+        accumulated = _measure(accumulator_merge, size, args.repeat)
+        print(
+            f"{size:>8} {legacy * 1000:>10.2f}ms {accumulated * 1000:>10.2f}ms "
+            f"{legacy / accumulated:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1000, 5000, 20000, 50000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    main(parser.parse_args())
@@ -0,0 +1,125 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+SSE decoding throughput, the previous line concatenating decoder against
+AsyncSSEDecoder, for small chat chunks up to large JSON events,
+with the stream split in network sized chunks.
+
+    python -m tests.benchmark.sse_decoder --event-sizes 200 10000 1000000
+    python -m tests.benchmark.sse_decoder --line-ending crlf
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import AsyncIterator, Callable, List
+
+from arkitect.core.client import AsyncSSEDecoder
+
+
+class LegacySSEDecoder(object):
+    # the decoder AsyncSSEDecoder replaced
+    def __init__(self, source: AsyncIterator[bytes]) -> None:
+        self.source = source
+
+    async def _read(self) -> AsyncIterator[bytes]:
+        data = b""
+        async for chunk in self.source:
+            for line in chunk.splitlines(True):
+                data += line
+                if data.endswith((b"\r\r", b"\n\n", b"\r\n\r\n")):
+                    yield data
+                    data = b""
+        if data:
+            yield data
+
+    async def next(self) -> AsyncIterator[bytes]:
+        async for chunk in self._read():
+            for line in chunk.splitlines():
+                if line.startswith(b":"):
+                    continue
+                if b":" in line:
+                    field, value = line.split(b":", 1)
+                else:
+                    field, value = line, b""
+                if field == b"data" and len(value) > 0:
+                    yield value
+
+
+_LINE_ENDINGS = {"lf": b"\n", "crlf": b"\r\n", "cr": b"\r"}
+
+
+def _stream(event_size: int, total_size: int, line_ending: bytes) -> bytes:
+    payload = json.dumps({"content": "x" * event_size}).encode()
+    event = b"data: " + payload + line_ending * 2
+    return event * max(1, total_size // len(event))
+
+
+async def _chunks(stream: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for i in range(0, len(stream), chunk_size):
+        yield stream[i : i + chunk_size]
+
+
+async def _decode(
+    decoder_cls: Callable[[AsyncIterator[bytes]], AsyncSSEDecoder],
+    stream: bytes,
+    chunk_size: int,
+) -> int:
+    count = 0
+    async for _ in decoder_cls(_chunks(stream, chunk_size)).next():
+        count += 1
+    return count
+
+
+def _measure(
+    decoder_cls: Callable[[AsyncIterator[bytes]], AsyncSSEDecoder],
+    stream: bytes,
+    chunk_size: int,
+    repeat: int,
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(_decode(decoder_cls, stream, chunk_size))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"{'event':>9} {'legacy MB/s':>12} {'decoder MB/s':>13} {'speedup':>8}")
+    for event_size in args.event_sizes:
+        stream = _stream(event_size, args.total_size, _LINE_ENDINGS[args.line_ending])
+        mb = len(stream) / 1e6
+        results: List[float] = [
+            _measure(cls, stream, args.chunk_size, args.repeat)  # type: ignore
+            for cls in (LegacySSEDecoder, AsyncSSEDecoder)
+        ]
+        print(
+            f"{event_size:>9} {mb / results[0]:>12.1f} {mb / results[1]:>13.1f} "
+            f"{results[0] / results[1]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--event-sizes", type=int, nargs="+", default=[200, 10000, 1000000]
+    )
+    parser.add_argument("--total-size", type=int, default=20_000_000)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--line-ending", choices=list(_LINE_ENDINGS), default="lf")
+    main(parser.parse_args())
@@ -0,0 +1,113 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Framing cost of ChatAsyncRunner streams: the previous str frames built with
+model_dump_json and an f-string, against the bytes frames of astream_bytes,
+with and without coalescing. Tokens arrive every --token-interval seconds,
+reports CPU time per chunk and writes per stream.
+
+    python -m tests.benchmark.sse_framing --streams 200 --chunks 100
+    python -m tests.benchmark.sse_framing --flush-interval 0.02 --token-interval 0.005
+"""
+
+import argparse
+import asyncio
+import time
+from typing import AsyncIterator, Callable
+
+import volcenginesdkarkruntime.types.chat.chat_completion_chunk as completion_chunk
+
+from arkitect.core.component.llm import ArkChatRequest
+from arkitect.core.component.llm.model import ArkChatCompletionChunk
+from arkitect.core.runtime import ChatAsyncRunner
+
+
+def _build_main(
+    chunks: int, token_interval: float
+) -> Callable[[ArkChatRequest], AsyncIterator[ArkChatCompletionChunk]]:
+    async def main(request: ArkChatRequest) -> AsyncIterator[ArkChatCompletionChunk]:
+        for _ in range(chunks):
+            if token_interval:
+                await asyncio.sleep(token_interval)
+            yield ArkChatCompletionChunk(
+                id="chatcmpl-0123456789",
+                created=0,
+                model=request.model,
+                object="chat.completion.chunk",
+                choices=[
+                    completion_chunk.Choice(
+                        index=0,
+                        delta=completion_chunk.ChoiceDelta(
+                            role="assistant", content="你好"
+                        ),
+                    )
+                ],
+            )
+
+    return main
+
+
+async def _legacy_astream(
+    runner: ChatAsyncRunner, request: ArkChatRequest
+) -> AsyncIterator[bytes]:
+    # the framing astream used to do, encoded by the response
+    async for resp in await runner.invoke(request):
+        yield f"data:{resp.model_dump_json(exclude_none=True)}\r\n\r\n".encode()
+    yield "data:[DONE]\r\n\r\n".encode()
+
+
+async def _run(
+    args: argparse.Namespace,
+    stream: Callable[[ChatAsyncRunner, ArkChatRequest], AsyncIterator[bytes]],
+    flush_interval: float,
+) -> str:
+    runner = ChatAsyncRunner(
+        _build_main(args.chunks, args.token_interval),
+        stream_flush_interval=flush_interval,
+    )
+    request = ArkChatRequest(model="fake-model", messages=[], stream=True)
+    writes = 0
+
+    async def one() -> None:
+        nonlocal writes
+        async for _ in stream(runner, request):
+            writes += 1
+
+    cpu = time.process_time()
+    await asyncio.gather(*[one() for _ in range(args.streams)])
+    cpu = time.process_time() - cpu
+    us_per_chunk = cpu / (args.streams * args.chunks) * 1e6
+    return f"{us_per_chunk:>12.1f} {writes / args.streams:>14.1f}"
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"{'framing':>16} {'cpu us/chunk':>12} {'writes/stream':>14}")
+    print(f"{'legacy str':>16} " + asyncio.run(_run(args, _legacy_astream, 0)))
+    print(
+        f"{'bytes':>16} " + asyncio.run(_run(args, lambda r, q: r.astream_bytes(q), 0))
+    )
+    print(
+        f"{'bytes coalesced':>16} "
+        + asyncio.run(_run(args, lambda r, q: r.astream_bytes(q), args.flush_interval))
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, default=200)
+    parser.add_argument("--chunks", type=int, default=100)
+    parser.add_argument("--token-interval", type=float, default=0.0)
+    parser.add_argument("--flush-interval", type=float, default=0.02)
+    main(parser.parse_args())
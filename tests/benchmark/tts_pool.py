@@ -0,0 +1,102 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Time-to-first-audio of AsyncTTSClient with and without TTSConnectionPool
+against the local fake TTS server.
+
+    python -m tests.benchmark.tts_pool --sessions 200 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Optional
+
+from arkitect.core.component.tts import (
+    AsyncTTSClient,
+    AudioParams,
+    ConnectionParams,
+    TTSConnectionPool,
+)
+from tests.mock.tts_server import FakeTTSServer
+
+
+async def _time_to_first_audio(
+    server: FakeTTSServer, pool: Optional[TTSConnectionPool]
+) -> float:
+    client = AsyncTTSClient(
+        access_key="ak",
+        app_key="app",
+        connection_params=ConnectionParams(audio_params=AudioParams()),
+        base_url=server.url,
+        pool=pool,
+    )
+    start = time.perf_counter()
+    ttfa = 0.0
+    async for chunk in client.tts(source="hello world", stream=True):
+        if chunk.audio and not ttfa:
+            ttfa = time.perf_counter() - start
+    return ttfa
+
+
+async def _run(
+    server: FakeTTSServer,
+    pool: Optional[TTSConnectionPool],
+    sessions: int,
+    concurrency: int,
+) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> float:
+        async with semaphore:
+            return await _time_to_first_audio(server, pool)
+
+    return await asyncio.gather(*[one() for _ in range(sessions)])
+
+
+def _report(name: str, samples: List[float], connections: int) -> None:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(
+        f"{name:<10} connections={connections:<6} "
+        f"ttfa p50={statistics.median(samples) * 1000:7.2f}ms "
+        f"p99={p99 * 1000:7.2f}ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with FakeTTSServer(
+        connect_delay=args.connect_delay, first_audio_delay=args.first_audio_delay
+    ) as server:
+        samples = await _run(server, None, args.sessions, args.concurrency)
+        _report("no pool", samples, server.connections_accepted)
+
+    async with FakeTTSServer(
+        connect_delay=args.connect_delay, first_audio_delay=args.first_audio_delay
+    ) as server:
+        pool = TTSConnectionPool(max_connections_per_host=args.concurrency)
+        samples = await _run(server, pool, args.sessions, args.concurrency)
+        _report("pool", samples, server.connections_accepted)
+        await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--connect-delay", type=float, default=0.05)
+    parser.add_argument("--first-audio-delay", type=float, default=0.01)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,301 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local HTTP server emulating the Ark chat completions, context and tool APIs,
+used to test and benchmark the serving stack offline.
+"""
+
+import asyncio
+import json
+import random
+import socket
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+
+class FakeArkServer:
+    """
+    Emulates the Ark API under /api/v3:
+    chat/completions, context/create, context/chat/completions and tools/execute.
+
+    A completion is completion_tokens "token " words, streamed chunk_tokens
+    tokens per chunk. Latencies can be tuned to model the real service:
+
+    :param ttft: seconds before the first chunk, or the response when not streamed.
+    :param tokens_per_second: generation speed after the first chunk,
+        0 streams the chunks as fast as possible.
+    :param tool_calls: number of tool calls emitted when the request has tools
+        and does not end with a tool result. The first tool of the request is called.
+    :param tool_latency: seconds taken by tools/execute.
+    :param error_rate: share of the requests answered with error_status,
+        drawn from a random generator seeded with seed.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ttft: float = 0.0,
+        tokens_per_second: float = 0.0,
+        completion_tokens: int = 16,
+        chunk_tokens: int = 1,
+        tool_calls: int = 0,
+        tool_latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.chunk_tokens = max(1, chunk_tokens)
+        self.tool_calls = tool_calls
+        self.tool_latency = tool_latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+        self.requests = 0
+        self.errors_injected = 0
+        self.contexts_created = 0
+        self.tools_executed = 0
+        # client address of every connection a chat request came in on
+        self.chat_connections: Set[Tuple[str, int]] = set()
+        self._random = random.Random(seed)
+        self._server: Optional[uvicorn.Server] = None
+        self._task: Optional[asyncio.Task] = None
+        self.app = self._build_app()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/v3"
+
+    async def start(self) -> "FakeArkServer":
+        # an IPPROTO_TCP socket, asyncio sets TCP_NODELAY on its connections
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        self._server = uvicorn.Server(
+            uvicorn.Config(self.app, log_level="warning", lifespan="off")
+        )
+        self._task = asyncio.create_task(self._server.serve(sockets=[sock]))
+        while not self._server.started:
+            if self._task.done():
+                self._task.result()
+            await asyncio.sleep(0.01)
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None and self._task is not None:
+            self._server.should_exit = True
+            await self._task
+            self._server = None
+            self._task = None
+
+    async def __aenter__(self) -> "FakeArkServer":
+        return await self.start()
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    def serve_forever(self) -> None:
+        """Blocking serving, e.g. in a separate process of a benchmark."""
+
+        async def serve() -> None:
+            await self.start()
+            assert self._task is not None
+            await self._task
+
+        asyncio.run(serve())
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.post("/api/v3/chat/completions")
+        @app.post("/api/v3/context/chat/completions")
+        async def chat_completions(request: Request) -> Response:
+            if request.client is not None:
+                self.chat_connections.add((request.client.host, request.client.port))
+            return await self._chat(await request.json())
+
+        @app.post("/api/v3/context/create")
+        async def create_context(request: Request) -> Response:
+            body = await request.json()
+            self.contexts_created += 1
+            return JSONResponse(
+                {
+                    "id": f"ctx-{self.contexts_created}",
+                    "model": body.get("model", ""),
+                    "mode": body.get("mode", "session"),
+                    "ttl": body.get("ttl") or 86400,
+                    "truncation_strategy": body.get("truncation_strategy"),
+                    "usage": _usage(body.get("messages") or [], 0),
+                }
+            )
+
+        @app.post("/api/v3/tools/execute")
+        async def execute_tool(request: Request) -> Response:
+            body = await request.json()
+            error = self._inject_error()
+            if error is not None:
+                return error
+            await asyncio.sleep(self.tool_latency)
+            self.tools_executed += 1
+            return JSONResponse({"status_code": 200, "data": body})
+
+        return app
+
+    def _inject_error(self) -> Optional[Response]:
+        self.requests += 1
+        if not self.error_rate or self._random.random() >= self.error_rate:
+            return None
+        self.errors_injected += 1
+        return JSONResponse(
+            status_code=self.error_status,
+            content={
+                "error": {
+                    "code": "InternalServiceError",
+                    "message": "injected by the fake Ark server",
+                    "type": "InternalServiceError",
+                }
+            },
+        )
+
+    async def _chat(self, body: Dict[str, Any]) -> Response:
+        error = self._inject_error()
+        if error is not None:
+            return error
+        messages: List[Dict[str, Any]] = body.get("messages") or []
+        tool_calls: List[Dict[str, Any]] = []
+        tools = body.get("tools")
+        if (
+            tools
+            and self.tool_calls
+            and (not messages or messages[-1].get("role") != "tool")
+        ):
+            name = tools[0]["function"]["name"]
+            tool_calls = [
+                {
+                    "id": f"call_{i}",
+                    "type": "function",
+                    "function": {"name": name, "arguments": '{"query": "token"}'},
+                }
+                for i in range(self.tool_calls)
+            ]
+        if body.get("stream"):
+            include_usage = bool(
+                (body.get("stream_options") or {}).get("include_usage")
+            )
+            return StreamingResponse(
+                self._stream(body, messages, tool_calls, include_usage),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(self.ttft + self._generation_time(self.completion_tokens))
+        completion_tokens = 0 if tool_calls else self.completion_tokens
+        message: Dict[str, Any] = {
+            "role": "assistant",
+            "content": "" if tool_calls else "token " * completion_tokens,
+        }
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        return JSONResponse(
+            {
+                "id": f"chatcmpl-{self.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", ""),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": message,
+                        "finish_reason": "tool_calls" if tool_calls else "stop",
+                    }
+                ],
+                "usage": _usage(messages, completion_tokens),
+            }
+        )
+
+    def _generation_time(self, tokens: int) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return tokens / self.tokens_per_second
+
+    async def _stream(
+        self,
+        body: Dict[str, Any],
+        messages: List[Dict[str, Any]],
+        tool_calls: List[Dict[str, Any]],
+        include_usage: bool,
+    ) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        first_chunk_at = loop.time() + self.ttft
+        base = {
+            "id": f"chatcmpl-{self.requests}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", ""),
+        }
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> bytes:
+            choice = {"index": 0, "delta": delta, "finish_reason": finish_reason}
+            return _event({**base, "choices": [choice]})
+
+        await asyncio.sleep(self.ttft)
+        if tool_calls:
+            for i, tool_call in enumerate(tool_calls):
+                yield chunk(
+                    {"role": "assistant", "tool_calls": [{"index": i, **tool_call}]}
+                )
+            yield chunk({"role": "assistant", "content": ""}, "tool_calls")
+            completion_tokens = 0
+        else:
+            completion_tokens = self.completion_tokens
+            sent = 0
+            while sent < completion_tokens:
+                # scheduled from the first chunk, the sleeps do not drift
+                delay = first_chunk_at + self._generation_time(sent) - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tokens = min(self.chunk_tokens, completion_tokens - sent)
+                sent += tokens
+                yield chunk({"role": "assistant", "content": "token " * tokens})
+            yield chunk({"role": "assistant", "content": ""}, "stop")
+        if include_usage:
+            yield _event(
+                {**base, "choices": [], "usage": _usage(messages, completion_tokens)}
+            )
+        yield b"data: [DONE]\n\n"
+
+
+def _event(data: Dict[str, Any]) -> bytes:
+    return b"data: " + json.dumps(data).encode("utf-8") + b"\n\n"
+
+
+def _usage(messages: List[Dict[str, Any]], completion_tokens: int) -> Dict[str, int]:
+    prompt_tokens = sum(
+        len(m["content"]) // 4 for m in messages if isinstance(m.get("content"), str)
+    )
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
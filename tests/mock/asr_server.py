@@ -0,0 +1,155 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local streaming ASR websocket server speaking arkitect.utils.binary_protocol,
+used to test and benchmark clients offline.
+"""
+
+import asyncio
+import gzip
+import json
+import struct
+from typing import Any, List, Optional
+
+import websockets
+
+from arkitect.utils.binary_protocol import (
+    AUDIO_ONLY_REQUEST,
+    FULL_CLIENT_REQUEST,
+    FULL_SERVER_RESPONSE,
+    GZIP,
+    JSON,
+    NEG_SEQUENCE,
+    NEG_WITH_SEQUENCE,
+    POS_SEQUENCE,
+    generate_header,
+)
+
+
+def encode_server_response(sequence: int, payload: dict, last: bool = False) -> bytes:
+    body = gzip.compress(json.dumps(payload).encode("utf-8"))
+    frame = generate_header(
+        message_type=FULL_SERVER_RESPONSE,
+        message_type_specific_flags=NEG_WITH_SEQUENCE if last else POS_SEQUENCE,
+        serial_method=JSON,
+        compression_type=GZIP,
+    )
+    frame += struct.pack(">iI", -sequence if last else sequence, len(body))
+    frame += body
+    return bytes(frame)
+
+
+class FakeASRServer:
+    """
+    Emulates the streaming ASR service.
+
+    Every audio packet is answered with a result whose text is the utf-8
+    decoded concatenation of all audio received in the session, so tests can
+    send text as audio and check what arrived.
+
+    :param connect_delay: seconds before the full client request is answered,
+        models the session setup cost.
+    :param drop_after: close each of the first drop_connections connections
+        after this many audio packets, to exercise reconnection.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        connect_delay: float = 0.0,
+        drop_after: Optional[int] = None,
+        drop_connections: int = 1,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.connect_delay = connect_delay
+        self.drop_after = drop_after
+        self.drop_connections = drop_connections
+
+        self.connections_accepted = 0
+        self.received_packets: List[bytes] = []
+        self.received_frame_sizes: List[int] = []
+        # compression flag of each audio frame
+        self.received_compression: List[int] = []
+        self._server: Optional[Any] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/api/v3/sauc/bigmodel"
+
+    async def start(self) -> "FakeASRServer":
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeASRServer":
+        return await self.start()
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    async def _handle(self, ws: Any, path: str = "") -> None:
+        self.connections_accepted += 1
+        connection_no = self.connections_accepted
+        sequence = 1
+        packets = 0
+        text = b""
+        try:
+            async for frame in ws:
+                self.received_frame_sizes.append(len(frame))
+                header_size = (frame[0] & 0x0F) * 4
+                message_type = frame[1] >> 4
+                flags = frame[1] & 0x0F
+                compression = frame[2] & 0x0F
+                if message_type == FULL_CLIENT_REQUEST:
+                    await asyncio.sleep(self.connect_delay)
+                    await ws.send(encode_server_response(sequence, {}))
+                    continue
+                if message_type != AUDIO_ONLY_REQUEST:
+                    continue
+                self.received_compression.append(compression)
+                (size,) = struct.unpack_from(">I", frame, header_size)
+                audio = frame[header_size + 4 : header_size + 4 + size]
+                if compression == GZIP:
+                    audio = gzip.decompress(audio)
+                last = bool(flags & NEG_SEQUENCE)
+                if audio:
+                    self.received_packets.append(audio)
+                    packets += 1
+                    text += audio
+                sequence += 1
+                payload = {
+                    "result": {"text": text.decode("utf-8", "ignore")},
+                    "audio_info": {"duration": packets * 100},
+                }
+                await ws.send(encode_server_response(sequence, payload, last=last))
+                if last:
+                    break
+                if (
+                    self.drop_after is not None
+                    and connection_no <= self.drop_connections
+                    and packets >= self.drop_after
+                ):
+                    await ws.close()
+                    break
+        except websockets.ConnectionClosed:
+            pass
@@ -0,0 +1,66 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A bot app streaming canned chunks, with an optional CPU cost per chunk,
+for serving tests and load tests.
+"""
+
+import asyncio
+import json
+import os
+import socket
+from typing import AsyncIterable
+
+import volcenginesdkarkruntime.types.chat.chat_completion_chunk as completion_chunk
+from fastapi import FastAPI
+
+from arkitect.core.component.bot import BotServer
+from arkitect.core.component.llm import ArkChatRequest
+from arkitect.core.component.llm.model import ArkChatCompletionChunk
+from arkitect.core.runtime import ChatAsyncRunner
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def build_bot_app(
+    chunks: int = 10, chunk_interval: float = 0.0, cpu_per_chunk: int = 0
+) -> FastAPI:
+    async def main(request: ArkChatRequest) -> AsyncIterable[ArkChatCompletionChunk]:
+        for _ in range(chunks):
+            if chunk_interval:
+                await asyncio.sleep(chunk_interval)
+            for _ in range(cpu_per_chunk):
+                # simulated serialization work
+                json.loads(json.dumps(request.model_dump()))
+            yield ArkChatCompletionChunk(
+                id=str(os.getpid()),
+                created=0,
+                model=request.model,
+                object="chat.completion.chunk",
+                choices=[
+                    completion_chunk.Choice(
+                        index=0,
+                        delta=completion_chunk.ChoiceDelta(
+                            role="assistant", content="token"
+                        ),
+                    )
+                ],
+            )
+
+    return BotServer(runner=ChatAsyncRunner(main), clients={}).app  # type: ignore
@@ -0,0 +1,219 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local bidirectional TTS websocket server speaking the binary protocol of
+arkitect.core.component.tts, used to test and benchmark clients offline.
+"""
+
+import asyncio
+import json
+import struct
+import uuid
+from typing import Any, Optional
+
+import websockets
+
+from arkitect.core.component.tts.constants import (
+    AUDIO_ONLY_SERVER,
+    FULL_SERVER,
+    HEADER_SIZE,
+    INT_SIZE,
+    JSON,
+    NO_COMPRESSION,
+    NO_SERIALIZATION,
+    PROTOCAL_VERSION,
+    WITH_EVENT,
+    EventConnectionFinished,
+    EventConnectionStarted,
+    EventFinishConnection,
+    EventFinishSession,
+    EventSessionFinished,
+    EventSessionStarted,
+    EventStartConnection,
+    EventStartSession,
+    EventTaskRequest,
+    EventTTSResponse,
+    EventTTSSentenceEnd,
+    EventTTSSentenceStart,
+)
+
+_CONNECTION_EVENTS = (
+    EventStartConnection,
+    EventFinishConnection,
+    EventConnectionStarted,
+    EventConnectionFinished,
+)
+
+
+def encode_server_frame(
+    event: int,
+    identifier: str,
+    payload: bytes,
+    serialization: int = JSON,
+) -> bytes:
+    message_type = (
+        AUDIO_ONLY_SERVER if serialization == NO_SERIALIZATION else FULL_SERVER
+    )
+    frame = bytearray(
+        [
+            PROTOCAL_VERSION << 4 | HEADER_SIZE,
+            message_type << 4 | WITH_EVENT,
+            serialization << 4 | NO_COMPRESSION,
+            0,
+        ]
+    )
+    frame += struct.pack(">i", event)
+    id_bytes = identifier.encode("utf-8")
+    frame += struct.pack(">I", len(id_bytes)) + id_bytes
+    frame += struct.pack(">I", len(payload)) + payload
+    return bytes(frame)
+
+
+def decode_client_frame(frame: bytes) -> tuple:
+    """
+    :return: (event, identifier, payload dict)
+    """
+    ptr = (frame[0] & 0x0F) * 4
+    (event,) = struct.unpack_from(">i", frame, ptr)
+    ptr += INT_SIZE
+    identifier = None
+    if event not in _CONNECTION_EVENTS:
+        (id_len,) = struct.unpack_from(">I", frame, ptr)
+        ptr += INT_SIZE
+        identifier = frame[ptr : ptr + id_len].decode("utf-8")
+        ptr += id_len
+    (payload_len,) = struct.unpack_from(">I", frame, ptr)
+    ptr += INT_SIZE
+    payload = json.loads(frame[ptr : ptr + payload_len] or b"{}")
+    return event, identifier, payload
+
+
+class FakeTTSServer:
+    """
+    Emulates the bidirectional TTS service.
+
+    Each TaskRequest is answered with SentenceStart, audio_chunks audio frames
+    and SentenceEnd. Latencies can be tuned to model the real service:
+
+    :param connect_delay: seconds before ConnectionStarted is sent, models the
+        connection setup cost paid on every new connection.
+    :param session_delay: seconds before SessionStarted is sent.
+    :param first_audio_delay: seconds before the first audio frame of a sentence.
+    :param chunk_interval: seconds between audio frames.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        connect_delay: float = 0.0,
+        session_delay: float = 0.0,
+        first_audio_delay: float = 0.0,
+        chunk_interval: float = 0.0,
+        audio_chunks: int = 2,
+        audio_chunk_size: int = 320,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.connect_delay = connect_delay
+        self.session_delay = session_delay
+        self.first_audio_delay = first_audio_delay
+        self.chunk_interval = chunk_interval
+        self.audio_chunks = audio_chunks
+        self.audio_chunk_size = audio_chunk_size
+
+        self.connections_accepted = 0
+        self.sessions_started = 0
+        self.open_connections = 0
+        self.max_open_connections = 0
+        self._server: Optional[Any] = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/api/v3/tts/bidirection"
+
+    async def start(self) -> "FakeTTSServer":
+        self._server = await websockets.serve(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeTTSServer":
+        return await self.start()
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+    async def _handle(self, ws: Any, path: str = "") -> None:
+        self.connections_accepted += 1
+        self.open_connections += 1
+        self.max_open_connections = max(
+            self.max_open_connections, self.open_connections
+        )
+        connection_id = str(uuid.uuid4())
+        try:
+            async for frame in ws:
+                event, identifier, payload = decode_client_frame(frame)
+                if event == EventStartConnection:
+                    await asyncio.sleep(self.connect_delay)
+                    await ws.send(
+                        encode_server_frame(
+                            EventConnectionStarted, connection_id, b"{}"
+                        )
+                    )
+                elif event == EventStartSession:
+                    self.sessions_started += 1
+                    await asyncio.sleep(self.session_delay)
+                    await ws.send(
+                        encode_server_frame(EventSessionStarted, identifier, b"{}")
+                    )
+                elif event == EventTaskRequest:
+                    text = payload.get("req_params", {}).get("text", "")
+                    await self._synthesize(ws, identifier, text)
+                elif event == EventFinishSession:
+                    await ws.send(
+                        encode_server_frame(EventSessionFinished, identifier, b"{}")
+                    )
+                elif event == EventFinishConnection:
+                    await ws.send(
+                        encode_server_frame(
+                            EventConnectionFinished, connection_id, b"{}"
+                        )
+                    )
+                    break
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.open_connections -= 1
+
+    async def _synthesize(self, ws: Any, session_id: str, text: str) -> None:
+        sentence = json.dumps({"text": text}).encode("utf-8")
+        await ws.send(encode_server_frame(EventTTSSentenceStart, session_id, sentence))
+        await asyncio.sleep(self.first_audio_delay)
+        audio = b"\x00" * self.audio_chunk_size
+        for i in range(self.audio_chunks):
+            if i:
+                await asyncio.sleep(self.chunk_interval)
+            await ws.send(
+                encode_server_frame(
+                    EventTTSResponse, session_id, audio, serialization=NO_SERIALIZATION
+                )
+            )
+        await ws.send(encode_server_frame(EventTTSSentenceEnd, session_id, sentence))
@@ -0,0 +1,91 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from arkitect.core.client import ClientPool, default_sync_ark_client
+from tests.mock.ark_server import FakeArkServer
+
+
+@pytest.fixture(autouse=True)
+def _env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ARK_API_KEY", "env-key")
+
+
+async def test_async_clients_are_shared_per_credentials() -> None:
+    client = ClientPool.get_ark_client()
+    # the credentials of the environment are the default ones
+    assert ClientPool.get_ark_client(api_key="env-key") is client
+    other = ClientPool.get_ark_client(api_key="other-key")
+    assert other is not client
+    assert other.api_key == "other-key"
+    # one connection pool for all the clients of the loop
+    assert other._client is client._client
+
+    await ClientPool.aclose_ark_clients()
+    assert client._client.is_closed
+    assert ClientPool.get_ark_client() is not client
+    await ClientPool.aclose_ark_clients()
+
+
+def test_async_clients_belong_to_their_event_loop() -> None:
+    async def get() -> object:
+        return ClientPool.get_ark_client()
+
+    first, second = asyncio.run(get()), asyncio.run(get())
+    assert first is not second
+    # no loop to bind it to: not pooled
+    assert ClientPool.get_ark_client() is not ClientPool.get_ark_client()
+
+
+async def test_sync_client_uses_the_credentials_of_the_async_one() -> None:
+    client = ClientPool.get_ark_client(
+        base_url="http://127.0.0.1:1/api/v3", api_key="other-key"
+    )
+    sync_client = default_sync_ark_client(client)
+    assert sync_client is default_sync_ark_client(client)
+    assert sync_client.api_key == "other-key"
+    assert str(sync_client._base_url) == "http://127.0.0.1:1/api/v3/"
+    assert default_sync_ark_client() is not sync_client
+
+    await ClientPool.aclose_ark_clients()
+    assert sync_client._client.is_closed
+
+
+def test_sync_clients_are_created_once_with_the_sdk_timeout() -> None:
+    with ThreadPoolExecutor(8) as executor:
+        clients = list(
+            executor.map(lambda _: ClientPool.get_sync_ark_client(), range(32))
+        )
+    assert all(client is clients[0] for client in clients)
+    # long non-streamed completions are not cut by the async pool timeout
+    assert clients[0].timeout.read == 600
+    assert clients[0]._client.timeout.read == 600
+    ClientPool.close_sync_ark_clients()
+    assert clients[0]._client.is_closed
+
+
+async def test_pooled_clients_reuse_connections() -> None:
+    async with FakeArkServer() as server:
+        for api_key in ["env-key", "other-key"] * 4:
+            client = ClientPool.get_ark_client(base_url=server.url, api_key=api_key)
+            await client.chat.completions.create(
+                model="fake-model", messages=[{"role": "user", "content": "hi"}]
+            )
+        assert server.requests == 8
+        assert len(server.chat_connections) == 1
+        await ClientPool.aclose_ark_clients()
@@ -0,0 +1,78 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import AsyncIterator, List
+
+from arkitect.core.client import AsyncSSEDecoder, ServerSentEvent, SSEParser
+
+STREAM = (
+    b": keep-alive comment\n"
+    b"retry: 3000\r\n"
+    b"id: 1\r"
+    b"event: delta\r\n"
+    b'data: {"a":\n'
+    b"data:  1}\r"
+    b"\r\n"
+    b"data\n"
+    b"\n"
+    b"unknown: field\n"
+    b"\n"
+    b"id: 2\n"
+    b"data: [DONE]\r\n\r\n"
+)
+
+
+def _parse(chunks: List[bytes]) -> List[ServerSentEvent]:
+    parser = SSEParser()
+    events = [event for chunk in chunks for event in parser.feed(chunk)]
+    last = parser.flush()
+    return events + ([last] if last else [])
+
+
+def test_parse_spec_fields() -> None:
+    events = _parse([STREAM])
+    assert events == [
+        ServerSentEvent(data=b'{"a":\n 1}', event="delta", id="1", retry=3000),
+        ServerSentEvent(data=b"", id="1", retry=3000),
+        ServerSentEvent(data=b"[DONE]", id="2", retry=3000),
+    ]
+
+
+def test_parse_any_chunk_split() -> None:
+    expected = _parse([STREAM])
+    # byte by byte, including a CR and its LF in separate chunks
+    assert _parse([STREAM[i : i + 1] for i in range(len(STREAM))]) == expected
+    for size in (2, 3, 7, 64):
+        chunks = [STREAM[i : i + size] for i in range(0, len(STREAM), size)]
+        assert _parse(chunks) == expected
+
+
+def test_trailing_event_without_blank_line() -> None:
+    assert _parse([b"data: a\n\ndata: b"]) == [
+        ServerSentEvent(data=b"a"),
+        ServerSentEvent(data=b"b"),
+    ]
+    # the line ending of the last line is not part of its data
+    for end in (b"\r", b"\r\n", b"\n"):
+        assert _parse([b"data: x" + end]) == [ServerSentEvent(data=b"x")]
+        assert _parse([b"data: x", end]) == [ServerSentEvent(data=b"x")]
+
+
+async def test_decoder_next_yields_data() -> None:
+    async def source() -> AsyncIterator[bytes]:
+        yield b"data:[1]\r\n\r\ndata: [2"
+        yield b"]\r\n\r\n"
+
+    decoder = AsyncSSEDecoder(source())
+    assert [data async for data in decoder.next()] == [b"[1]", b"[2]"]
@@ -0,0 +1,146 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterable, List
+
+from arkitect.core.component.asr import (
+    ASRCompression,
+    ASRFullServerResponse,
+    ASRSessionManager,
+    AsyncASRClient,
+)
+from tests.mock.asr_server import FakeASRServer
+
+
+async def _audio(packets: List[bytes], interval: float = 0.02) -> AsyncIterable[bytes]:
+    for packet in packets:
+        await asyncio.sleep(interval)
+        yield packet
+
+
+async def _collect(
+    manager: ASRSessionManager, packets: List[bytes]
+) -> List[ASRFullServerResponse]:
+    return [r async for r in manager.stream_asr(_audio(packets))]
+
+
+def _manager(server: FakeASRServer, prewarm: bool) -> ASRSessionManager:
+    return ASRSessionManager(
+        lambda: AsyncASRClient(access_key="ak", app_key="app", base_url=server.url),
+        prewarm=prewarm,
+        retry_backoff=0.01,
+    )
+
+
+async def test_stream_ends_on_last_package() -> None:
+    async with FakeASRServer() as server:
+        manager = _manager(server, prewarm=False)
+        responses = await _collect(manager, [b"a", b"b", b"c"])
+        assert responses[-1].last_package
+        assert responses[-1].result.text == "abc"
+        await manager.close()
+
+
+async def test_prewarmed_session_is_used_for_next_stream() -> None:
+    async with FakeASRServer(connect_delay=0.05) as server:
+        manager = _manager(server, prewarm=True)
+        await manager.start()
+        await asyncio.sleep(0.1)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        stream = manager.stream_asr(_audio([b"a"], interval=0))
+        first = await stream.__anext__()
+        assert loop.time() - start < 0.05
+        assert first.result.text == "a"
+        await stream.aclose()
+
+        # the session for the next stream is already being connected
+        assert server.connections_accepted == 2
+        await manager.close()
+
+
+async def test_reconnects_after_transport_drop() -> None:
+    async with FakeASRServer(drop_after=2) as server:
+        manager = _manager(server, prewarm=False)
+        responses = await _collect(manager, [b"a", b"b", b"c", b"d"])
+        assert server.connections_accepted == 2
+        assert responses[-1].last_package
+        # the audio sent before the drop is recognized by the new session
+        assert responses[-1].result.text == "abcd"
+        assert b"".join(server.received_packets) == b"ab" + b"abcd"
+        await manager.close()
+
+
+async def test_replayed_audio_is_bounded() -> None:
+    async with FakeASRServer(drop_after=3) as server:
+        manager = _manager(server, prewarm=False)
+        manager.max_replay_bytes = 2
+        responses = await _collect(manager, [b"a", b"b", b"c", b"d"])
+        assert responses[-1].result.text == "bcd"
+        await manager.close()
+
+
+async def test_auto_compression_stops_on_incompressible_audio() -> None:
+    clients: List[AsyncASRClient] = []
+
+    def factory() -> AsyncASRClient:
+        client = AsyncASRClient(
+            access_key="ak", app_key="app", base_url=server.url, probe_packets=2
+        )
+        clients.append(client)
+        return client
+
+    noise = [os.urandom(320) for _ in range(4)]
+    async with FakeASRServer() as server:
+        manager = ASRSessionManager(factory, prewarm=False)
+        await _collect(manager, noise)
+        await manager.close()
+    # gzipped while probing, then sent as is
+    assert server.received_compression == [1, 1, 0, 0, 0]
+    assert b"".join(server.received_packets) == b"".join(noise)
+    stats = clients[0].uplink_stats
+    assert stats.packets == 5
+    assert stats.compressed_packets == 2
+    assert stats.compression_ratio < 1
+    assert stats.compress_seconds_per_packet > 0
+
+
+async def test_compression_modes() -> None:
+    silence = [bytes(3200)] * 3
+    with ThreadPoolExecutor(1) as executor:
+        for compression, flags in [
+            (ASRCompression.GZIP, [1, 1, 1, 1]),
+            (ASRCompression.CONTROL, [0, 0, 0, 0]),
+        ]:
+            async with FakeASRServer() as server:
+                manager = ASRSessionManager(
+                    lambda: AsyncASRClient(
+                        access_key="ak",
+                        app_key="app",
+                        base_url=server.url,
+                        compression=compression,
+                        # every packet is compressed off the loop
+                        offload_bytes=0,
+                        compression_executor=executor,
+                    ),
+                    prewarm=False,
+                )
+                await _collect(manager, silence)
+                await manager.close()
+            assert server.received_compression == flags
+            assert b"".join(server.received_packets) == b"".join(silence)
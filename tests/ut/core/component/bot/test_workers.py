@@ -0,0 +1,79 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import multiprocessing
+import time
+from functools import partial
+
+import httpx
+
+from arkitect.core.component.bot import WorkerManager
+from tests.mock.bot_app import build_bot_app, free_port
+
+
+def _serve(port: int) -> None:
+    WorkerManager(
+        partial(build_bot_app, chunks=10, chunk_interval=0.1),
+        host="127.0.0.1",
+        port=port,
+        workers_num=2,
+        graceful_timeout=5,
+        log_level="warning",
+    ).run()
+
+
+def _wait_ready(base_url: str, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/healthz").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError("server not ready")
+
+
+def test_workers_share_socket_and_drain_on_shutdown() -> None:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    manager = multiprocessing.get_context("fork").Process(target=_serve, args=(port,))
+    manager.start()
+    try:
+        _wait_ready(base_url)
+        with httpx.stream(
+            "POST",
+            f"{base_url}/api/v3/bots/chat/completions",
+            json={
+                "model": "fake-model",
+                "stream": True,
+                "messages": [{"role": "user", "content": "hi"}],
+            },
+            timeout=10,
+        ) as response:
+            lines = response.iter_lines()
+            first = next(line for line in lines if line)
+            # shut down while the stream is in flight, it is drained
+            manager.terminate()
+            rest = [line for line in lines if line]
+        assert json.loads(first[len("data:") :])["choices"][0]["delta"]["content"]
+        assert len(rest) == 10
+        assert rest[-1] == "data:[DONE]"
+
+        manager.join(10)
+        assert manager.exitcode == 0
+    finally:
+        if manager.is_alive():
+            manager.kill()
@@ -0,0 +1,124 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import time
+from typing import AsyncIterator
+
+import pytest
+from volcenginesdkarkruntime import AsyncArk
+
+from arkitect.core.client.base import ClientPool
+from arkitect.core.component.context.context import Context
+from arkitect.core.component.context.tool import _AsyncTool
+from arkitect.core.component.llm.model import ArkContextParameters
+from arkitect.core.component.tool import ToolManifest
+from arkitect.core.component.tool.pool import tool_key
+from tests.mock.ark_server import FakeArkServer
+
+
+@pytest.fixture
+async def server(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[FakeArkServer]:
+    async with FakeArkServer(completion_tokens=5, chunk_tokens=2) as server:
+        # contexts and tools use the ark client of the pool
+        client = AsyncArk(base_url=server.url, api_key="fake", max_retries=0)
+        monkeypatch.setitem(ClientPool.clients, "ark", client)
+        yield server
+
+
+async def test_stream_runs_tool_calls_until_answer(server: FakeArkServer) -> None:
+    server.tool_calls = 2
+    tool = ToolManifest("bench", "echo", "echo the query")
+    ctx = Context(model="fake-model", tools={tool_key("bench", "echo"): tool})
+
+    content = ""
+    async for chunk in await ctx.completions.create(
+        [{"role": "user", "content": "hello"}]
+    ):
+        if chunk.choices and chunk.choices[0].delta.content:
+            content += chunk.choices[0].delta.content
+
+    assert content == "token " * 5
+    assert server.tools_executed == 2
+    assert [m["role"] for m in ctx.state.messages] == [
+        "user",
+        "assistant",
+        "tool",
+        "tool",
+        "assistant",
+    ]
+
+
+async def test_tool_calls_run_concurrently_in_order(
+    server: FakeArkServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    server.tool_calls = 3
+    server.tool_latency = 0.2
+    schemas = 0
+    tool_schema = _AsyncTool.tool_schema
+
+    def counted_tool_schema(self: _AsyncTool) -> object:
+        nonlocal schemas
+        schemas += 1
+        return tool_schema(self)
+
+    monkeypatch.setattr(_AsyncTool, "tool_schema", counted_tool_schema)
+    tool = ToolManifest("bench", "echo", "echo the query")
+    ctx = Context(model="fake-model", tools={tool_key("bench", "echo"): tool})
+
+    start = time.monotonic()
+    await ctx.completions.create([{"role": "user", "content": "hello"}], stream=False)
+    assert time.monotonic() - start < 0.5
+    assert server.tools_executed == 3
+    assert [m.get("tool_call_id") for m in ctx.state.messages[2:5]] == [
+        "call_0",
+        "call_1",
+        "call_2",
+    ]
+    # two model calls, one schema
+    assert schemas == 1
+
+
+async def test_tool_call_timeout(server: FakeArkServer) -> None:
+    server.tool_calls = 2
+    server.tool_latency = 1
+    tool = ToolManifest("bench", "echo", "echo the query")
+    ctx = Context(
+        model="fake-model",
+        tools={tool_key("bench", "echo"): tool},
+        tool_timeout=0.05,
+    )
+
+    await ctx.completions.create([{"role": "user", "content": "hello"}], stream=False)
+    tool_messages = [m for m in ctx.state.messages if m["role"] == "tool"]
+    assert len(tool_messages) == 2
+    assert all(json.loads(m["content"])["status_code"] == 504 for m in tool_messages)
+    # reported like the timeouts of handle_function_call
+    assert all(
+        json.loads(m["content"])["data"]
+        == f"Function {tool_key('bench', 'echo')} timed out"
+        for m in tool_messages
+    )
+    assert ctx.state.messages[-1]["content"] == "token " * 5
+
+
+async def test_context_api(server: FakeArkServer) -> None:
+    async with Context(
+        model="fake-model", context_parameters=ArkContextParameters(messages=[])
+    ) as ctx:
+        completion = await ctx.completions.create(
+            [{"role": "user", "content": "hello"}], stream=False
+        )
+    assert ctx.state.context_id == "ctx-1"
+    assert completion.choices[0].message.content == "token " * 5
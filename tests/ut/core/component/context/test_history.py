@@ -0,0 +1,133 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict, List, Optional
+
+from arkitect.core.component.context.history import (
+    SlidingWindowPolicy,
+    SummarizingPolicy,
+    estimate_message_tokens,
+    estimate_tokens,
+)
+from arkitect.core.component.context.model import State
+
+
+def _message(role: str, content: str = "x" * 36, **kwargs: Any) -> Dict[str, Any]:
+    return {"role": role, "content": content, **kwargs}
+
+
+class CountingEstimator:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, message: Any) -> int:
+        self.calls += 1
+        return 10
+
+
+def test_estimate_tokens() -> None:
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("你好世界") == 4
+    assert estimate_tokens("你好 world") == 2 + 2
+
+
+async def test_sliding_window_is_incremental_and_pins_system() -> None:
+    estimator = CountingEstimator()
+    policy = SlidingWindowPolicy(max_tokens=45, estimator=estimator)
+    state = State(model="fake-model")
+
+    sent = await policy(state, [_message("system", "sys")])
+    for i in range(20):
+        sent = await policy(state, [_message("user", str(i))])
+        state.messages.append(_message("assistant", str(i)))
+
+    # system + the most recent 3 messages
+    assert [m["content"] for m in sent] == ["sys", "18", "18", "19"]
+    # each message is estimated once
+    assert estimator.calls == 40
+    assert len(state.messages) == 41
+
+
+async def test_tool_results_stay_with_their_tool_call() -> None:
+    policy = SlidingWindowPolicy(max_tokens=30, estimator=lambda m: 10)
+    state = State(model="fake-model")
+    tool_calls = [{"id": "1", "function": {"name": "f", "arguments": "{}"}}]
+
+    await policy(state, [_message("user", "q")])
+    state.messages.append(_message("assistant", "", tool_calls=tool_calls))
+    state.messages.append(_message("tool", "r1", tool_call_id="1"))
+    state.messages.append(_message("tool", "r2", tool_call_id="1"))
+    sent = await policy(state, [])
+    # the tool call group does not fit with the question, it is sent alone
+    assert [m["role"] for m in sent] == ["assistant", "tool", "tool"]
+
+
+async def test_summarizing_policy_only_summarizes_dropped_messages() -> None:
+    summarized: List[List[str]] = []
+
+    async def summarizer(summary: Optional[str], messages: List[Any]) -> str:
+        summarized.append([m["content"] for m in messages])
+        return (summary or "") + "".join(m["content"] for m in messages)
+
+    policy = SummarizingPolicy(
+        max_tokens=40, summarizer=summarizer, estimator=lambda m: 10
+    )
+    state = State(model="fake-model")
+    for i in range(5):
+        sent = await policy(state, [_message("user", str(i))])
+
+    # 10 tokens are kept for the summary
+    assert summarized == [["0"], ["1"]]
+    assert sent[0]["role"] == "system"
+    assert sent[0]["content"].endswith("01")
+    assert [m["content"] for m in sent[1:]] == ["2", "3", "4"]
+
+
+async def test_summary_is_cut_to_its_budget() -> None:
+    async def summarizer(summary: Optional[str], messages: List[Any]) -> str:
+        return "y" * 400
+
+    policy = SummarizingPolicy(max_tokens=200, summarizer=summarizer)
+    state = State(model="fake-model")
+    for i in range(20):
+        sent = await policy(state, [_message("user")])
+
+    assert sent[0]["role"] == "system"
+    assert estimate_message_tokens(sent[0]) <= policy.summary_max_tokens
+    assert sum(estimate_message_tokens(m) for m in sent) <= policy.max_tokens
+
+
+async def test_messages_are_summarized_again_after_a_failure() -> None:
+    summarized: List[List[str]] = []
+
+    async def summarizer(summary: Optional[str], messages: List[Any]) -> str:
+        summarized.append([m["content"] for m in messages])
+        if len(summarized) == 2:
+            raise RuntimeError("summary endpoint is down")
+        return (summary or "") + "".join(m["content"] for m in messages)
+
+    policy = SummarizingPolicy(
+        max_tokens=40, summarizer=summarizer, estimator=lambda m: 10
+    )
+    state = State(model="fake-model")
+    sent: List[Any] = []
+    for i in range(6):
+        sent = await policy(state, [_message("user", str(i))])
+        if len(summarized) == 2:
+            # the previous summary is still sent
+            assert sent[0]["content"].endswith("0")
+
+    assert summarized == [["0"], ["1"], ["1", "2"]]
+    assert sent[0]["content"].endswith("012")
@@ -0,0 +1,107 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List, Optional
+
+import volcenginesdkarkruntime.types.chat.chat_completion_chunk as completion_chunk
+from volcenginesdkarkruntime.types.completion_usage import CompletionUsage
+
+from arkitect.core.component.llm.model import (
+    ActionUsage,
+    ArkChatCompletionAccumulator,
+    ArkChatCompletionChunk,
+    BotUsage,
+)
+
+
+def _chunk(
+    content: Optional[str] = None,
+    reasoning_content: Optional[str] = None,
+    tool_calls: Optional[List[completion_chunk.ChoiceDeltaToolCall]] = None,
+    finish_reason: Optional[str] = None,
+    usage: Optional[CompletionUsage] = None,
+    bot_usage: Optional[BotUsage] = None,
+) -> ArkChatCompletionChunk:
+    return ArkChatCompletionChunk(
+        id="1",
+        created=0,
+        model="fake-model",
+        object="chat.completion.chunk",
+        choices=[
+            completion_chunk.Choice(
+                index=0,
+                finish_reason=finish_reason,
+                delta=completion_chunk.ChoiceDelta(
+                    role="assistant",
+                    content=content,
+                    reasoning_content=reasoning_content,
+                    tool_calls=tool_calls,
+                ),
+            )
+        ],
+        usage=usage,
+        bot_usage=bot_usage,
+    )
+
+
+def _tool_call(
+    index: int, arguments: str, name: Optional[str] = None
+) -> completion_chunk.ChoiceDeltaToolCall:
+    return completion_chunk.ChoiceDeltaToolCall(
+        index=index,
+        id=f"call_{index}" if name else None,
+        type="function" if name else None,
+        function=completion_chunk.ChoiceDeltaToolCallFunction(
+            name=name, arguments=arguments
+        ),
+    )
+
+
+def test_merge_content_and_usage() -> None:
+    chunks = [
+        _chunk(reasoning_content="think ", content=""),
+        _chunk(reasoning_content="hard", content="Hello"),
+        _chunk(content=", world", finish_reason="stop"),
+        _chunk(
+            content="",
+            usage=CompletionUsage(prompt_tokens=1, completion_tokens=2, total_tokens=3),
+            bot_usage=BotUsage(action_usage=[ActionUsage(action_name="a", count=1)]),
+        ),
+    ]
+    merged = ArkChatCompletionChunk.merge(chunks)
+    assert merged.choices[0].delta.content == "Hello, world"
+    assert merged.choices[0].delta.reasoning_content == "think hard"
+    assert merged.usage.total_tokens == 3
+    assert merged.bot_usage.action_usage[0].action_name == "a"
+    # inputs are left untouched
+    assert chunks[-1].choices[0].delta.content == ""
+
+
+def test_merge_tool_calls_by_index() -> None:
+    accumulator = ArkChatCompletionAccumulator()
+    for chunk in [
+        _chunk(tool_calls=[_tool_call(0, '{"a"', name="x/y")]),
+        _chunk(tool_calls=[_tool_call(1, '{"b": 2}', name="x/z")]),
+        _chunk(tool_calls=[_tool_call(0, ": 1}")], finish_reason="tool_calls"),
+    ]:
+        accumulator.add(chunk)
+
+    tool_calls = accumulator.tool_calls()
+    assert [tc.function.arguments for tc in tool_calls] == ['{"a": 1}', '{"b": 2}']
+    assert [tc.function.name for tc in tool_calls] == ["x/y", "x/z"]
+
+    response = accumulator.merged_response()
+    assert response.choices[0].finish_reason == "tool_calls"
+    assert response.choices[0].message.tool_calls[0].id == "call_0"
+    assert response.choices[0].message.content is None
@@ -14,8 +14,11 @@
 
 import os
 
+from volcenginesdkarkruntime import AsyncArk
+
 from arkitect.core.component.llm import BaseChatLanguageModel
 from arkitect.core.component.llm.model import ArkMessage
+from tests.mock.ark_server import FakeArkServer
 
 os.environ["ARK_API_KEY"] = "-"
 
@@ -76,3 +79,22 @@ def test_generate_prompts_with_formatting() -> None:
     assert len(result) == len(messages) + len(additional_prompts)
     assert all(msg.role == "system" for msg in result[: len(additional_prompts) + 1])
     assert all(msg.role != "system" for msg in result[len(additional_prompts) + 1 :])
+
+
+async def test_astream_left_early_frees_its_connection() -> None:
+    async with FakeArkServer(completion_tokens=20, tokens_per_second=20) as server:
+        client = AsyncArk(base_url=server.url, api_key="fake", max_retries=0)
+        llm = BaseChatLanguageModel(
+            endpoint_id="123",
+            messages=[ArkMessage(role="user", content="Hello")],
+            client=client,
+        )
+        stream = llm.astream()
+        async for _ in stream:
+            break
+        # e.g. the reply of an interrupted voice turn
+        await stream.aclose()
+        # the connection is not left busy with the rest of the reply
+        pool = client._client._transport._pool
+        assert not [c for c in pool.connections if not c.is_idle()]
+        await client.close()
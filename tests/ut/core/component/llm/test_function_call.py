@@ -0,0 +1,132 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from volcenginesdkarkruntime.types.chat.chat_completion import (
+    ChatCompletionMessage,
+    Choice,
+)
+from volcenginesdkarkruntime.types.chat.chat_completion_message_tool_call import (
+    ChatCompletionMessageToolCall,
+    Function,
+)
+
+from arkitect.core.component.llm.function_call import handle_function_call
+from arkitect.core.component.llm.model import (
+    ArkChatRequest,
+    ArkChatResponse,
+    ArkMessage,
+    FunctionCallMode,
+)
+from arkitect.core.component.tool import ArkToolResponse, ToolManifest
+
+os.environ["ARK_API_KEY"] = "-"
+
+
+class SleepTool(ToolManifest):
+    running: int = 0
+    max_running: int = 0
+
+    async def executor(
+        self, parameters: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> ArkToolResponse:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(parameters["seconds"])
+        finally:
+            self.running -= 1
+        return ArkToolResponse(data=parameters["seconds"])
+
+
+def _response(delays: List[float]) -> ArkChatResponse:
+    tool_calls = [
+        ChatCompletionMessageToolCall(
+            id=f"call_{i}",
+            type="function",
+            function=Function(
+                name="sleep/sleep", arguments=json.dumps({"seconds": delay})
+            ),
+        )
+        for i, delay in enumerate(delays)
+    ]
+    return ArkChatResponse(
+        id="1",
+        created=0,
+        model="fake-model",
+        object="chat.completion",
+        choices=[
+            Choice(
+                index=0,
+                finish_reason="tool_calls",
+                message=ChatCompletionMessage(
+                    role="assistant", content="", tool_calls=tool_calls
+                ),
+            )
+        ],
+    )
+
+
+def _request() -> ArkChatRequest:
+    return ArkChatRequest(
+        model="fake-model", messages=[ArkMessage(role="user", content="hi")]
+    )
+
+
+async def test_parallel_function_call_keeps_order() -> None:
+    tool = SleepTool(action_name="sleep", tool_name="sleep", description="")
+    request = _request()
+    start = time.perf_counter()
+    assert await handle_function_call(
+        request,
+        _response([0.1, 0.05, 0.01]),
+        {tool.name: tool},
+        FunctionCallMode.PARALLEL,
+    )
+    assert time.perf_counter() - start < 0.15
+    tool_messages = request.messages[2:]
+    assert [m.tool_call_id for m in tool_messages] == ["call_0", "call_1", "call_2"]
+    assert [m.content for m in tool_messages] == ["0.1", "0.05", "0.01"]
+
+
+async def test_parallel_function_call_concurrency_limit() -> None:
+    tool = SleepTool(action_name="sleep", tool_name="sleep", description="")
+    await handle_function_call(
+        _request(),
+        _response([0.01] * 6),
+        {tool.name: tool},
+        FunctionCallMode.PARALLEL,
+        max_concurrency=2,
+    )
+    assert tool.max_running == 2
+
+
+async def test_function_call_timeout() -> None:
+    tool = SleepTool(action_name="sleep", tool_name="sleep", description="")
+    request = _request()
+    await handle_function_call(
+        request,
+        _response([10, 0.01]),
+        {tool.name: tool},
+        FunctionCallMode.PARALLEL,
+        tool_timeout=0.05,
+    )
+    assert request.messages[2].content == f"Function {tool.name} timed out"
+    assert request.messages[3].content == "0.01"
+    assert tool.running == 0
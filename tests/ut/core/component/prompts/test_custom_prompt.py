@@ -0,0 +1,114 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from datetime import datetime
+from pathlib import Path
+
+import jinja2
+from langchain.schema.messages import AIMessage, HumanMessage
+
+from arkitect.core.component.llm.model import (
+    ArkMessage,
+    ChatCompletionMessageToolCallParam,
+    Function,
+)
+from arkitect.core.component.llm.utils import (
+    _convert_ark_messages,
+    format_ark_prompts,
+)
+from arkitect.core.component.prompts import CustomPromptTemplate
+from arkitect.core.component.prompts.custom_prompt import (
+    _BoundedBytecodeCache,
+    _TemplateSourceLoader,
+)
+
+TEMPLATE = "{{time_info|datetime_format}} {{chat_history}}\n{{query}}"
+
+
+def test_template_compiled_once() -> None:
+    first = CustomPromptTemplate(template=TEMPLATE)
+    second = CustomPromptTemplate(template=TEMPLATE)
+    assert first.template is second.template
+
+    messages = first.format_messages(
+        messages=[HumanMessage(content="q")],
+        time_info=datetime(2025, 1, 6, 8),
+    )
+    assert messages[0].content == "2025年01月06日08时星期一 无\nq"
+
+
+def test_template_caches_are_bounded(tmp_path: Path) -> None:
+    loader = _TemplateSourceLoader(max_size=2)
+    environment = jinja2.Environment(
+        loader=loader,
+        cache_size=2,
+        bytecode_cache=_BoundedBytecodeCache(str(tmp_path), max_files=2),
+    )
+    for i in range(5):
+        loader.register(f"t{i}", f"{{{{ x }}}} {i}")
+        assert environment.get_template(f"t{i}").render(x="a") == f"a {i}"
+    assert list(loader.sources) == ["t3", "t4"]
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_chat_history_trimmed_from_the_oldest() -> None:
+    template = CustomPromptTemplate(
+        template="{{chat_history}}",
+        chat_history_keep_human=True,
+        chat_history_keep_ai=True,
+        chat_history_len_limit=6,
+    )
+    history = [
+        HumanMessage(content="aaa"),
+        AIMessage(content="bbb"),
+        HumanMessage(content="ccc"),
+        AIMessage(content="ddd"),
+        HumanMessage(content="query"),
+    ]
+    (message,) = template.format_messages(messages=history)
+    assert message.content == "User: ccc\nAssistant: ddd"
+
+
+def test_converted_messages_are_not_shared() -> None:
+    chat_messages = [
+        ArkMessage(role="system", content="sys"),
+        ArkMessage(role="user", content="weather?"),
+        ArkMessage(
+            role="assistant",
+            content="",
+            tool_calls=[
+                ChatCompletionMessageToolCallParam(
+                    id="1",
+                    type="function",
+                    function=Function(name="weather", arguments='{"city": "bj"}'),
+                )
+            ],
+        ),
+        ArkMessage(role="tool", content="sunny", tool_call_id="1"),
+    ]
+    first = _convert_ark_messages(chat_messages)
+    second = _convert_ark_messages(
+        [ArkMessage(**m.model_dump()) for m in chat_messages]
+    )
+    # each request gets its own messages, they may be changed by the template
+    assert first == second
+    assert not any(a is b for a, b in zip(first, second))
+    assert first[2].tool_calls[0]["args"] == {"city": "bj"}
+    assert first[3].name == "weather"
+
+    prompts = format_ark_prompts(
+        CustomPromptTemplate(template="{{query}}"), chat_messages[:2]
+    )
+    assert prompts == [ArkMessage(role="user", content="weather?")]
@@ -0,0 +1,86 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+from typing import AsyncIterable, List, Union
+
+from pydantic_core import to_json
+
+from arkitect.core.component.llm import ArkChatRequest
+from arkitect.core.component.llm.model import ArkChatCompletionChunk, ArkChatResponse
+from arkitect.core.component.tts import create_bot_audio_responses
+from arkitect.core.component.tts.base import TTSResponseChunk
+from arkitect.core.runtime import sse_frame
+
+
+async def _tts() -> AsyncIterable[TTSResponseChunk]:
+    yield TTSResponseChunk(audio=b"abcd")
+    yield TTSResponseChunk(transcript='你好 "bot"')
+    yield TTSResponseChunk(audio=b"ef", transcript="!")
+    yield TTSResponseChunk(audio=b"g")
+
+
+async def _responses(
+    stream: bool, align_audio: bool = False
+) -> List[Union[ArkChatCompletionChunk, ArkChatResponse]]:
+    request = ArkChatRequest(model="fake-model", messages=[], stream=stream)
+    return [r async for r in create_bot_audio_responses(_tts(), request, align_audio)]
+
+
+async def test_audio_chunks_render_like_the_serializer() -> None:
+    chunks = await _responses(stream=True)
+    frames = [sse_frame(chunk, exclude_unset=True) for chunk in chunks]
+    assert all(isinstance(chunk, ArkChatCompletionChunk) for chunk in chunks)
+    audio = [c.choices[0].delta.audio for c in chunks[1:-1]]
+    audio_id = audio[0]["id"]
+    assert audio_id.startswith("audio_")
+    assert audio == [
+        {"id": audio_id, "data": "YWJjZA=="},
+        {"id": audio_id, "transcript": '你好 "bot"'},
+        {"data": "ZWY=", "transcript": "!"},
+        {"data": "Zw=="},
+    ]
+    # the models hold the fields, whatever serializes them
+    assert frames == [
+        b"data:"
+        + chunk.__pydantic_serializer__.to_json(
+            chunk, exclude_unset=True, exclude_none=True
+        )
+        + b"\r\n\r\n"
+        for chunk in chunks
+    ]
+    assert b'"data":"YWJjZA=="' in to_json(chunks[1])
+
+
+async def test_changed_audio_chunks_are_rendered_again() -> None:
+    chunks = await _responses(stream=True)
+    chunks[1].choices[0].delta.audio["data"] = "Zm9v"
+    chunks[2].id = "other"
+    assert b'"data":"Zm9v"' in sse_frame(chunks[1])
+    assert b'"id":"other"' in sse_frame(chunks[2])
+
+
+async def test_aligned_audio_concatenates() -> None:
+    chunks = await _responses(stream=True, align_audio=True)
+    data = [c.choices[0].delta.audio.get("data", "") for c in chunks[1:-1]]
+    # only the last piece is padded
+    assert data == ["YWJj", "", "ZGVm", "Zw=="]
+    assert base64.b64decode("".join(data)) == b"abcdefg"
+
+
+async def test_non_stream_response() -> None:
+    (response,) = await _responses(stream=False)
+    audio = response.choices[0].message.audio
+    assert base64.b64decode(audio.data) == b"abcdefg"
+    assert audio.transcript == '你好 "bot"!'
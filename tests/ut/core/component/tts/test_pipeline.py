@@ -0,0 +1,201 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import time
+from typing import AsyncIterable, AsyncIterator, List
+
+import pytest
+
+from arkitect.core.component.tts import (
+    AsyncTTSClient,
+    AudioParams,
+    ConnectionParams,
+    TextSegmenter,
+    TTSPipeline,
+)
+from arkitect.core.component.tts.base import TTSResponseChunk
+from tests.mock.tts_server import FakeTTSServer
+
+
+def _segment(segmenter: TextSegmenter, tokens: List[str]) -> List[str]:
+    segments = []
+    for token in tokens:
+        segments += segmenter.feed(token)
+    return segments + segmenter.flush()
+
+
+def _client(server: FakeTTSServer) -> AsyncTTSClient:
+    return AsyncTTSClient(
+        access_key="ak",
+        app_key="app",
+        connection_params=ConnectionParams(audio_params=AudioParams()),
+        base_url=server.url,
+    )
+
+
+def test_segmenter_splits_on_sentences_and_clauses() -> None:
+    segmenter = TextSegmenter(min_chars=8, first_min_chars=2)
+    assert _segment(segmenter, list("好的，今天北京晴，气温二十五度。要带伞吗？")) == [
+        "好的，",
+        "今天北京晴，气温二十五度。",
+        "要带伞吗？",
+    ]
+    # numbers, decimals and quotes stay in one piece
+    tokens = ["It costs 3", ".", "14 dollars, or 1,000 yen", '. "Really?!" ', "Yes"]
+    assert _segment(segmenter, tokens) == [
+        "It costs 3.14 dollars,",
+        "or 1,000 yen.",
+        '"Really?!"',
+        "Yes",
+    ]
+
+
+def test_segmenter_does_not_depend_on_chunking() -> None:
+    text = "这是一个很长很长很长的句子。好，我们走吧今天天气"
+    expected = ["这是一个很长很长很长的句子。", "好，我们走吧今天天气"]
+    # the short clause is held whether it arrives with the sentence or after it
+    assert _segment(TextSegmenter(), [text]) == expected
+    assert _segment(TextSegmenter(), [text[:14], text[14:]]) == expected
+
+
+def test_segmenter_cuts_long_text() -> None:
+    segmenter = TextSegmenter(max_chars=12)
+    assert _segment(segmenter, ["one two three four five six"]) == [
+        "one two",
+        "three four",
+        "five six",
+    ]
+    assert _segment(segmenter, ["一二三四五六七八九十一二三四五"]) == [
+        "一二三四五六七八九十一二",
+        "三四五",
+    ]
+
+
+async def test_pipeline_speaks_while_the_reply_is_generated() -> None:
+    started: List[float] = []
+
+    async def reply() -> AsyncIterator[str]:
+        started.append(time.monotonic())
+        for token in ["你好", "！", "我是", "语音助手", "。"]:
+            yield token
+        await asyncio.sleep(0.3)
+        yield "再见。"
+
+    async with FakeTTSServer(connect_delay=0.1, audio_chunks=2) as server:
+        pipeline = TTSPipeline(_client(server))
+        start = time.monotonic()
+        transcripts = []
+        async for chunk in pipeline.speak(reply()):
+            if chunk.transcript:
+                transcripts.append(chunk.transcript)
+
+    # the reply is read while the TTS connection is set up
+    assert started[0] - start < 0.1
+    assert transcripts == ["你好！", "我是语音助手。", "再见。"]
+    # the first sentence is spoken before the reply ends
+    assert pipeline.first_audio_latency is not None
+    assert 0.1 <= pipeline.first_audio_latency < 0.3
+
+
+async def test_pipeline_cancel_stops_reply_and_audio() -> None:
+    closed = asyncio.Event()
+
+    async def reply() -> AsyncIterator[str]:
+        try:
+            while True:
+                yield "这是一句很长的回答。"
+                await asyncio.sleep(0.01)
+        finally:
+            closed.set()
+
+    async with FakeTTSServer(chunk_interval=0.01, audio_chunks=5) as server:
+        pipeline = TTSPipeline(_client(server), max_pending_segments=1)
+        audio_chunks = 0
+        async for chunk in pipeline.speak(reply()):
+            if chunk.audio:
+                audio_chunks += 1
+                if audio_chunks == 2:
+                    pipeline.cancel()
+        assert audio_chunks == 2
+        assert closed.is_set()
+
+
+async def test_pipeline_cancel_drops_the_unfinished_sentence() -> None:
+    async def interrupted() -> AsyncIterator[str]:
+        yield "这是第一句话。然后这是一段没有说完的"
+        await asyncio.sleep(10)
+
+    async def reply() -> AsyncIterator[str]:
+        yield "新的回答。"
+
+    async with FakeTTSServer() as server:
+        pipeline = TTSPipeline(_client(server))
+        async for chunk in pipeline.speak(interrupted()):
+            if chunk.audio:
+                pipeline.cancel()
+        transcripts = [
+            chunk.transcript
+            async for chunk in pipeline.speak(reply())
+            if chunk.transcript
+        ]
+    assert transcripts == ["新的回答。"]
+
+
+class _ShortTTSClient:
+    """Speaks the first segment only, like a TTS session failing midway."""
+
+    async def tts(
+        self, source: AsyncIterator[str], stream: bool = True, **kwargs: object
+    ) -> AsyncIterator[TTSResponseChunk]:
+        async for segment in source:
+            yield TTSResponseChunk(audio=b"a", transcript=segment)
+            return
+
+
+async def test_pipeline_ends_when_tts_ends_early() -> None:
+    closed = asyncio.Event()
+
+    async def reply() -> AsyncIterator[str]:
+        try:
+            for i in range(20):
+                yield f"第{i}句话。"
+        finally:
+            closed.set()
+
+    pipeline = TTSPipeline(_ShortTTSClient(), max_pending_segments=1)  # type: ignore
+    chunks = await asyncio.wait_for(_collect(pipeline.speak(reply())), 1)
+    assert [chunk.transcript for chunk in chunks] == ["第0句话。"]
+    assert closed.is_set()
+
+
+async def test_pipeline_raises_reply_errors_after_its_audio() -> None:
+    async def reply() -> AsyncIterator[str]:
+        yield "你好。"
+        raise ValueError("reply failed")
+
+    async with FakeTTSServer() as server:
+        pipeline = TTSPipeline(_client(server))
+        transcripts = []
+        with pytest.raises(ValueError):
+            async for chunk in pipeline.speak(reply()):
+                if chunk.transcript:
+                    transcripts.append(chunk.transcript)
+    assert transcripts == ["你好。"]
+
+
+async def _collect(
+    stream: AsyncIterable[TTSResponseChunk],
+) -> List[TTSResponseChunk]:
+    return [chunk async for chunk in stream]
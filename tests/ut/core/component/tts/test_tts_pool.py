@@ -0,0 +1,94 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+from arkitect.core.component.tts import (
+    AsyncTTSClient,
+    AudioParams,
+    ConnectionParams,
+    TTSConnectionPool,
+)
+from tests.mock.tts_server import FakeTTSServer
+
+
+def _client(server: FakeTTSServer, pool: TTSConnectionPool) -> AsyncTTSClient:
+    return AsyncTTSClient(
+        access_key="ak",
+        app_key="app",
+        connection_params=ConnectionParams(audio_params=AudioParams()),
+        base_url=server.url,
+        pool=pool,
+    )
+
+
+async def _synthesize(client: AsyncTTSClient, text: str) -> bytes:
+    audio = b""
+    async for chunk in client.tts(source=text, stream=True):
+        if chunk.audio:
+            audio += chunk.audio
+    return audio
+
+
+async def test_sequential_sessions_reuse_connection() -> None:
+    async with FakeTTSServer(audio_chunks=3, audio_chunk_size=10) as server:
+        pool = TTSConnectionPool()
+        for _ in range(5):
+            audio = await _synthesize(_client(server, pool), "hello")
+            assert len(audio) == 30
+        assert server.connections_accepted == 1
+        assert server.sessions_started == 5
+        assert pool.connections_created == 1
+        assert pool.connections_reused == 4
+        await pool.close()
+
+
+async def test_max_connections_per_host_applies_backpressure() -> None:
+    async with FakeTTSServer(first_audio_delay=0.02) as server:
+        pool = TTSConnectionPool(max_connections_per_host=2)
+        results = await asyncio.gather(
+            *[_synthesize(_client(server, pool), "hello") for _ in range(6)]
+        )
+        assert all(results)
+        assert server.max_open_connections <= 2
+        assert server.sessions_started == 6
+        await pool.close()
+
+
+async def test_idle_connections_are_evicted() -> None:
+    async with FakeTTSServer() as server:
+        pool = TTSConnectionPool(max_idle_time=0.01)
+        await _synthesize(_client(server, pool), "hello")
+        assert pool.idle_count() == 1
+        await asyncio.sleep(0.02)
+        assert await pool.evict_idle() == 1
+        assert pool.idle_count() == 0
+
+        await _synthesize(_client(server, pool), "hello")
+        assert server.connections_accepted == 2
+        await pool.close()
+
+
+async def test_broken_session_is_not_returned_to_pool() -> None:
+    async with FakeTTSServer(audio_chunks=5) as server:
+        pool = TTSConnectionPool()
+        stream = _client(server, pool).tts(source="hello", stream=True)
+        async for _ in stream:
+            break
+        await stream.aclose()
+        assert pool.idle_count() == 0
+
+        await _synthesize(_client(server, pool), "hello")
+        assert pool.idle_count() == 1
+        await pool.close()
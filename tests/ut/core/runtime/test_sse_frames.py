@@ -0,0 +1,119 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import time
+from typing import AsyncIterator, List, Tuple
+
+import volcenginesdkarkruntime.types.chat.chat_completion_chunk as completion_chunk
+
+from arkitect.core.component.llm import ArkChatRequest
+from arkitect.core.component.llm.model import ArkChatCompletionChunk
+from arkitect.core.errors import InvalidParameter
+from arkitect.core.runtime import ChatAsyncRunner, coalesce_frames, sse_frame
+
+
+def _chunk(content: str) -> ArkChatCompletionChunk:
+    return ArkChatCompletionChunk(
+        id="1",
+        created=0,
+        model="fake-model",
+        object="chat.completion.chunk",
+        choices=[
+            completion_chunk.Choice(
+                index=0,
+                delta=completion_chunk.ChoiceDelta(role="assistant", content=content),
+            )
+        ],
+    )
+
+
+def test_frames_match_model_dump_json() -> None:
+    chunk = _chunk("你好")
+    assert sse_frame(chunk) == (
+        f"data:{chunk.model_dump_json(exclude_none=True)}\r\n\r\n".encode()
+    )
+    assert sse_frame({"content": "你好"}) == (
+        f"data:{json.dumps({'content': '你好'}, ensure_ascii=False)}\r\n\r\n".encode()
+    )
+
+
+async def _timed(
+    frames: AsyncIterator[bytes],
+) -> List[Tuple[float, bytes]]:
+    start = time.monotonic()
+    return [(time.monotonic() - start, frame) async for frame in frames]
+
+
+async def test_coalesce_holds_frames_for_the_window() -> None:
+    async def source() -> AsyncIterator[bytes]:
+        for i in range(5):
+            yield b"%d" % i
+
+    writes = await _timed(coalesce_frames(source(), flush_interval=10))
+    # the first frame is not delayed, nothing is held at the end of the stream
+    assert [frame for _, frame in writes] == [b"0", b"1234"]
+    assert writes[-1][0] < 1
+
+
+async def test_coalesce_flushes_on_size_and_time() -> None:
+    async def source() -> AsyncIterator[bytes]:
+        for i in range(5):
+            yield b"%d" % i
+        # a slow token: the buffered frames do not wait for it
+        await asyncio.sleep(0.2)
+        yield b"5"
+
+    writes = await _timed(coalesce_frames(source(), flush_interval=0.02, flush_bytes=2))
+    assert [frame for _, frame in writes] == [b"0", b"12", b"34", b"5"]
+
+    writes = await _timed(coalesce_frames(source(), flush_interval=0.02))
+    assert [frame for _, frame in writes] == [b"0", b"1234", b"5"]
+    assert writes[1][0] < 0.1
+
+
+async def test_runner_streams_bytes_and_str() -> None:
+    async def main(request: ArkChatRequest) -> AsyncIterator[ArkChatCompletionChunk]:
+        yield _chunk("a")
+        raise InvalidParameter("messages")
+
+    runner = ChatAsyncRunner(main, stream_flush_interval=0.01)
+    request = ArkChatRequest(model="fake-model", messages=[], stream=True)
+    frames = b"".join([frame async for frame in runner.astream_bytes(request)])
+    text = "".join([chunk async for chunk in runner.astream(request)])
+
+    assert frames.decode() == text
+    events = text.split("\r\n\r\n")
+    assert events[0] == "data:" + _chunk("a").model_dump_json(exclude_none=True)
+    assert '"code":"InvalidParameter"' in events[1]
+    assert events[2:] == ["data:[DONE]", ""]
+
+
+async def test_runner_streams_bytes_of_an_overridden_astream() -> None:
+    class UpperRunner(ChatAsyncRunner):
+        async def astream(self, request: ArkChatRequest) -> AsyncIterator[str]:
+            async for chunk in super().astream(request):
+                yield chunk.upper()
+
+    async def main(request: ArkChatRequest) -> AsyncIterator[ArkChatCompletionChunk]:
+        yield _chunk("a")
+
+    runner = UpperRunner(main)
+    request = ArkChatRequest(model="fake-model", messages=[], stream=True)
+    frames = b"".join([frame async for frame in runner.astream_bytes(request)])
+    assert frames.decode() == "".join(
+        [chunk async for chunk in runner.astream(request)]
+    )
+    assert frames.endswith(b"DATA:[DONE]\r\n\r\n")
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import json
+import threading
 import unittest
 from typing import Any, AsyncIterator, Callable, Dict, Tuple, Type
 from unittest.mock import MagicMock, patch
@@ -116,6 +117,48 @@ class TestBotWrapper(unittest.TestCase):
             self.assertIsInstance(result, dict)
             self.assertEqual(result, {"key": "value"})
 
+    def test_bot_wrapper_resolves_once(self) -> None:
+        with (
+            patch("arkitect.launcher.vefaas.wrapper.initialize") as mock_initialize,
+            patch(
+                "arkitect.launcher.vefaas.wrapper.get_runner",
+                side_effect=self.mock_runner,
+            ) as mock_get_runner,
+            patch(
+                "arkitect.launcher.vefaas.wrapper.get_endpoint_config",
+                return_value={"/api/v3/bots/chat/completions": Request},
+            ) as mock_get_endpoint_config,
+            patch(
+                "arkitect.launcher.vefaas.wrapper.parse_request",
+                side_effect=self.mock_parse_request,
+            ),
+            patch(
+                "arkitect.launcher.vefaas.wrapper.parse_response",
+                side_effect=self.mock_parse_response,
+            ),
+        ):
+            wrapped_func = bot_wrapper(trace_on=False)(self.handler)
+            event, context = self.mock_event_context()
+
+            threads = [
+                threading.Thread(target=lambda: wrapped_func(event, context).close())
+                for _ in range(8)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self.assertEqual(
+                get_event_loop(wrapped_func(event, context)), {"key": "value"}
+            )
+            mock_initialize.assert_called_once()
+            mock_get_runner.assert_called_once()
+            mock_get_endpoint_config.assert_called_once()
+
+            wrapped_func.cache_clear()
+            get_event_loop(wrapped_func(event, context))
+            self.assertEqual(mock_get_runner.call_count, 2)
+
     def test_get_parameters_local(self) -> None:
         # Test case for LOCAL environment
         request_data = {"key": "value"}
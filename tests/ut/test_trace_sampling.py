@@ -0,0 +1,93 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from typing import Any, Tuple
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from arkitect.telemetry.trace import (
+    SpanNameRateLimitSampler,
+    TailSamplingSpanProcessor,
+    set_trace_attributes,
+)
+from arkitect.utils import dump_json_str_bounded, dump_json_str_truncate
+
+
+class _Unserializable:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __str__(self) -> str:
+        self.calls += 1
+        return "unserializable"
+
+
+def _tracer(**kwargs: Any) -> Tuple[trace.Tracer, InMemorySpanExporter]:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider(**kwargs)
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider.get_tracer(__name__), exporter
+
+
+def test_bounded_dump_matches_truncate() -> None:
+    obj = {"a": [1, 2.5, True, None], "b": {"c": "x" * 20, "d": None}, "e": "é"}
+    assert dump_json_str_bounded(obj, 1000) == dump_json_str_truncate(obj, 1000)
+    assert json.loads(dump_json_str_bounded(obj, 1000))["b"] == {"c": "x" * 20}
+
+
+def test_bounded_dump_stops_at_budget() -> None:
+    items = [_Unserializable() for _ in range(10000)]
+    dumped = dump_json_str_bounded(items, 100)
+    assert len(dumped) == 100
+    assert sum(item.calls for item in items) < 10
+
+
+def test_rate_limited_span_skips_serialization() -> None:
+    tracer, exporter = _tracer(
+        sampler=SpanNameRateLimitSampler(rate_limits={"noisy": 1e-6})
+    )
+    value = _Unserializable()
+    for _ in range(3):
+        with tracer.start_as_current_span("noisy") as span:
+            set_trace_attributes(span, input=value)
+    assert len(exporter.get_finished_spans()) == 1
+    assert value.calls == 1
+
+
+def test_tail_sampling_keeps_errors_only() -> None:
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    processor = TailSamplingSpanProcessor(SimpleSpanProcessor(exporter))
+    provider.add_span_processor(processor)
+    tracer = provider.get_tracer(__name__)
+    value = _Unserializable()
+    try:
+        with tracer.start_as_current_span("ok") as span:
+            set_trace_attributes(span, status_code=trace.StatusCode.OK, input=value)
+        with tracer.start_as_current_span("failed") as span:
+            set_trace_attributes(span, status_code=trace.StatusCode.ERROR, input=value)
+    finally:
+        provider.shutdown()
+
+    spans = exporter.get_finished_spans()
+    assert [s.name for s in spans] == ["failed"]
+    assert spans[0].attributes["input"] == '"unserializable"'
+    # the dropped span was never serialized
+    assert value.calls == 1
@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import gzip
+import json
+import struct
+
+from arkitect.core.component.tts.constants import (
+    AUDIO_ONLY_SERVER,
+    NO_SERIALIZATION,
+    WITH_EVENT,
+    EventTTSResponse,
+)
+from arkitect.core.component.tts.model import Message
+from arkitect.core.component.tts.utils import parse_response as parse_tts_response
+from arkitect.utils.binary_protocol import (
+    AUDIO_ONLY_REQUEST,
+    FULL_SERVER_RESPONSE,
+    NEG_SEQUENCE,
+    NO_COMPRESSION,
+    POS_SEQUENCE,
+    FrameEncoder,
+    decode_frame,
+    generate_before_payload,
+    generate_header,
+    parse_response,
+)
+from arkitect.utils.binary_protocol import (
+    NO_SERIALIZATION as ASR_NO_SERIALIZATION,
+)
+
+
+def test_encoder_reuses_its_buffer() -> None:
+    encoder = FrameEncoder(capacity=16)
+    payload = gzip.compress(b'{"user": {}}')
+    frame = encoder.encode(
+        payload, message_type_specific_flags=POS_SEQUENCE, sequence=1
+    )
+    assert bytes(frame) == bytes(
+        generate_header(message_type_specific_flags=POS_SEQUENCE)
+        + generate_before_payload(sequence=1)
+        + struct.pack(">I", len(payload))
+        + payload
+    )
+
+    audio = encoder.encode(
+        b"pcm",
+        message_type=AUDIO_ONLY_REQUEST,
+        message_type_specific_flags=NEG_SEQUENCE,
+        serial_method=ASR_NO_SERIALIZATION,
+        compression_type=NO_COMPRESSION,
+    )
+    decoded = decode_frame(audio)
+    assert decoded.is_last_package
+    assert bytes(decoded.payload) == b"pcm"
+    # the next frame is written over the previous one
+    other = encoder.encode(b"PCM", message_type=AUDIO_ONLY_REQUEST)
+    assert audio.obj is other.obj
+    assert bytes(decoded.payload) == b"PCM"
+
+
+def test_payload_is_decoded_lazily() -> None:
+    body = gzip.compress(json.dumps({"result": {"text": "你好"}}).encode())
+    data = bytes(
+        generate_header(FULL_SERVER_RESPONSE, POS_SEQUENCE)
+        + struct.pack(">iI", 3, len(body))
+        + body
+    )
+    frame = decode_frame(data)
+    assert frame.payload_sequence == 3
+    assert frame.payload.obj is data
+    assert frame.message() == {"result": {"text": "你好"}}
+    assert parse_response(data) == {
+        "is_last_package": False,
+        "payload_sequence": 3,
+        "payload_msg": {"result": {"text": "你好"}},
+        "payload_size": len(body),
+    }
+
+
+def test_tts_frames() -> None:
+    message = Message(event=200, session_id="会话")
+    message.payload = {"text": "hi"}
+    frame = message.write_text_request()
+    # the length of the session id is the length of its utf-8 bytes
+    assert frame[8:12] == struct.pack(">I", len("会话".encode()))
+
+    response = (
+        bytes([0x11, AUDIO_ONLY_SERVER << 4 | WITH_EVENT, NO_SERIALIZATION << 4, 0])
+        + struct.pack(">iI", EventTTSResponse, 6)
+        + "会话".encode()
+        + struct.pack(">I", 5)
+        + b"audio"
+    )
+    event = parse_tts_response(response)
+    assert event.session_id == "会话"
+    assert event.audio_only
+    assert event.audio == b"audio"